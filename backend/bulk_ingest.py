@@ -0,0 +1,114 @@
+# backend/bulk_ingest.py
+
+import os
+from sqlalchemy import insert
+
+from backend.models import Rule, RuleObjectType, UnsupportedRegex, VCIResult
+
+# Rows per executemany; set DB_COMMIT_PER_CHUNK=1 to also commit per chunk
+DB_INSERT_CHUNK_SIZE = int(os.getenv("DB_INSERT_CHUNK_SIZE", "500"))
+DB_COMMIT_PER_CHUNK = os.getenv("DB_COMMIT_PER_CHUNK", "0") == "1"
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class BulkIngest:
+    """
+    Collects rows and writes them with batched core INSERTs instead of one
+    ORM add/commit per row. Everything goes into the session's transaction
+    and is committed once by finish(), or after every chunk when
+    commit_per_chunk is set.
+
+    A chunk that fails is retried row by row inside savepoints so one bad
+    row does not sink the rest; failures are reported per key.
+    """
+
+    def __init__(self, session, chunk_size=None, commit_per_chunk=None):
+        self.session = session
+        self.chunk_size = max(1, chunk_size or DB_INSERT_CHUNK_SIZE)
+        self.commit_per_chunk = DB_COMMIT_PER_CHUNK if commit_per_chunk is None else commit_per_chunk
+        self.rules = []
+        self.vci_results = []
+        self.inserted = []
+        self.failed = {}
+
+    def add_rule(self, values, regex_findings=(), object_types=()):
+        """Queue a Rule row (column dict) and the UnsupportedRegex and RuleObjectType rows that belong to it."""
+        self.rules.append((values, list(regex_findings), list(object_types)))
+
+    def add_vci_result(self, key, values):
+        """Queue a VCIResult row (column dict); key identifies it in failure reports."""
+        self.vci_results.append((key, values))
+
+    def _write_rules(self, batch):
+        rule_ids = self.session.execute(
+            insert(Rule).returning(Rule.id, sort_by_parameter_order=True),
+            [values for values, _, _ in batch]
+        ).scalars().all()
+
+        regex_rows = [
+            dict(finding, rule_id=rule_pk)
+            for rule_pk, (_, findings, _) in zip(rule_ids, batch)
+            for finding in findings
+        ]
+        if regex_rows:
+            self.session.execute(insert(UnsupportedRegex), regex_rows)
+
+        object_type_rows = [
+            dict(row, rule_id=rule_pk, benchmark_id=values["benchmark_id"])
+            for rule_pk, (values, _, object_types) in zip(rule_ids, batch)
+            for row in object_types
+        ]
+        if object_type_rows:
+            self.session.execute(insert(RuleObjectType), object_type_rows)
+
+    def _write_vci_results(self, batch):
+        self.session.execute(insert(VCIResult), [values for _, values in batch])
+
+    def _begin(self):
+        """
+        pysqlite only opens a transaction before DML, so a leading SAVEPOINT
+        runs in autocommit and its RELEASE commits the chunk. Open the
+        transaction explicitly so the savepoints nest inside it.
+        """
+        connection = self.session.connection()
+        if connection.dialect.name == "sqlite" and not connection.connection.driver_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN")
+
+    def _write(self, batch, writer, key_of):
+        self._begin()
+        try:
+            with self.session.begin_nested():
+                writer(batch)
+            self.inserted.extend(key_of(item) for item in batch)
+        except Exception:
+            # Find the offending rows; the rest of the chunk still goes in
+            for item in batch:
+                try:
+                    with self.session.begin_nested():
+                        writer([item])
+                    self.inserted.append(key_of(item))
+                except Exception as e:
+                    self.failed[key_of(item)] = str(e)
+
+        if self.commit_per_chunk:
+            self.session.commit()
+
+    def finish(self):
+        """Write everything queued and commit. Returns (inserted keys, {key: error})."""
+        try:
+            for batch in chunked(self.rules, self.chunk_size):
+                self._write(batch, self._write_rules, lambda item: item[0]["rule_id"])
+            for batch in chunked(self.vci_results, self.chunk_size):
+                self._write(batch, self._write_vci_results, lambda item: item[0])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self.rules = []
+            self.vci_results = []
+        return self.inserted, self.failed
@@ -0,0 +1,176 @@
+# backend/channel_file_worker.py
+#
+# Long-lived worker processes that load BuildChannelFile.py once and run it
+# for many channel files, instead of starting a fresh interpreter per rule.
+# Only the standard library is used here; the workers are spawned and import
+# this module first.
+
+import ast
+import contextlib
+import importlib.util
+import io
+import multiprocessing
+import multiprocessing.spawn
+import os
+import runpy
+import shutil
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Set SENSOR_BUILD_MODE=warm to build channel files in warm workers
+SENSOR_BUILD_MODE = os.getenv("SENSOR_BUILD_MODE", "subprocess")
+CHANNEL_FILE_WORKERS = int(os.getenv("CHANNEL_FILE_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+# main() argument for each argv form a __main__ guard may pass it
+_MAIN_ARGS = {"": None, "sys.argv": 0, "sys.argv[1:]": 1}
+
+_pools = {}
+_pools_lock = threading.Lock()
+# The spawn executable is process-wide, so it is only swapped while a pool starts workers
+_executable_lock = threading.Lock()
+
+# Per worker process
+_script_path = None
+_script_main = None
+# (first sys.argv index passed to main() or None for no argument, whether its result goes to sys.exit)
+_main_call = None
+
+
+def _find_main_guard(script_path):
+    with open(script_path, "rb") as f:
+        tree = ast.parse(f.read(), filename=script_path)
+    for node in tree.body:
+        if isinstance(node, ast.If) and isinstance(node.test, ast.Compare) \
+                and isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__":
+            return node
+    return None
+
+
+def _parse_main_call(guard):
+    """
+    How the __main__ guard calls main(), as stored in _main_call. None when
+    the guard does anything else, since calling main() alone would then not
+    do what running the script does.
+    """
+    if len(guard.body) != 1:
+        return None
+    statement = ast.unparse(guard.body[0])
+    for arg, argv_start in _MAIN_ARGS.items():
+        call = f"main({arg})"
+        if statement == call:
+            return argv_start, False
+        if statement in (f"sys.exit({call})", f"exit({call})", f"raise SystemExit({call})"):
+            return argv_start, True
+    return None
+
+
+def _init_worker(script_path):
+    global _script_path, _script_main, _main_call
+    _script_path = script_path
+    # Let the script import its sibling modules, as when run directly
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
+
+    # Without a __main__ guard, importing would run a build with our argv.
+    # Such scripts, and guards that do more than call main(), run whole per
+    # job instead, and only their imports stay warm.
+    guard = _find_main_guard(script_path)
+    _main_call = _parse_main_call(guard) if guard is not None else None
+    if _main_call is None:
+        return
+
+    spec = importlib.util.spec_from_file_location("build_channel_file", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    main = getattr(module, "main", None)
+    _script_main = main if callable(main) else None
+
+
+def _run_script(argv, work_dir):
+    """Run the loaded script with argv inside work_dir, like a subprocess would."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = list(argv)
+    os.chdir(work_dir)
+    returncode = 0
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                if _script_main is not None:
+                    argv_start, exits = _main_call
+                    result = _script_main() if argv_start is None else _script_main(list(argv[argv_start:]))
+                    if exits:
+                        raise SystemExit(result)
+                else:
+                    # No main(): run the script body; its imports stay cached
+                    runpy.run_path(_script_path, run_name="__main__")
+            except SystemExit as e:
+                if e.code is None:
+                    returncode = 0
+                elif isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except Exception as e:
+                print(f"{type(e).__name__}: {e}", file=sys.stderr)
+                returncode = 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+def _get_pool(python_path, script_path, workers):
+    key = (python_path, os.path.abspath(script_path))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max(1, workers or CHANNEL_FILE_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(key[1],)
+            )
+            _pools[key] = pool
+        return pool
+
+
+@contextlib.contextmanager
+def _spawn_executable(python_path):
+    """Start spawned workers with python_path instead of sys.executable."""
+    with _executable_lock:
+        saved = multiprocessing.spawn.get_executable()
+        multiprocessing.get_context("spawn").set_executable(python_path)
+        try:
+            yield
+        finally:
+            multiprocessing.spawn.set_executable(saved)
+
+
+def run_build_channel_file(python_path, argv, work_dir, workers=None):
+    """
+    Run BuildChannelFile.py in a warm worker on the python_path interpreter.
+    argv is the script path and its arguments, as the subprocess gets them.
+    Returns (returncode, stdout, stderr). Raises if the pool is unusable,
+    e.g. the script failed to import; the pool is then dropped so the next
+    call starts fresh.
+    """
+    # spawn does not search PATH, so a bare name like python3 is resolved here
+    python_path = shutil.which(python_path) or python_path if python_path else sys.executable
+    pool = _get_pool(python_path, argv[0], workers)
+    try:
+        # The pool spawns its workers inside submit
+        with _spawn_executable(python_path):
+            future = pool.submit(_run_script, argv, os.path.abspath(work_dir))
+        return future.result()
+    except Exception:
+        shutdown_workers(argv[0])
+        raise
+
+
+def shutdown_workers(script_path=None):
+    with _pools_lock:
+        for key in list(_pools):
+            if script_path is None or key[1] == os.path.abspath(script_path):
+                _pools.pop(key).shutdown(wait=False, cancel_futures=True)
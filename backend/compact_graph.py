@@ -0,0 +1,211 @@
+# backend/compact_graph.py
+
+from array import array
+from collections.abc import Mapping
+
+NODE_TYPES = ("definition", "criterion", "test", "object", "state", "variable")
+NODE_TYPE_CODES = {name: code for code, name in enumerate(NODE_TYPES)}
+DEFINITION_CODE = NODE_TYPE_CODES["definition"]
+
+# Type code for ids that are referenced but have no node (dangling refs)
+NO_NODE = -1
+
+
+class CompactNode:
+    """
+    Read-only node record handed out by CompactNodes. Mirrors the
+    GraphNode attributes, with children resolved from the CSR arrays.
+    """
+    __slots__ = ("id", "type", "element", "_graph", "_index")
+
+    def __init__(self, graph, index):
+        self._graph = graph
+        self._index = index
+        self.id = graph.ids[index]
+        self.type = NODE_TYPES[graph.types[index]]
+        self.element = graph.elements[index]
+
+    @property
+    def children(self):
+        return self._graph.child_ids(self._index)
+
+
+class CompactGraph:
+    """
+    Integer-indexed OVAL graph. Ids are interned to ints, node data lives in
+    flat lists/arrays and edges are stored CSR-style: the children of node i
+    are targets[offsets[i]:offsets[i + 1]], in both directions.
+    """
+
+    def __init__(self, nodes, reverse_refs):
+        self.ids = []
+        self.index = {}
+        types = array("b")
+        self.elements = []
+
+        # Real nodes first, in their build order, so index doubles as node order
+        for node_id, node in nodes.items():
+            self._intern(node_id)
+            types.append(NODE_TYPE_CODES[node.type])
+            self.elements.append(node.element)
+        self.node_count = len(self.ids)
+
+        child_lists = [[self._intern(child) for child in node.children] for node in nodes.values()]
+        parent_lists = {
+            self._intern(node_id): [self._intern(parent) for parent in parents]
+            for node_id, parents in reverse_refs.items()
+            if parents
+        }
+
+        # Dangling ids get no element and no type
+        types.extend([NO_NODE] * (len(self.ids) - self.node_count))
+        self.elements.extend([None] * (len(self.ids) - self.node_count))
+        self.types = types
+        self.alive = bytearray([1]) * self.node_count + bytearray(len(self.ids) - self.node_count)
+
+        self.fwd_offsets, self.fwd_targets = self._csr(
+            (child_lists[i] if i < self.node_count else () for i in range(len(self.ids)))
+        )
+        self.rev_offsets, self.rev_targets = self._csr(
+            (parent_lists.get(i, ()) for i in range(len(self.ids)))
+        )
+
+    @classmethod
+    def from_arrays(cls, ids, types, fwd_offsets, fwd_targets, node_count):
+        """Rebuild a graph from stored arrays; elements are not available."""
+        graph = cls.__new__(cls)
+        graph.ids = list(ids)
+        graph.index = {node_id: i for i, node_id in enumerate(graph.ids)}
+        graph.types = types
+        graph.elements = [None] * len(graph.ids)
+        graph.node_count = node_count
+        graph.alive = bytearray([1]) * node_count + bytearray(len(graph.ids) - node_count)
+        graph.fwd_offsets = fwd_offsets
+        graph.fwd_targets = fwd_targets
+
+        parent_lists = [[] for _ in graph.ids]
+        for i in range(node_count):
+            for child in fwd_targets[fwd_offsets[i]:fwd_offsets[i + 1]]:
+                parent_lists[child].append(i)
+        graph.rev_offsets, graph.rev_targets = cls._csr(parent_lists)
+        return graph
+
+    def _intern(self, node_id):
+        index = self.index.get(node_id)
+        if index is None:
+            index = len(self.ids)
+            self.index[node_id] = index
+            self.ids.append(node_id)
+        return index
+
+    @staticmethod
+    def _csr(rows):
+        offsets = array("l", [0])
+        targets = array("l")
+        for row in rows:
+            targets.extend(sorted(row))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def is_node(self, index):
+        return index < self.node_count and self.alive[index]
+
+    def child_ids(self, index):
+        ids = self.ids
+        return tuple(ids[j] for j in self.fwd_targets[self.fwd_offsets[index]:self.fwd_offsets[index + 1]])
+
+    def parent_ids(self, index):
+        ids = self.ids
+        return tuple(ids[j] for j in self.rev_targets[self.rev_offsets[index]:self.rev_offsets[index + 1]])
+
+    def closure(self, node_ids):
+        """Ids reachable from node_ids, following only edges between live nodes."""
+        offsets, targets = self.fwd_offsets, self.fwd_targets
+        node_count, alive = self.node_count, self.alive
+        seen = set()
+        stack = [self.index[n] for n in node_ids if n in self.index and self.is_node(self.index[n])]
+        while stack:
+            i = stack.pop()
+            if i in seen:
+                continue
+            seen.add(i)
+            if i < node_count and alive[i]:
+                stack.extend(targets[offsets[i]:offsets[i + 1]])
+        ids = self.ids
+        return {ids[i] for i in seen}
+
+    def ancestor_definitions(self, node_id):
+        """Definitions that reach node_id, walking through extend_definition chains."""
+        start = self.index.get(node_id)
+        if start is None:
+            return set()
+        offsets, targets, types = self.rev_offsets, self.rev_targets, self.types
+        node_count, alive = self.node_count, self.alive
+        seen = {start}
+        definitions = set()
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for parent in targets[offsets[i]:offsets[i + 1]]:
+                if parent in seen or parent >= node_count or not alive[parent]:
+                    continue
+                seen.add(parent)
+                if types[parent] == DEFINITION_CODE:
+                    definitions.add(self.ids[parent])
+                stack.append(parent)
+        return definitions
+
+
+class CompactNodes(Mapping):
+    """dict-like id -> CompactNode view over the live nodes of a CompactGraph."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, node_id):
+        index = self.graph.index.get(node_id)
+        if index is None or not self.graph.is_node(index):
+            raise KeyError(node_id)
+        return CompactNode(self.graph, index)
+
+    def __delitem__(self, node_id):
+        index = self.graph.index.get(node_id)
+        if index is None or not self.graph.is_node(index):
+            raise KeyError(node_id)
+        self.graph.alive[index] = 0
+
+    def __contains__(self, node_id):
+        index = self.graph.index.get(node_id)
+        return index is not None and self.graph.is_node(index)
+
+    def __iter__(self):
+        graph = self.graph
+        return (graph.ids[i] for i in range(graph.node_count) if graph.alive[i])
+
+    def __len__(self):
+        return self.graph.alive.count(1)
+
+
+class CompactReverseRefs(Mapping):
+    """dict-like id -> tuple of parent ids, matching OvalDSA.reverse_refs."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, node_id):
+        index = self.graph.index.get(node_id)
+        if index is None:
+            raise KeyError(node_id)
+        parents = self.graph.parent_ids(index)
+        if not parents:
+            raise KeyError(node_id)
+        return parents
+
+    def __iter__(self):
+        graph = self.graph
+        offsets = graph.rev_offsets
+        return (graph.ids[i] for i in range(len(graph.ids)) if offsets[i + 1] > offsets[i])
+
+    def __len__(self):
+        offsets = self.graph.rev_offsets
+        return sum(1 for i in range(len(self.graph.ids)) if offsets[i + 1] > offsets[i])
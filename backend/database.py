@@ -1,11 +1,220 @@
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
 from backend.models import Base
 
 DATABASE_URL = "sqlite:///data/stig.db"
 
-engine = create_engine(DATABASE_URL, echo=False)
+# SQLite profile; see apply_sqlite_pragmas
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# Negative cache_size is in KiB: 64 MiB of page cache per connection
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Seconds a connection waits on a lock before "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+
+# Connection pool; a checkout beyond size + overflow waits up to DB_POOL_TIMEOUT
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Statements slower than this are logged; 0 turns logging off
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    connect_args={"timeout": SQLITE_BUSY_TIMEOUT}
+)
 SessionLocal = sessionmaker(bind=engine)
 
+
+class PoolMetrics:
+    """
+    Counters for the engine's connection pool. Checkouts are counted for
+    every user of the engine; wait times are measured for request sessions
+    from get_db, which check their connection out up front.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.peak_checked_out = 0
+        self.waiting = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self.slow_queries = 0
+
+    def record_checkout(self, checked_out):
+        with self.lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_wait(self, seconds, timed_out=False):
+        with self.lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_slow_query(self):
+        with self.lock:
+            self.slow_queries += 1
+
+    def snapshot(self):
+        pool = engine.pool
+        with self.lock:
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": DB_MAX_OVERFLOW,
+                "checked_out": pool.checkedout(),
+                "overflow": max(0, pool.overflow()),
+                "idle": pool.checkedin(),
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "waiting": self.waiting,
+                "wait_ms_avg": round(self.wait_seconds_total / self.waits * 1000, 2) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 2),
+                "timeouts": self.timeouts,
+                "slow_queries": self.slow_queries,
+                "slow_query_ms": DB_SLOW_QUERY_MS
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+@event.listens_for(engine, "checkout")
+def count_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics.record_checkout(engine.pool.checkedout())
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info.pop("query_started", time.perf_counter())) * 1000
+    if DB_SLOW_QUERY_MS and elapsed_ms >= DB_SLOW_QUERY_MS:
+        pool_metrics.record_slow_query()
+        print(f"🐢 Slow query ({elapsed_ms:.0f} ms): {' '.join(statement.split())[:500]}")
+
+
+def get_db():
+    """
+    Request-scoped session for FastAPI endpoints; closed, and its connection
+    returned to the pool, when the request is done.
+    """
+    db = SessionLocal()
+    start = time.perf_counter()
+    with pool_metrics.lock:
+        pool_metrics.waiting += 1
+    try:
+        db.connection()
+    except Exception as e:
+        pool_metrics.record_wait(time.perf_counter() - start, timed_out=isinstance(e, PoolTimeoutError))
+        db.close()
+        raise
+    finally:
+        with pool_metrics.lock:
+            pool_metrics.waiting -= 1
+    pool_metrics.record_wait(time.perf_counter() - start)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@event.listens_for(engine, "connect")
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets UI reads run while an import writes. synchronous=NORMAL is
+    durable across application crashes in WAL mode and only fsyncs at
+    checkpoints. cache_size/mmap_size keep hot pages in memory.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def migrate_db():
+    """
+    Bring an existing database up to the current schema and profile.
+    create_all does not touch tables that already exist, so add any missing
+    columns and indexes here. Safe to run on every start.
+    """
+    for table in Base.metadata.sorted_tables:
+        with engine.connect() as conn:
+            existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table.name}')"))}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+            if column.default is not None and column.default.is_scalar:
+                ddl += f" DEFAULT {column.default.arg!r}"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            print(f"✅ Added column {table.name}.{column.name}")
+
+    created = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            with engine.connect() as conn:
+                existing = {row[1] for row in conn.execute(text(f"PRAGMA index_list('{table.name}')"))}
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+
+    if created:
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"✅ Created indexes: {', '.join(created)}")
+
+
+def backfill_rule_object_types():
+    """
+    Fill rule_object_types for rules ingested before the table existed, from
+    Rule.object_type and Rule.unsupported_probes. Only touches rules that have
+    no rows yet, so it is cheap once done.
+    """
+    from backend.rule_object_types import object_type_rows_for_rule
+
+    with engine.begin() as conn:
+        rules = conn.execute(text(
+            "SELECT id, benchmark_id, object_type, unsupported_probes FROM rules "
+            "WHERE object_type IS NOT NULL AND object_type != '' "
+            "AND NOT EXISTS (SELECT 1 FROM rule_object_types WHERE rule_object_types.rule_id = rules.id)"
+        )).all()
+        rows = [
+            dict(row, rule_id=rule_pk, benchmark_id=benchmark_id)
+            for rule_pk, benchmark_id, object_type, unsupported_probes in rules
+            for row in object_type_rows_for_rule(object_type, unsupported_probes)
+        ]
+        if rows:
+            conn.execute(text(
+                "INSERT INTO rule_object_types (rule_id, benchmark_id, object_type, supported) "
+                "VALUES (:rule_id, :benchmark_id, :object_type, :supported)"
+            ), rows)
+    if rows:
+        print(f"✅ Backfilled {len(rows)} object types for {len(rules)} rules")
+
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    migrate_db()
+    backfill_rule_object_types()
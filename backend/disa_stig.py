@@ -9,13 +9,19 @@ from datetime import datetime
 from backend.database import SessionLocal
 from backend.models import Benchmark, Rule, UnsupportedRegex, RemoteHost, VCIResult
 from backend.xccdf_parser import XccdfDSA
+from backend.bulk_ingest import BulkIngest
+from backend.job_progress import current_progress
+from backend.rule_object_types import object_type_rows
+from backend.sensor_builder import build_sensor_bins
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from backend.utils import safe_rule_filename, load_filename_map, save_filename_map
 
-PYTHON_PATH = os.getenv("PYTHON_PATH")
-BUILD_CHANNEL_FILE = os.getenv("BUILD_CHANNEL_FILE")
-GENERATE_INSTRUCTIONS = os.getenv("GENERATE_INSTRUCTIONS_LOCATION_PROJ")
-REQUEST_PARAM = os.getenv("REQUEST_PARAM_FILE_LOCATION")
+# Worker processes used to extract rules during import; 1 keeps it in-process
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "1"))
+# Lift libxml2's size/depth limits for very large SCAP bundles
+SCAP_HUGE_TREE = os.getenv("SCAP_HUGE_TREE", "0") == "1"
 
 NAMESPACES = {
     'scap': 'http://scap.nist.gov/schema/scap/source/1.2',
@@ -27,59 +33,26 @@ NAMESPACES = {
 
 
 def generate_sensor_for_rule(benchmark, benchmark_dir, rule_id, definition_id, oval_path):
-    session = SessionLocal()
-    try:
-        cf_output = os.path.join(benchmark_dir, "cf_output")
-        os.makedirs(cf_output, exist_ok=True)
-        cf_output = os.path.abspath(cf_output)
-
-        sensorbin_dir = os.path.join(benchmark_dir, "sensorbin")
-        os.makedirs(sensorbin_dir, exist_ok=True)
-
-        instructions_file = generate_instructions(
-            GENERATE_INSTRUCTIONS,
-            REQUEST_PARAM,
-            oval_path,
-            cf_output,
-            rule_id
-        )
-        sensor_bin_path = generate_sensor_cf(
-            PYTHON_PATH,
-            BUILD_CHANNEL_FILE,
-            instructions_file,
-            rule_id,
-            sensorbin_dir
-        )
-        benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
-        if benchmark_obj:
-            rule_obj = session.query(Rule).filter_by(
-                benchmark_id=benchmark_obj.id,
-                rule_id=rule_id
-            ).first()
-            if rule_obj:
-                rule_obj.sensor_file_generated = 1
-                session.commit()
-        else:
-            print(f"ℹ️ No remote host configured for benchmark {benchmark}. Skipping VCI debug.")        
-
-        print(f"✅ Sensor generated for rule: {rule_id}")
-    except Exception as e:
-        benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
-        if benchmark_obj:
-            rule_obj = session.query(Rule).filter_by(
-                benchmark_id=benchmark_obj.id,
-                rule_id=rule_id
-            ).first()
-            if rule_obj:
-                rule_obj.sensor_file_generated = 0
-                session.commit()
-
-        print(f"❌ Sensor generation failed for rule {rule_id}: {e}")
-    finally:
-        session.close()
-
-
-def detect_benchmark_type_from_roots(xccdf_root, oval_root) -> str:
+    return build_sensor_bins(
+        benchmark,
+        benchmark_dir,
+        [{"rule_id": rule_id, "definition_id": definition_id, "oval_path": oval_path}],
+        workers=1
+    )[0]
+
+
+def collect_oval_platforms(oval_root):
+    platforms = []
+    for definition_elem in oval_root.findall(".//oval:definition", namespaces=NAMESPACES):
+        affected_elem = definition_elem.find(".//oval:affected", namespaces=NAMESPACES)
+        if affected_elem is not None:
+            platform = affected_elem.find("oval:platform", namespaces=NAMESPACES)
+            if platform is not None and platform.text:
+                platforms.append(platform.text.lower())
+    return platforms
+
+
+def detect_benchmark_type_from_roots(xccdf_root, oval_root, oval_platforms=None) -> str:
     platforms = []
 
     if xccdf_root is not None:
@@ -92,12 +65,11 @@ def detect_benchmark_type_from_roots(xccdf_root, oval_root) -> str:
                 platforms.append(platform_text.lower())
 
     if oval_root is not None:
-        for definition_elem in oval_root.findall(".//oval:definition", namespaces=NAMESPACES):
-            affected_elem = definition_elem.find(".//oval:affected", namespaces=NAMESPACES)
-            if affected_elem is not None:
-                platform = affected_elem.find("oval:platform", namespaces=NAMESPACES)
-                if platform is not None and platform.text:
-                    platforms.append(platform.text.lower())
+        platforms.extend(collect_oval_platforms(oval_root))
+
+    # Platforms gathered while streaming, when the OVAL root is no longer in memory
+    if oval_platforms:
+        platforms.extend(oval_platforms)
 
     full_platform_string = ' '.join(platforms)
 
@@ -124,124 +96,14 @@ def write_xml(root, filename, output_dir):
         print(f"⚠️ Skipped: {filename} not found")
 
 
-def process_rules(
-    oval_bytes,
-    xccdf_to_oval_def,
-    benchmark_name,
-    benchmark_type,
-    benchmark_dir,
-    ben_platform,
-    xccdf_bytes
-):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark_name).first()
-
-    ovals_dir = os.path.join(benchmark_dir, "ovals")
-    xccdf_dir = os.path.join(benchmark_dir, "xccdf")
-    os.makedirs(ovals_dir, exist_ok=True)
-    os.makedirs(xccdf_dir, exist_ok=True)
-    generated_rules = []
-    xccdf_filename_map = load_filename_map(xccdf_dir, "xccdf_rule_filename_map.json")
-    oval_filename_map = load_filename_map(ovals_dir, "oval_rule_filename_map.json")
-
-    for rule_id, definition_id in xccdf_to_oval_def.items():
-        try:
-
-            xccdf_dsa = XccdfDSA(xccdf_bytes)
-            rule_id_try = rule_id
-            rule_elem = xccdf_dsa.rules_by_id.get(rule_id_try)
-
-            if rule_elem is None and re.search(r'_\d+$', rule_id):
-                rule_id_try = re.sub(r'_\d+$', '', rule_id)
-                rule_elem = xccdf_dsa.rules_by_id.get(rule_id_try)
-
-            if rule_elem is None:
-                raise Exception(f"Rule {rule_id} or {rule_id_try} not found in XCCDF.")
-
-            xccdf_tree = lxml_etree.ElementTree(xccdf_dsa.extract_rule(rule_id_try))
-
-            # NEW: generate safe hashed filename
-            safe_filename = safe_rule_filename(rule_id_try)
-
-            out_path_xccdf = os.path.join(xccdf_dir, safe_filename)
-            xccdf_tree.write(out_path_xccdf, pretty_print=True, encoding="utf-8", xml_declaration=True)
-
-            # store mapping for this rule
-            xccdf_filename_map[rule_id_try] = safe_filename   
-            if "sce/" in definition_id:
-                print(f"⚠ Skipping SCE rule: {rule_id}")
-                continue
-            if "Manual Rule" in definition_id:
-                continue
-
-            temp_dsa = OvalDSA(oval_bytes)
-            temp_dsa.keep_only_definition(definition_id)
-            tree = lxml_etree.ElementTree(temp_dsa.to_lxml_element())
-            safe_filename = safe_rule_filename(rule_id)
-            out_path = os.path.join(ovals_dir, safe_filename)
-            tree.write(out_path, pretty_print=True, encoding="utf-8", xml_declaration=True)
-            oval_filename_map[rule_id] = safe_filename
-            
-
-            analyzer = OvalAnalyzer(temp_dsa)
-            object_types = analyzer._extract_object_types(definition_id)
-            print(object_types)
-            analysis_results = analyzer.analyze(ben_platform)
-            regex_results = analyzer.analyze_regex()
-
-            rule_supported = analysis_results[definition_id]['supported']
-            unsupported_probes = analysis_results[definition_id]['unsupported_types']
-
-            rule_obj = Rule(
-                benchmark_id=benchmark_obj.id,
-                rule_id=rule_id,
-                definition_id=definition_id,
-                oval_path=out_path,
-                xccdf_path=out_path_xccdf,
-                object_type = ",".join(object_types),
-                supported=1 if rule_supported else 0,
-                unsupported_probes=None if rule_supported else json.dumps(unsupported_probes),
-                manual=False,
-                benchmark_type=benchmark_type
-            )
-            session.add(rule_obj)
-            session.commit()
-
-            for regex_issue in regex_results:
-                regex_obj = UnsupportedRegex(
-                    rule_id=rule_obj.id,
-                    definition_id=str(regex_issue['definition_id']),
-                    object_id=regex_issue['node_id'],
-                    pattern=regex_issue['regex'],
-                    reason=regex_issue['reason']
-                )
-                session.add(regex_obj)
-            session.commit()
-
-            generated_rules.append({
-                "rule_id": rule_id,
-                "definition_id": definition_id,
-                "oval_path": out_path
-            })
-
-        except Exception as e:
-            print(f"⚠ Failed to extract OVAL for rule {rule_id}: {e}")
-            continue
-    save_filename_map(xccdf_dir, "xccdf_rule_filename_map.json", xccdf_filename_map)
-    save_filename_map(ovals_dir, "oval_rule_filename_map.json", oval_filename_map)
-    session.close()
-    return generated_rules
-
-def parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type):
-    print(f"🔍 Parsing: {file_path}")
-    tree = etree.parse(file_path)
-    root = tree.getroot()
-
+def classify_component_refs(component_refs):
+    """
+    Map the data-stream component-refs (cref_id -> href) onto the
+    xccdf / oval / cpe-oval / cpe-dict component ids.
+    """
     ids = {'xccdf': None, 'oval': None, 'cpe-oval': None, 'cpe-dict': None}
 
-    for cref in root.findall(".//scap:component-ref", namespaces=NAMESPACES):
-        cref_id = cref.get("id")
-        href = cref.get("{http://www.w3.org/1999/xlink}href")
+    for cref_id, href in component_refs:
         if not href:
             continue
         ref = href.lstrip("#")
@@ -255,18 +117,79 @@ def parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type):
         elif "-cpe-dictionary.xml" in cref_id:
             ids['cpe-dict'] = ref
 
-    components = {key: extract_component(tree, cid) for key, cid in ids.items()}
+    return ids
+
+
+def stream_scap_components(file_path, output_dir, huge_tree=SCAP_HUGE_TREE):
+    """
+    Split a SCAP 1.2/1.3 data stream into its component files with iterparse.
+    Each scap:component is written to disk as soon as it closes and then
+    cleared along with its processed siblings, so only one component is
+    held in memory at a time.
+
+    Writes xccdf.xml, oval.xml, cpe-oval.xml and cpe-dictionary.xml into
+    output_dir and returns the affected platforms found in the OVAL component.
+    """
+    component_tag = f"{{{NAMESPACES['scap']}}}component"
+    component_ref_tag = f"{{{NAMESPACES['scap']}}}component-ref"
+    content_paths = {
+        'xccdf': (f"{{{NAMESPACES['xccdf']}}}Benchmark", "xccdf.xml"),
+        'oval': (f"{{{NAMESPACES['oval']}}}oval_definitions", "oval.xml"),
+        'cpe-oval': (f"{{{NAMESPACES['oval']}}}oval_definitions", "cpe-oval.xml"),
+        'cpe-dict': (f"{{{NAMESPACES['cpe-dict']}}}cpe-list", "cpe-dictionary.xml"),
+    }
+    content_tags = {tag for tag, _ in content_paths.values()}
+
+    component_refs = []
+    # component id -> (temp path, content tag, oval platforms)
+    written = {}
+
+    context = etree.iterparse(
+        file_path,
+        events=("end",),
+        tag=(component_tag, component_ref_tag),
+        huge_tree=huge_tree
+    )
+    for _, elem in context:
+        if elem.tag == component_ref_tag:
+            component_refs.append((elem.get("id"), elem.get("{http://www.w3.org/1999/xlink}href")))
+            continue
+
+        comp_id = elem.get("id")
+        content = next((child for child in elem.iter() if child.tag in content_tags), None)
+        if comp_id and content is not None:
+            tmp_path = os.path.join(output_dir, f".component.{len(written)}.xml.tmp")
+            etree.ElementTree(content).write(tmp_path, pretty_print=True, encoding='utf-8', xml_declaration=True)
+            platforms = collect_oval_platforms(content) if content.tag == content_paths['oval'][0] else []
+            written[comp_id] = (tmp_path, content.tag, platforms)
+
+        # Drop the component and everything already processed before it
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    del context
+
+    ids = classify_component_refs(component_refs)
+    oval_platforms = []
+    for key, (tag, filename) in content_paths.items():
+        entry = written.get(ids[key]) if ids[key] else None
+        if entry is None or entry[1] != tag:
+            print(f"⚠️ Skipped: {filename} not found")
+            continue
+        out_path = os.path.join(output_dir, filename)
+        os.replace(entry[0], out_path)
+        print(f"✅ Saved: {out_path}")
+        if key == 'oval':
+            oval_platforms = entry[2]
+
+    for tmp_path, _, _ in written.values():
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-    xccdf_root = components['xccdf'].find(".//xccdf:Benchmark", namespaces=NAMESPACES) if components['xccdf'] else None
-    oval_root = components['oval'].find(".//oval:oval_definitions", namespaces=NAMESPACES) if components['oval'] else None
-    cpe_oval_root = components['cpe-oval'].find(".//oval:oval_definitions", namespaces=NAMESPACES) if components['cpe-oval'] else None
-    cpe_dict_root = components['cpe-dict'].find(".//cpe-dict:cpe-list", namespaces=NAMESPACES) if components['cpe-dict'] else None
+    return oval_platforms
 
-    write_xml(xccdf_root, "xccdf.xml", benchmark_dir)
-    write_xml(oval_root, "oval.xml", benchmark_dir)
-    write_xml(cpe_oval_root, "cpe-oval.xml", benchmark_dir)
-    write_xml(cpe_dict_root, "cpe-dictionary.xml", benchmark_dir)
-    # Create mapping
+
+def build_xccdf_to_oval_map(xccdf_root):
     xccdf_to_oval_def = {}
     if xccdf_root is not None:
         for rule in xccdf_root.findall(".//xccdf:Rule", namespaces=NAMESPACES):
@@ -285,6 +208,267 @@ def parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type):
                     if href is None:
                         href = check_ref[0].get("href")
                     xccdf_to_oval_def[rule_id] = href
+    return xccdf_to_oval_def
+
+
+def _format_definition_ids(definition_ids):
+    # Same text as str(set) but sorted, so rows don't depend on hash seed
+    return "{" + ", ".join(repr(d) for d in sorted(definition_ids)) + "}"
+
+
+def _write_tree(tree, out_path):
+    # Write through a temp file: rules sharing an XCCDF id may land on
+    # different workers and target the same path.
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    tree.write(tmp_path, pretty_print=True, encoding="utf-8", xml_declaration=True)
+    os.replace(tmp_path, out_path)
+
+
+def extract_rule_artifacts(xccdf_dsa, oval_dsa, rule_id, definition_id, ovals_dir, xccdf_dir, ben_platform):
+    """
+    Extract, write and analyze a single rule from already-parsed documents.
+    Returns a plain dict so it can travel back from a worker process.
+    """
+    result = {
+        "rule_id": rule_id,
+        "definition_id": definition_id,
+        "xccdf_rule_id": None,
+        "xccdf_filename": None,
+        "xccdf_path": None,
+        "oval_filename": None,
+        "oval_path": None,
+        "object_types": [],
+        "supported": None,
+        "unsupported_probes": [],
+        "regex_results": [],
+        "skipped": False,
+        "error": None,
+    }
+    try:
+        rule_id_try = rule_id
+        rule_elem = xccdf_dsa.rules_by_id.get(rule_id_try)
+
+        if rule_elem is None and re.search(r'_\d+$', rule_id):
+            rule_id_try = re.sub(r'_\d+$', '', rule_id)
+            rule_elem = xccdf_dsa.rules_by_id.get(rule_id_try)
+
+        if rule_elem is None:
+            raise Exception(f"Rule {rule_id} or {rule_id_try} not found in XCCDF.")
+
+        xccdf_tree = lxml_etree.ElementTree(xccdf_dsa.extract_rule(rule_id_try))
+
+        # NEW: generate safe hashed filename
+        safe_filename = safe_rule_filename(rule_id_try)
+
+        out_path_xccdf = os.path.join(xccdf_dir, safe_filename)
+        _write_tree(xccdf_tree, out_path_xccdf)
+
+        # store mapping for this rule
+        result["xccdf_rule_id"] = rule_id_try
+        result["xccdf_filename"] = safe_filename
+        result["xccdf_path"] = out_path_xccdf
+        if "sce/" in definition_id:
+            print(f"⚠ Skipping SCE rule: {rule_id}")
+            result["skipped"] = True
+            return result
+        if "Manual Rule" in definition_id:
+            result["skipped"] = True
+            return result
+
+        temp_dsa = oval_dsa.extract_definition(definition_id)
+        tree = lxml_etree.ElementTree(temp_dsa.to_lxml_element())
+        safe_filename = safe_rule_filename(rule_id)
+        out_path = os.path.join(ovals_dir, safe_filename)
+        _write_tree(tree, out_path)
+        result["oval_filename"] = safe_filename
+        result["oval_path"] = out_path
+
+        analyzer = OvalAnalyzer(temp_dsa)
+        object_types = analyzer._extract_object_types(definition_id)
+        print(object_types)
+        analysis_results = analyzer.analyze(ben_platform)
+        regex_results = analyzer.analyze_regex()
+
+        result["object_types"] = sorted(object_types)
+        result["supported"] = analysis_results[definition_id]['supported']
+        result["unsupported_probes"] = sorted(analysis_results[definition_id]['unsupported_types'])
+        result["regex_results"] = [
+            {
+                "node_id": regex_issue['node_id'],
+                "definition_id": _format_definition_ids(regex_issue['definition_id']),
+                "regex": regex_issue['regex'],
+                "reason": regex_issue['reason']
+            }
+            for regex_issue in regex_results
+        ]
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+# Parsed documents held by each extraction worker process
+_worker_xccdf_dsa = None
+_worker_oval_dsa = None
+
+
+def _init_extraction_worker(oval_bytes, xccdf_bytes):
+    global _worker_xccdf_dsa, _worker_oval_dsa
+    _worker_xccdf_dsa = XccdfDSA(xccdf_bytes)
+    _worker_oval_dsa = OvalDSA(oval_bytes)
+
+
+def _extract_rule_task(task):
+    return extract_rule_artifacts(_worker_xccdf_dsa, _worker_oval_dsa, *task)
+
+
+def extract_rules(oval_bytes, xccdf_bytes, xccdf_to_oval_def, ovals_dir, xccdf_dir, ben_platform, workers=None):
+    """
+    Run extract_rule_artifacts for every rule, sharded across a process pool
+    when workers > 1. Each worker parses the documents once. Results are
+    returned in xccdf_to_oval_def order whatever the worker count.
+    """
+    workers = EXTRACTION_WORKERS if workers is None else workers
+    tasks = [
+        (rule_id, definition_id, ovals_dir, xccdf_dir, ben_platform)
+        for rule_id, definition_id in xccdf_to_oval_def.items()
+    ]
+    progress = current_progress()
+    progress.stage("extract", total=len(tasks))
+
+    def collect(results):
+        collected = []
+        for result in results:
+            error = result["error"] and f"{result['rule_id']}: {result['error']}"
+            progress.advance(error=error)
+            collected.append(result)
+        return collected
+
+    if workers <= 1 or len(tasks) <= 1:
+        # Parse both documents once; per-rule extracts are copied out of these.
+        xccdf_dsa = XccdfDSA(xccdf_bytes)
+        oval_dsa = OvalDSA(oval_bytes)
+        return collect(extract_rule_artifacts(xccdf_dsa, oval_dsa, *task) for task in tasks)
+
+    workers = min(workers, len(tasks))
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_extraction_worker,
+        initargs=(oval_bytes, xccdf_bytes)
+    ) as executor:
+        return collect(executor.map(_extract_rule_task, tasks, chunksize=chunksize))
+
+
+def process_rules(
+    oval_bytes,
+    xccdf_to_oval_def,
+    benchmark_name,
+    benchmark_type,
+    benchmark_dir,
+    ben_platform,
+    xccdf_bytes,
+    workers=None
+):
+    session = SessionLocal()
+    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark_name).first()
+
+    ovals_dir = os.path.join(benchmark_dir, "ovals")
+    xccdf_dir = os.path.join(benchmark_dir, "xccdf")
+    os.makedirs(ovals_dir, exist_ok=True)
+    os.makedirs(xccdf_dir, exist_ok=True)
+    generated_rules = []
+    xccdf_filename_map = load_filename_map(xccdf_dir, "xccdf_rule_filename_map.json")
+    oval_filename_map = load_filename_map(ovals_dir, "oval_rule_filename_map.json")
+
+    results = extract_rules(
+        oval_bytes,
+        xccdf_bytes,
+        xccdf_to_oval_def,
+        ovals_dir,
+        xccdf_dir,
+        ben_platform,
+        workers
+    )
+
+    ingest = BulkIngest(session)
+    results_by_rule = {}
+    for result in results:
+        rule_id = result["rule_id"]
+        if result["xccdf_rule_id"]:
+            xccdf_filename_map[result["xccdf_rule_id"]] = result["xccdf_filename"]
+        if result["error"]:
+            print(f"⚠ Failed to extract OVAL for rule {rule_id}: {result['error']}")
+            continue
+        if result["skipped"]:
+            continue
+        oval_filename_map[rule_id] = result["oval_filename"]
+        results_by_rule[rule_id] = result
+
+        rule_supported = result["supported"]
+        ingest.add_rule(
+            {
+                "benchmark_id": benchmark_obj.id,
+                "rule_id": rule_id,
+                "definition_id": result["definition_id"],
+                "oval_path": result["oval_path"],
+                "xccdf_path": result["xccdf_path"],
+                "object_type": ",".join(result["object_types"]),
+                "supported": 1 if rule_supported else 0,
+                "unsupported_probes": None if rule_supported else json.dumps(result["unsupported_probes"]),
+                "manual": False,
+                "benchmark_type": benchmark_type
+            },
+            [
+                {
+                    "definition_id": regex_issue['definition_id'],
+                    "object_id": regex_issue['node_id'],
+                    "pattern": regex_issue['regex'],
+                    "reason": regex_issue['reason']
+                }
+                for regex_issue in result["regex_results"]
+            ],
+            object_type_rows(result["object_types"], result["unsupported_probes"])
+        )
+
+    progress = current_progress()
+    progress.stage("save", total=len(ingest.rules))
+    try:
+        inserted, failed = ingest.finish()
+        for rule_id, error in failed.items():
+            print(f"⚠ Failed to save rule {rule_id}: {error}")
+            progress.advance(error=f"{rule_id}: {error}")
+        progress.advance(len(inserted))
+        for rule_id in inserted:
+            result = results_by_rule[rule_id]
+            generated_rules.append({
+                "rule_id": result["rule_id"],
+                "definition_id": result["definition_id"],
+                "oval_path": result["oval_path"],
+                "xccdf_path": result["xccdf_path"]
+            })
+        print(f"✅ Saved {len(inserted)} rules for benchmark {benchmark_name} ({len(failed)} failed)")
+    except Exception as e:
+        print(f"⚠ Failed to save rules for benchmark {benchmark_name}: {e}")
+        progress.error(f"Failed to save rules: {e}")
+
+    save_filename_map(xccdf_dir, "xccdf_rule_filename_map.json", xccdf_filename_map)
+    save_filename_map(ovals_dir, "oval_rule_filename_map.json", oval_filename_map)
+    session.close()
+    return generated_rules
+
+def parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type, workers=None):
+    print(f"🔍 Parsing: {file_path}")
+    current_progress().stage("parse")
+    oval_platforms = stream_scap_components(file_path, benchmark_dir)
+
+    xccdf_path = os.path.join(benchmark_dir, "xccdf.xml")
+    xccdf_root = None
+    if os.path.exists(xccdf_path):
+        xccdf_root = etree.parse(xccdf_path, etree.XMLParser(huge_tree=SCAP_HUGE_TREE)).getroot()
+
+    # Create mapping
+    xccdf_to_oval_def = build_xccdf_to_oval_map(xccdf_root)
 
     with open(os.path.join(benchmark_dir, "xccdf_to_oval_definition_map.json"), "w", encoding="utf-8") as f:
         json.dump(xccdf_to_oval_def, f, indent=2)
@@ -302,7 +486,7 @@ def parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type):
     with open(xccdf_path, "rb") as f:
         xccdf_bytes = f.read()    
 
-    ben_platform = detect_benchmark_type_from_roots(xccdf_root, oval_root)
+    ben_platform = detect_benchmark_type_from_roots(xccdf_root, None, oval_platforms)
 
     return process_rules(
         oval_bytes,
@@ -311,30 +495,15 @@ def parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type):
         benchmark_type,
         benchmark_dir,
         ben_platform,
-        xccdf_bytes
+        xccdf_bytes,
+        workers
     )
 
-def parse_cis_stig(xccdf_path, oval_path, benchmark_dir, benchmark_name,benchmark_type):
+def parse_cis_stig(xccdf_path, oval_path, benchmark_dir, benchmark_name,benchmark_type, workers=None):
+    current_progress().stage("parse")
     xccdf_root = etree.parse(xccdf_path)
     oval_root = etree.parse(oval_path)
-    xccdf_to_oval_def = {}
-    if xccdf_root is not None:
-        for rule in xccdf_root.findall(".//xccdf:Rule", namespaces=NAMESPACES):
-            rule_id = rule.get("id")
-            check_ref = rule.findall(".//xccdf:check/xccdf:check-content-ref", namespaces=NAMESPACES)
-            if check_ref is not None:
-                if len(check_ref) > 1:
-                    for i,check in enumerate(check_ref):
-                        href = check.get("name")
-                        if href:
-                            xccdf_to_oval_def[rule_id+"_"+str(i)] = href
-                elif len(check_ref) == 0:
-                      xccdf_to_oval_def[rule_id] = "Manual Rule"          
-                else:            
-                    href = check_ref[0].get("name")
-                    if href is None:
-                        href = check_ref[0].get("href")
-                    xccdf_to_oval_def[rule_id] = href
+    xccdf_to_oval_def = build_xccdf_to_oval_map(xccdf_root)
 
     with open(os.path.join(benchmark_dir, "xccdf_to_oval_definition_map.json"), "w", encoding="utf-8") as f:
         json.dump(xccdf_to_oval_def, f, indent=2)
@@ -354,5 +523,6 @@ def parse_cis_stig(xccdf_path, oval_path, benchmark_dir, benchmark_name,benchmar
         benchmark_type,
         benchmark_dir,
         ben_platform,
-        xccdf_bytes
+        xccdf_bytes,
+        workers
     )
\ No newline at end of file
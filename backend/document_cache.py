@@ -0,0 +1,173 @@
+# backend/document_cache.py
+
+import itertools
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from backend.oval_cache import OvalGraphCache
+from backend.oval_parser import OvalDSA
+from backend.xccdf_parser import XccdfDSA
+from backend.xml_stream import coalesce_chunks
+
+# Budget for the estimated size of all entries; DOCUMENT_CACHE_MAX_BYTES is the older name
+DOCUMENT_CACHE_MAX_ESTIMATED_BYTES = int(os.getenv(
+    "DOCUMENT_CACHE_MAX_ESTIMATED_BYTES",
+    os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+))
+
+# Memory is not measured per entry. An entry is charged its source file size
+# times the factor for its kind, taken from the resident memory one load adds
+# (python -m benchmarks.document_cache_sizes): a parsed OVAL with its compact
+# graph is about 17x oval.xml, a parsed XCCDF about 12x, the graph cache about
+# 4.5x the oval.xml it is keyed on, and JSON maps about 6.5x. Other kinds use
+# PARSED_SIZE_FACTOR.
+PARSED_SIZE_FACTORS = {"oval": 17, "xccdf": 12, "oval_graph": 5}
+PARSED_SIZE_FACTOR = 7
+
+
+class DocumentCache:
+    """
+    Bounded LRU of parsed benchmark documents, keyed by (kind, path).
+    An entry is reused only while the source file's mtime and size are
+    unchanged. Each entry's size is estimated from its source file (see
+    PARSED_SIZE_FACTORS) and the least recently used entries are evicted
+    once the estimates exceed max_estimated_bytes.
+    """
+
+    def __init__(self, max_estimated_bytes=DOCUMENT_CACHE_MAX_ESTIMATED_BYTES):
+        self.max_estimated_bytes = max_estimated_bytes
+        self.estimated_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, kind, path, loader):
+        """
+        Return the cached value for path, calling loader(path) on a miss.
+        Cached values are shared between requests and must be treated as
+        read-only.
+        """
+        key = (kind, os.path.abspath(path))
+        stamp = self._stamp(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["stamp"] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["value"]
+            self.misses += 1
+
+        # Load outside the lock so other documents stay available meanwhile
+        value = loader(path)
+        estimated_size = stamp[1] * PARSED_SIZE_FACTORS.get(kind, PARSED_SIZE_FACTOR)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.estimated_bytes -= old["estimated_size"]
+            if estimated_size <= self.max_estimated_bytes:
+                self._entries[key] = {"stamp": stamp, "estimated_size": estimated_size, "value": value}
+                self.estimated_bytes += estimated_size
+                while self.estimated_bytes > self.max_estimated_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.estimated_bytes -= evicted["estimated_size"]
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, path=None):
+        """Drop entries for path (a file or a benchmark directory), or all of them."""
+        target = os.path.abspath(path) if path is not None else None
+        with self._lock:
+            for key in list(self._entries):
+                if target is None or key[1] == target or key[1].startswith(target + os.sep):
+                    self.estimated_bytes -= self._entries.pop(key)["estimated_size"]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "estimated_bytes": self.estimated_bytes,
+                "max_estimated_bytes": self.max_estimated_bytes,
+                "documents": [
+                    {"kind": kind, "path": path, "estimated_bytes": entry["estimated_size"]}
+                    for (kind, path), entry in self._entries.items()
+                ]
+            }
+
+
+document_cache = DocumentCache()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_oval_dsa(benchmark_dir):
+    return document_cache.get(
+        "oval",
+        os.path.join(benchmark_dir, "oval.xml"),
+        lambda path: OvalDSA(_read_bytes(path), compact=True)
+    )
+
+
+def get_xccdf_dsa(benchmark_dir):
+    return document_cache.get(
+        "xccdf",
+        os.path.join(benchmark_dir, "xccdf.xml"),
+        lambda path: XccdfDSA(_read_bytes(path))
+    )
+
+
+def get_oval_graph_cache(benchmark_dir):
+    # Keyed on oval.xml: the on-disk graph cache follows that file
+    return document_cache.get(
+        "oval_graph",
+        os.path.join(benchmark_dir, "oval.xml"),
+        lambda path: OvalGraphCache.load(benchmark_dir)
+    )
+
+
+def get_definition_map(benchmark_dir):
+    return document_cache.get(
+        "definition_map",
+        os.path.join(benchmark_dir, "xccdf_to_oval_definition_map.json"),
+        _read_json
+    )
+
+
+def get_filename_map(path):
+    return document_cache.get("filename_map", path, _read_json)
+
+
+def full_oval_chunks(benchmark_dir, definition_ids):
+    """
+    OVAL document holding definition_ids and everything they reference, as
+    an iterator of byte chunks: sliced from the graph cache, or serialized
+    from a parse when the file has no byte spans.
+    """
+    chunks = iter(get_oval_graph_cache(benchmark_dir).iter_xml_chunks(definition_ids))
+    first = next(chunks, None)
+    if first is None:
+        return get_oval_dsa(benchmark_dir).definition_view(definition_ids).iter_xml_chunks()
+    return coalesce_chunks(itertools.chain([first], chunks))
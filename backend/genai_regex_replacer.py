@@ -1,6 +1,9 @@
 import os
 import json
 import requests
+from backend.database import SessionLocal
+from backend.models import Benchmark
+from backend.job_progress import current_progress
 
 GENAI_API_URL = "<URL_HERE>"
 GENAI_HUB_TOKEN = os.getenv("GENAI_HUB_TOKEN")
@@ -70,3 +73,47 @@ def call_genai_api(model_name: str, regex: str) -> dict:
         raise Exception("⚠ No regex results returned from GenAIHub.")
 
     return regex_array[0]
+
+
+def run_genai_conversion_for_benchmark(benchmark_name: str, model_name: str):
+    session = SessionLocal()
+
+    benchmark = session.query(Benchmark).filter_by(name=benchmark_name).first()
+    if not benchmark:
+        print(f"❌ Benchmark not found: {benchmark_name}")
+        session.close()
+        return
+
+    pending = [
+        regex_obj
+        for rule in benchmark.rules
+        for regex_obj in rule.unsupported_regex
+        if not regex_obj.processed_pattern
+    ]
+    progress = current_progress()
+    progress.stage("genai", total=len(pending))
+
+    total_converted = 0
+
+    for regex_obj in pending:
+        print(f"🔍 Processing regex: {regex_obj.pattern}")
+
+        try:
+            result = call_genai_api(model_name, regex_obj.pattern)
+
+            regex_obj.processed_pattern = result["converted_regex"]
+            regex_obj.tests_json = json.dumps(result.get("tests", []))
+            # Keep each conversion even if a later call fails the job
+            session.commit()
+
+            total_converted += 1
+            progress.advance()
+
+        except Exception as e:
+            session.rollback()
+            print(f"❌ Error processing regex {regex_obj.pattern}: {e}")
+            progress.advance(error=f"{regex_obj.pattern}: {e}")
+
+    session.close()
+
+    print(f"✅ Converted {total_converted} regexes for benchmark {benchmark_name}")
@@ -0,0 +1,121 @@
+# backend/job_progress.py
+#
+# Progress reporting for long-running flows. The job worker installs a
+# JobProgress for the job it is running; code further down reports through
+# current_progress(), which is a no-op reporter outside a job. Progress is
+# stored on the job row so the API process can stream it to the UI.
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from sqlalchemy import text
+
+from backend.database import engine
+
+# Minimum seconds between progress writes for one job
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "0.5"))
+# Errors kept with the progress; older ones are only counted
+JOB_PROGRESS_MAX_ERRORS = 20
+
+_current = contextvars.ContextVar("job_progress", default=None)
+
+
+class JobProgress:
+    """
+    Stage, done/total, rate, ETA and errors for one job. Thread-safe; writes
+    are throttled to one per JOB_PROGRESS_INTERVAL except on stage changes
+    and flush(). With job_id=None nothing is written.
+    """
+
+    def __init__(self, job_id=None, interval=JOB_PROGRESS_INTERVAL):
+        self.job_id = job_id
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stage_name = None
+        self.stage_started = time.time()
+        self.done = 0
+        self.total = None
+        self.errors = 0
+        self.recent_errors = []
+        self.last_write = 0.0
+
+    def stage(self, name, total=None):
+        with self.lock:
+            self.stage_name = name
+            self.stage_started = time.time()
+            self.done = 0
+            self.total = total
+        self.flush()
+
+    def advance(self, count=1, error=None):
+        with self.lock:
+            self.done += count
+            if error:
+                self._add_error(error)
+        self._write()
+
+    def error(self, message):
+        with self.lock:
+            self._add_error(message)
+        self._write()
+
+    def _add_error(self, message):
+        self.errors += 1
+        self.recent_errors.append(str(message))
+        del self.recent_errors[:-JOB_PROGRESS_MAX_ERRORS]
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = time.time() - self.stage_started
+            rate = self.done / elapsed if self.done and elapsed > 0 else None
+            eta = (self.total - self.done) / rate if rate and self.total is not None else None
+            return {
+                "stage": self.stage_name,
+                "done": self.done,
+                "total": self.total,
+                "rate": round(rate, 3) if rate else None,
+                "eta_seconds": round(max(eta, 0.0), 1) if eta is not None else None,
+                "errors": self.errors,
+                "recent_errors": list(self.recent_errors)
+            }
+
+    def flush(self):
+        self._write(force=True)
+
+    def _write(self, force=False):
+        if self.job_id is None:
+            return
+        now = time.time()
+        with self.lock:
+            if not force and now - self.last_write < self.interval:
+                return
+            self.last_write = now
+        progress = self.snapshot()
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "UPDATE jobs SET progress = :progress, updated_at = :now WHERE id = :id"
+                ), {"progress": json.dumps(progress), "now": now, "id": self.job_id})
+        except Exception as e:
+            # Progress is best effort; never fail the job over it
+            print(f"⚠ Could not record progress for job {self.job_id}: {e}")
+
+
+def current_progress():
+    """The reporter for the job running in this context, or a no-op one."""
+    progress = _current.get()
+    return progress if progress is not None else JobProgress()
+
+
+@contextlib.contextmanager
+def track_progress(job_id):
+    progress = JobProgress(job_id)
+    token = _current.set(progress)
+    try:
+        yield progress
+    finally:
+        _current.reset(token)
+        progress.flush()
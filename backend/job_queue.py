@@ -0,0 +1,209 @@
+# backend/job_queue.py
+#
+# Durable job queue stored in the jobs table. The API enqueues; worker
+# processes (backend/job_worker.py) claim jobs under a lease, renew it while
+# they run, and report success or failure. A job whose lease runs out is
+# picked up again by another worker.
+
+import hashlib
+import json
+import os
+import time
+from sqlalchemy import text
+
+from backend.database import SessionLocal, engine
+from backend.models import Job
+
+# Seconds a claimed job stays owned without a heartbeat
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Retry n waits JOB_RETRY_BACKOFF * 2**(n-1) seconds, capped at an hour
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "30"))
+JOB_RETRY_BACKOFF_MAX = 3600.0
+# Job types that never run twice at once for the same benchmark, whichever
+# worker process would claim them
+PER_BENCHMARK_JOB_TYPES = {"rebuild_dirty"}
+
+
+def enqueue_job(job_type, payload, benchmark=None, max_attempts=None, dedupe=False):
+    """
+    Queue a job and return its id. With dedupe=True an identical job that
+    is still queued is reused instead of adding another. The unique index on
+    queued (job_type, dedupe_key) makes that hold for concurrent callers too.
+    """
+    payload_json = json.dumps(payload, sort_keys=True)
+    dedupe_key = hashlib.sha256(payload_json.encode("utf-8")).hexdigest() if dedupe else None
+    now = time.time()
+    with engine.begin() as conn:
+        job_id = conn.execute(text("""
+            INSERT INTO jobs (job_type, benchmark, payload, dedupe_key, status, attempts,
+                              max_attempts, run_after, created_at, updated_at)
+            VALUES (:job_type, :benchmark, :payload, :dedupe_key, 'queued', 0,
+                    :max_attempts, :now, :now, :now)
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        """), {
+            "job_type": job_type,
+            "benchmark": benchmark,
+            "payload": payload_json,
+            "dedupe_key": dedupe_key,
+            "max_attempts": max_attempts or JOB_MAX_ATTEMPTS,
+            "now": now
+        }).scalar()
+        if job_id is None:
+            # The INSERT took the write lock, so the conflicting job is still queued
+            job_id = conn.execute(text(
+                "SELECT id FROM jobs WHERE job_type = :job_type AND dedupe_key = :dedupe_key AND status = 'queued'"
+            ), {"job_type": job_type, "dedupe_key": dedupe_key}).scalar()
+    return job_id
+
+
+def claim_job(worker_id, job_type, limit):
+    """
+    Atomically take the oldest runnable job of job_type, unless limit jobs
+    of that type already hold a live lease. Runnable means queued and due,
+    or running with an expired lease and attempts left. Claiming clears the
+    dedupe key, so the next identical enqueue queues a fresh job. Jobs of a
+    PER_BENCHMARK_JOB_TYPES type wait while one for their benchmark runs.
+    Returns (id, payload dict, attempts) or None.
+    """
+    now = time.time()
+    with engine.begin() as conn:
+        row = conn.execute(text("""
+            UPDATE jobs
+            SET status = 'running',
+                lease_owner = :owner,
+                lease_expires = :expires,
+                attempts = attempts + 1,
+                dedupe_key = NULL,
+                started_at = :now,
+                updated_at = :now,
+                progress = NULL
+            WHERE id = (
+                SELECT candidate.id FROM jobs AS candidate
+                WHERE candidate.job_type = :job_type
+                  AND ((candidate.status = 'queued' AND candidate.run_after <= :now)
+                       OR (candidate.status = 'running' AND candidate.lease_expires < :now
+                           AND candidate.attempts < candidate.max_attempts))
+                  AND (NOT :per_benchmark OR NOT EXISTS (
+                      SELECT 1 FROM jobs AS active
+                      WHERE active.job_type = candidate.job_type
+                        AND active.benchmark IS candidate.benchmark
+                        AND active.status = 'running' AND active.lease_expires >= :now
+                  ))
+                ORDER BY candidate.run_after, candidate.id
+                LIMIT 1
+            )
+            AND (
+                SELECT COUNT(*) FROM jobs
+                WHERE job_type = :job_type AND status = 'running' AND lease_expires >= :now
+            ) < :limit
+            RETURNING id, payload, attempts
+        """), {
+            "owner": worker_id,
+            "expires": now + JOB_LEASE_SECONDS,
+            "now": now,
+            "job_type": job_type,
+            "limit": limit,
+            "per_benchmark": job_type in PER_BENCHMARK_JOB_TYPES
+        }).first()
+    if row is None:
+        return None
+    return row.id, json.loads(row.payload or "{}"), row.attempts
+
+
+def renew_leases(worker_id, job_ids):
+    if not job_ids:
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"UPDATE jobs SET lease_expires = :expires "
+            f"WHERE lease_owner = :owner AND status = 'running' AND id IN ({', '.join(str(int(i)) for i in job_ids)})"
+        ), {"expires": time.time() + JOB_LEASE_SECONDS, "owner": worker_id})
+
+
+def complete_job(job_id, worker_id, result=None):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE jobs
+            SET status = 'succeeded', finished_at = :now, updated_at = :now, result = :result, lease_expires = NULL
+            WHERE id = :id AND lease_owner = :owner
+        """), {"now": time.time(), "result": json.dumps(result, default=str), "id": job_id, "owner": worker_id})
+
+
+def fail_job(job_id, worker_id, error):
+    """Requeue with exponential backoff, or mark failed once attempts run out."""
+    now = time.time()
+    with engine.begin() as conn:
+        row = conn.execute(text(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = :id AND lease_owner = :owner"
+        ), {"id": job_id, "owner": worker_id}).first()
+        if row is None:
+            return
+        if row.attempts < row.max_attempts:
+            delay = min(JOB_RETRY_BACKOFF * 2 ** (row.attempts - 1), JOB_RETRY_BACKOFF_MAX)
+            conn.execute(text("""
+                UPDATE jobs
+                SET status = 'queued', run_after = :run_after, updated_at = :now,
+                    last_error = :error, lease_expires = NULL
+                WHERE id = :id
+            """), {"run_after": now + delay, "now": now, "error": error, "id": job_id})
+        else:
+            conn.execute(text("""
+                UPDATE jobs
+                SET status = 'failed', finished_at = :now, updated_at = :now,
+                    last_error = :error, lease_expires = NULL
+                WHERE id = :id
+            """), {"now": now, "error": error, "id": job_id})
+
+
+def expire_abandoned_jobs():
+    """Fail running jobs whose lease ran out with no attempts left."""
+    now = time.time()
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE jobs
+            SET status = 'failed', finished_at = :now, updated_at = :now,
+                last_error = COALESCE(last_error, 'Worker lease expired')
+            WHERE status = 'running' AND lease_expires < :now AND attempts >= max_attempts
+        """), {"now": now})
+
+
+def job_to_dict(job):
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "benchmark": job.benchmark,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_after": job.run_after,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "last_error": job.last_error,
+        "result": json.loads(job.result) if job.result else None,
+        "progress": json.loads(job.progress) if job.progress else None,
+        "updated_at": job.updated_at
+    }
+
+
+def jobs_changed_since(since=None, job_id=None, benchmark=None):
+    """
+    Jobs updated after since, oldest change first. Without since, the
+    current state: the job itself, or every queued or running job.
+    """
+    session = SessionLocal()
+    try:
+        query = session.query(Job)
+        if job_id is not None:
+            query = query.filter(Job.id == job_id)
+        if benchmark is not None:
+            query = query.filter(Job.benchmark == benchmark)
+        if since is not None:
+            query = query.filter(Job.updated_at > since)
+        elif job_id is None:
+            query = query.filter(Job.status.in_(["queued", "running"]))
+        return [job_to_dict(job) for job in query.order_by(Job.updated_at, Job.id).all()]
+    finally:
+        session.close()
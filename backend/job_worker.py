@@ -0,0 +1,121 @@
+# backend/job_worker.py
+#
+# Runs queued jobs outside the API process:
+#
+#   python -m backend.job_worker
+#
+# Any number of workers can run against the same database. JOB_CONCURRENCY
+# caps how many jobs of each type run at once across all of them, e.g.
+# "import_disa=1,import_cis=1,build_sensors=2".
+
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.database import init_db
+from backend.job_progress import track_progress
+from backend.job_queue import JOB_LEASE_SECONDS, claim_job, complete_job, fail_job, renew_leases, expire_abandoned_jobs
+from backend.jobs import JOB_HANDLERS
+
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+DEFAULT_JOB_CONCURRENCY = {
+    "import_disa": 1,
+    "import_cis": 1,
+    "build_sensors": 2,
+    "benchmark_sensor": 1,
+    "rebuild_dirty": 1,
+    "genai_regex": 1,
+    "userright_transform": 1,
+    "vci_debug": 1,
+}
+
+
+def parse_concurrency(value):
+    limits = dict(DEFAULT_JOB_CONCURRENCY)
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        job_type, _, limit = item.partition("=")
+        limits[job_type.strip()] = int(limit)
+    return {job_type: limit for job_type, limit in limits.items() if job_type in JOB_HANDLERS and limit > 0}
+
+
+JOB_CONCURRENCY = parse_concurrency(os.getenv("JOB_CONCURRENCY"))
+
+
+class JobWorker:
+    def __init__(self, limits=None, worker_id=None, poll_interval=JOB_POLL_INTERVAL):
+        self.limits = limits or JOB_CONCURRENCY
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+        self.running = {}
+        self.running_lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def _run(self, job_id, job_type, payload):
+        try:
+            with track_progress(job_id):
+                result = JOB_HANDLERS[job_type](**payload)
+            complete_job(job_id, self.worker_id, result)
+            print(f"✅ Job {job_id} ({job_type}) finished")
+        except Exception as e:
+            fail_job(job_id, self.worker_id, f"{e}\n{traceback.format_exc()}")
+            print(f"❌ Job {job_id} ({job_type}) failed: {e}")
+        finally:
+            with self.running_lock:
+                self.running.pop(job_id, None)
+
+    def _heartbeat(self):
+        while not self.stop_event.wait(JOB_LEASE_SECONDS / 3):
+            with self.running_lock:
+                job_ids = list(self.running)
+            try:
+                renew_leases(self.worker_id, job_ids)
+            except Exception as e:
+                print(f"⚠ Could not renew job leases: {e}")
+
+    def _claim(self, pool):
+        for job_type, limit in self.limits.items():
+            while True:
+                with self.running_lock:
+                    if sum(1 for t in self.running.values() if t == job_type) >= limit:
+                        break
+                job = claim_job(self.worker_id, job_type, limit)
+                if job is None:
+                    break
+                job_id, payload, attempts = job
+                with self.running_lock:
+                    self.running[job_id] = job_type
+                print(f"🔧 Job {job_id} ({job_type}) started, attempt {attempts}")
+                pool.submit(self._run, job_id, job_type, payload)
+
+    def run(self):
+        print(f"🔧 Job worker {self.worker_id} running: "
+              f"{', '.join(f'{t}={n}' for t, n in self.limits.items())}")
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        with ThreadPoolExecutor(max_workers=sum(self.limits.values())) as pool:
+            while not self.stop_event.is_set():
+                try:
+                    expire_abandoned_jobs()
+                    self._claim(pool)
+                except Exception as e:
+                    print(f"⚠ Job worker poll failed: {e}")
+                self.stop_event.wait(self.poll_interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def main():
+    init_db()
+    worker = JobWorker()
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
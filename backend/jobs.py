@@ -0,0 +1,79 @@
+# backend/jobs.py
+#
+# Job handlers run by backend/job_worker.py. Each takes the job payload as
+# keyword arguments and returns a JSON-serializable result.
+
+from backend.disa_stig import parse_stig, parse_cis_stig
+from backend.genai_regex_replacer import run_genai_conversion_for_benchmark
+from backend.job_queue import enqueue_job
+from backend.sensor_builder import build_sensor_bins, build_benchmark_sensor_bin, rebuild_dirty_sensors
+from backend.userright_transformer import run_userright_transformation
+from backend.vci_executor import run_vci_debug
+
+
+def _queue_sensor_build(benchmark_name, benchmark_dir, rules):
+    job_id = enqueue_job(
+        "build_sensors",
+        {"benchmark": benchmark_name, "benchmark_dir": benchmark_dir, "rules": rules},
+        benchmark=benchmark_name
+    )
+    return {"rules": len(rules), "sensor_job_id": job_id}
+
+
+def import_disa(file_path, benchmark_dir, benchmark_name, benchmark_type="DISA"):
+    rules = parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type)
+    return _queue_sensor_build(benchmark_name, benchmark_dir, rules)
+
+
+def import_cis(xccdf_path, oval_path, benchmark_dir, benchmark_name, benchmark_type="CIS"):
+    rules = parse_cis_stig(xccdf_path, oval_path, benchmark_dir, benchmark_name, benchmark_type)
+    return _queue_sensor_build(benchmark_name, benchmark_dir, rules)
+
+
+def build_sensors(benchmark, benchmark_dir, rules):
+    reports = build_sensor_bins(benchmark, benchmark_dir, rules)
+    failed = {report["rule_id"]: report["error"] for report in reports if report["error"]}
+    return {
+        "built": len(reports) - len(failed),
+        "cache_hits": sum(1 for report in reports if report["cache_hit"]),
+        "failed": failed
+    }
+
+
+def benchmark_sensor(benchmark, benchmark_dir):
+    report = build_benchmark_sensor_bin(benchmark, benchmark_dir)
+    if report["error"]:
+        raise Exception(report["error"])
+    return report
+
+
+def rebuild_dirty(benchmark, benchmark_dir):
+    reports = rebuild_dirty_sensors(benchmark, benchmark_dir)
+    return {
+        "built": sum(1 for report in reports if not report["error"]),
+        "failed": {report["rule_id"]: report["error"] for report in reports if report["error"]}
+    }
+
+
+def genai_regex(benchmark, model_name):
+    run_genai_conversion_for_benchmark(benchmark, model_name)
+
+
+def userright_transform(benchmark):
+    run_userright_transformation(benchmark)
+
+
+def vci_debug(benchmark, benchmark_dir):
+    return {"rules": run_vci_debug(benchmark, benchmark_dir)}
+
+
+JOB_HANDLERS = {
+    "import_disa": import_disa,
+    "import_cis": import_cis,
+    "build_sensors": build_sensors,
+    "benchmark_sensor": benchmark_sensor,
+    "rebuild_dirty": rebuild_dirty,
+    "genai_regex": genai_regex,
+    "userright_transform": userright_transform,
+    "vci_debug": vci_debug,
+}
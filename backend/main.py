@@ -9,6 +9,7 @@ from fastapi import (
     Request,
     Depends,
     Query,
+    Body,
 )
 from fastapi.responses import (
     JSONResponse,
@@ -18,7 +19,9 @@ from fastapi.responses import (
 )
 from backend.utils import *
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from sqlalchemy import and_, case, func, literal, tuple_
 from sqlalchemy.orm import Session
 from collections import defaultdict
 from lxml import etree as ET
@@ -27,17 +30,46 @@ import os
 import re
 import shutil
 import json
+import anyio
+import asyncio
+import base64
+import contextlib
 import io
+import copy
+import time
 from backend.oval_parser import OvalDSA
 from backend.xccdf_parser import XccdfDSA
 from backend.oval_analyzer import OvalAnalyzer
+from backend.oval_cache import OvalGraphCache
+from backend.document_cache import document_cache, get_xccdf_dsa, get_definition_map, full_oval_chunks
+from backend.xml_stream import iter_xml_chunks, open_tree
 from backend.disa_stig import parse_stig, generate_sensor_for_rule, parse_cis_stig
-from backend.database import init_db, SessionLocal
-from backend.models import Benchmark, Rule, UnsupportedRegex, RemoteHost, VCIResult
+from backend.sensor_builder import (
+    mark_rule_edited,
+    BENCHMARK_SENSOR_DIR,
+    BENCHMARK_SENSOR_NAME,
+    BENCHMARK_SENSOR_MAP,
+    SENSOR_REBUILD_DEBOUNCE,
+)
+from backend.database import init_db, get_db, pool_metrics, PoolTimeoutError
+from backend.models import Benchmark, Rule, UnsupportedRegex, RemoteHost, VCIResult, Job
+from backend.rule_object_types import rule_object_type_filter, object_type_coverage
+from backend.job_queue import enqueue_job, job_to_dict, jobs_changed_since
 from backend.vci_executor import *
 from backend.genai_regex_replacer import call_genai_api
 
-app = FastAPI()
+# Sync endpoints run on a bounded threadpool so blocking work (queries,
+# XML parsing and serialization, file I/O) never stalls the event loop
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -52,63 +84,210 @@ os.makedirs(DATA_DIR, exist_ok=True)
 master_key = os.getenv("MASTER_KEY").encode()
 fernet = Fernet(master_key)
 
+# Job event streams poll the jobs table this often
+JOB_EVENTS_POLL_INTERVAL = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", "0.5"))
+JOB_EVENTS_KEEPALIVE = 15.0
+# Each poll looks back this far so a write that committed late is not missed
+JOB_EVENTS_OVERLAP = 2.0
+
 init_db()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+@app.exception_handler(PoolTimeoutError)
+def database_busy(request: Request, exc: PoolTimeoutError):
+    return JSONResponse({"detail": "Database busy, try again"}, status_code=503)
 
 @app.get("/api/benchmarks/{benchmark}/generate-full-oval")
-async def generate_full_benchmark_oval(benchmark: str):
+def generate_full_benchmark_oval(benchmark: str, db: Session = Depends(get_db)):
     benchmark_dir = f"data/{benchmark}"
 
-    oval_path = os.path.join(benchmark_dir, "oval.xml")
-    with open(oval_path, "rb") as f:
-        oval_bytes = f.read()
-
-    with open(os.path.join(benchmark_dir, "xccdf_to_oval_definition_map.json"), "r") as f:
-        xccdf_to_oval_def = json.load(f)
+    xccdf_to_oval_def = get_definition_map(benchmark_dir)
 
-    dsa = OvalDSA(oval_bytes)
-
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
 
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail=f"Benchmark {benchmark} not found")
 
-    rules = session.query(Rule).filter(
+    rule_ids = db.scalars(db.query(Rule.rule_id).filter(
         Rule.benchmark_id == benchmark_obj.id,
         Rule.excluded == 0
-    ).all()
+    ).statement).all()
 
     keep_definitions = []
-    for rule in rules:
-        def_id = xccdf_to_oval_def.get(rule.rule_id)
+    for rule_id in rule_ids:
+        def_id = xccdf_to_oval_def.get(rule_id)
         if def_id:
             keep_definitions.append(def_id)
 
-    dsa.keep_only_definitions(keep_definitions)
-    output_bytes = dsa.to_xml_bytes()
-
     return StreamingResponse(
-        io.BytesIO(output_bytes),
+        full_oval_chunks(benchmark_dir, keep_definitions),
         media_type="application/xml",
         headers={"Content-Disposition": f"attachment; filename={benchmark}_full_oval.xml"}
     )
 
+@app.post("/api/benchmarks/{benchmark}/oval-cache/rebuild")
+def rebuild_oval_cache(benchmark: str):
+    benchmark_dir = f"data/{benchmark}"
+    if not os.path.exists(os.path.join(benchmark_dir, "oval.xml")):
+        raise HTTPException(status_code=404, detail=f"OVAL for benchmark {benchmark} not found")
+
+    oval_cache = OvalGraphCache.load(benchmark_dir, rebuild=True)
+    document_cache.invalidate(os.path.join(benchmark_dir, "oval.xml"))
+    return {
+        "message": f"Rebuilt OVAL graph cache for benchmark {benchmark}",
+        "sha256": oval_cache.sha256,
+        "nodes": oval_cache.graph.node_count
+    }
+
+@app.post("/api/benchmarks/{benchmark}/benchmark-sensor")
+def build_benchmark_sensor(benchmark: str):
+    benchmark_dir = f"data/{benchmark}"
+    if not os.path.exists(os.path.join(benchmark_dir, "oval.xml")):
+        raise HTTPException(status_code=404, detail=f"OVAL for benchmark {benchmark} not found")
+
+    job_id = enqueue_job(
+        "benchmark_sensor",
+        {"benchmark": benchmark, "benchmark_dir": benchmark_dir},
+        benchmark=benchmark,
+        dedupe=True
+    )
+    return {"message": f"Building benchmark sensor for {benchmark}", "job_id": job_id}
+
+@app.get("/api/benchmarks/{benchmark}/benchmark-sensor")
+def download_benchmark_sensor(benchmark: str):
+    sensor_path = os.path.join("data", benchmark, BENCHMARK_SENSOR_DIR, f"{BENCHMARK_SENSOR_NAME}.bin")
+    if not os.path.exists(sensor_path):
+        raise HTTPException(status_code=404, detail=f"No benchmark sensor built for {benchmark}")
+    return FileResponse(sensor_path, media_type="application/octet-stream", filename=f"{benchmark}.bin")
+
+@app.get("/api/benchmarks/{benchmark}/benchmark-sensor/map")
+def get_benchmark_sensor_map(benchmark: str):
+    map_path = os.path.join("data", benchmark, BENCHMARK_SENSOR_DIR, BENCHMARK_SENSOR_MAP)
+    if not os.path.exists(map_path):
+        raise HTTPException(status_code=404, detail=f"No benchmark sensor built for {benchmark}")
+    with open(map_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def enqueue_dirty_rebuild(benchmark):
+    # Saves in quick succession share the queued rebuild
+    return enqueue_job(
+        "rebuild_dirty",
+        {"benchmark": benchmark, "benchmark_dir": f"data/{benchmark}"},
+        benchmark=benchmark,
+        dedupe=True
+    )
+
+@app.post("/api/benchmarks/{benchmark}/rebuild-dirty")
+def rebuild_dirty_rule_sensors(benchmark: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
+    if not benchmark_obj:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+
+    dirty_count = db.query(Rule).filter(
+        Rule.benchmark_id == benchmark_obj.id,
+        Rule.dirty == 1,
+        Rule.excluded == 0
+    ).count()
+
+    job_id = enqueue_dirty_rebuild(benchmark)
+    return {
+        "message": f"Rebuilding sensors for {dirty_count} dirty rules",
+        "dirty": dirty_count,
+        "debounce_seconds": SENSOR_REBUILD_DEBOUNCE,
+        "job_id": job_id
+    }
+
+@app.get("/api/jobs")
+def list_jobs(benchmark: str = None, status: str = None, limit: int = 50, db: Session = Depends(get_db)):
+    query = db.query(Job)
+    if benchmark:
+        query = query.filter(Job.benchmark == benchmark)
+    if status:
+        query = query.filter(Job.status == status)
+    return [job_to_dict(job) for job in query.order_by(Job.id.desc()).limit(limit)]
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+async def job_event_stream(request: Request, job_id: int = None, benchmark: str = None):
+    """
+    Server-Sent Events for job changes: the current state first, then every
+    status or progress update. A single-job stream ends once the job has
+    finished.
+    """
+    seen = {}
+    latest = None
+    last_sent = time.time()
+    while not await request.is_disconnected():
+        poll_started = time.time()
+        since = None if latest is None else latest - JOB_EVENTS_OVERLAP
+        jobs = await run_in_threadpool(jobs_changed_since, since, job_id, benchmark)
+        latest = max([latest or poll_started] + [job["updated_at"] or 0 for job in jobs])
+
+        finished = False
+        for job in jobs:
+            if seen.get(job["id"]) == job["updated_at"]:
+                continue
+            seen[job["id"]] = job["updated_at"]
+            last_sent = time.time()
+            yield f"event: job\ndata: {json.dumps(job, default=str)}\n\n"
+            finished = finished or job["status"] in ("succeeded", "failed")
+
+        if job_id is not None and finished:
+            return
+        if time.time() - last_sent >= JOB_EVENTS_KEEPALIVE:
+            last_sent = time.time()
+            yield ": keepalive\n\n"
+        await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+
+
+def event_stream_response(events):
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/jobs/{job_id}/events")
+# Function scope: the stream outlives the handler and must not hold a connection
+def stream_job_events(job_id: int, request: Request, db: Session = Depends(get_db, scope="function")):
+    if not db.get(Job, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return event_stream_response(job_event_stream(request, job_id=job_id))
+
+@app.get("/api/benchmarks/{benchmark}/events")
+def stream_benchmark_events(benchmark: str, request: Request):
+    return event_stream_response(job_event_stream(request, benchmark=benchmark))
+
+@app.get("/api/events")
+def stream_all_job_events(request: Request):
+    return event_stream_response(job_event_stream(request))
+
+@app.get("/api/cache/stats")
+def get_document_cache_stats():
+    return document_cache.stats()
+
+@app.get("/api/db/stats")
+def get_db_stats():
+    return pool_metrics.snapshot()
+
+@app.delete("/api/cache")
+def clear_document_cache():
+    document_cache.invalidate()
+    return {"message": "Document cache cleared"}
+
 @app.get("/api/benchmarks/{benchmark}/rules/{rule_id}/oval")
-async def serve_existing_rule_oval(benchmark: str, rule_id: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+def serve_existing_rule_oval(benchmark: str, rule_id: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
 
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rule = session.query(Rule).filter_by(
+    rule = db.query(Rule).filter_by(
         benchmark_id=benchmark_obj.id,
         rule_id=rule_id,
         excluded=0
@@ -127,17 +306,16 @@ class DeleteRulesRequest(BaseModel):
     rule_ids: list[str]
 
 @app.delete("/api/benchmarks/{benchmark}/rules")
-async def delete_rules(benchmark: str, request: DeleteRulesRequest):
+def delete_rules(benchmark: str, request: DeleteRulesRequest, db: Session = Depends(get_db)):
     rule_ids = request.rule_ids
     if not rule_ids:
         raise HTTPException(status_code=400, detail="No rule IDs provided")
 
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rules = session.query(Rule).filter(
+    rules = db.query(Rule).filter(
         Rule.benchmark_id == benchmark_obj.id,
         Rule.rule_id.in_(rule_ids)
     ).all()
@@ -145,97 +323,85 @@ async def delete_rules(benchmark: str, request: DeleteRulesRequest):
     for rule in rules:
         rule.excluded = 1
 
-    session.commit()
+    db.commit()
 
     return {"message": f"Excluded {len(rules)} rules"}
 
-def process_stig_file(file_path: str, benchmark_dir: str, benchmark_name: str, benchmark_type: str = "DISA", background_tasks: BackgroundTasks = None):
-    rules = parse_stig(file_path, benchmark_dir, benchmark_name, benchmark_type)
-    if background_tasks:
-        for rule in rules:
-            background_tasks.add_task(
-                generate_sensor_for_rule,
-                benchmark_name,
-                benchmark_dir,
-                rule["rule_id"],
-                rule["definition_id"],
-                rule["oval_path"]
-            )
-
-def process_cis_file(xccdf_path: str, oval_path: str, benchmark_dir: str, benchmark_name: str, benchmark_type: str = "CIS",background_tasks: BackgroundTasks = None):
-    rules = parse_cis_stig(xccdf_path, oval_path, benchmark_dir, benchmark_name, benchmark_type)
-    if background_tasks:
-        for rule in rules:
-            background_tasks.add_task(
-                generate_sensor_for_rule,
-                benchmark_name,
-                benchmark_dir,
-                rule["rule_id"],
-                rule["definition_id"],
-                rule["oval_path"]
-            )
-
 @app.post("/api/stig/upload")
-async def upload_stig_file(
+def upload_stig_file(
     benchmark_name: str = Form(...),
     benchmark_type: str = Form(...),
     stig_file: UploadFile = None,
     xccdf_file: UploadFile = None,
     oval_file: UploadFile = None,
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    db: Session = Depends(get_db)
 ):
     try:
         benchmark_dir = os.path.join(DATA_DIR, benchmark_name)
         os.makedirs(benchmark_dir, exist_ok=True)
 
-        session = SessionLocal()
         benchmark = Benchmark(name=benchmark_name, benchmark_type=benchmark_type)
-        session.add(benchmark)
-        session.commit()
+        db.add(benchmark)
+        db.commit()
 
         if benchmark_type == "DISA":
             file_path = os.path.join(benchmark_dir, stig_file.filename)
             with open(file_path, "wb") as f:
-                f.write(await stig_file.read())
-
-            background_tasks.add_task(process_stig_file, file_path, benchmark_dir, benchmark_name, "DISA", background_tasks)
+                shutil.copyfileobj(stig_file.file, f)
+
+            # Imports insert rows, so they are not retried automatically
+            job_id = enqueue_job(
+                "import_disa",
+                {"file_path": file_path, "benchmark_dir": benchmark_dir, "benchmark_name": benchmark_name},
+                benchmark=benchmark_name,
+                max_attempts=1
+            )
 
         elif benchmark_type == "CIS":
             xccdf_path = os.path.join(benchmark_dir, "xccdf.xml")
             with open(xccdf_path, "wb") as f:
-                f.write(await xccdf_file.read())
+                shutil.copyfileobj(xccdf_file.file, f)
 
             oval_path = os.path.join(benchmark_dir, "oval.xml")
             with open(oval_path, "wb") as f:
-                f.write(await oval_file.read())
+                shutil.copyfileobj(oval_file.file, f)
 
-            background_tasks.add_task(process_cis_file, xccdf_path, oval_path, benchmark_dir, benchmark_name, "CIS",background_tasks)
+            job_id = enqueue_job(
+                "import_cis",
+                {"xccdf_path": xccdf_path, "oval_path": oval_path, "benchmark_dir": benchmark_dir, "benchmark_name": benchmark_name},
+                benchmark=benchmark_name,
+                max_attempts=1
+            )
 
         else:
             raise HTTPException(status_code=400, detail="Unsupported benchmark type")
 
-        return JSONResponse({"message": f"Benchmark '{benchmark_name}' uploaded successfully."})
+        return JSONResponse({"message": f"Benchmark '{benchmark_name}' uploaded successfully.", "job_id": job_id})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/benchmarks")
-async def list_benchmarks():
-    session = SessionLocal()
-    benchmarks = session.query(Benchmark).all()
+def list_benchmarks(db: Session = Depends(get_db)):
+    # One grouped pass over rules instead of loading every benchmark's rules
+    automated = and_(Rule.id.isnot(None), func.coalesce(Rule.manual, 0) == 0)
+    rows = db.query(
+        Benchmark.name,
+        Benchmark.benchmark_type,
+        func.count(Rule.id),
+        func.coalesce(func.sum(case((automated, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((and_(automated, func.coalesce(Rule.supported, 0) == 0), 1), else_=0)), 0)
+    ).outerjoin(Rule, Rule.benchmark_id == Benchmark.id).group_by(Benchmark.id).order_by(Benchmark.id).all()
 
     result = []
-    for b in benchmarks:
-        total = len(b.rules)
-        automated = sum(1 for r in b.rules if not r.manual)
-        unsupported = sum(1 for r in b.rules if not r.manual and not r.supported)
-        coverage = ((automated - unsupported) / total * 100) if total else 0
+    for name, benchmark_type, total, automated_count, unsupported in rows:
+        coverage = ((automated_count - unsupported) / total * 100) if total else 0
 
         result.append({
-            "benchmark": b.name,
-            "type": b.benchmark_type,
+            "benchmark": name,
+            "type": benchmark_type,
             "total_rules": total,
-            "automated_rules": automated,
+            "automated_rules": automated_count,
             "unsupported_rules": unsupported,
             "coverage": round(coverage, 2)
         })
@@ -284,28 +450,38 @@ def build_merged_oval_from_files(oval_paths):
     return root
 
 @app.post("/api/benchmarks/{benchmark}/generate-ovals")
-async def generate_and_download_oval(benchmark: str, request: GenerateOvalsRequest):
+def generate_and_download_oval(benchmark: str, request: GenerateOvalsRequest, db: Session = Depends(get_db)):
     rule_ids = request.rule_ids
     if not rule_ids:
         raise HTTPException(status_code=400, detail="No rule IDs provided")
 
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
+    if not benchmark_obj:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+
     benchmark_dir = f"data/{benchmark}"
     ovals_dir = os.path.join(benchmark_dir, "ovals")
 
+    # One indexed lookup for all requested rules
+    oval_paths = dict(db.query(Rule.rule_id, Rule.oval_path).filter(
+        Rule.benchmark_id == benchmark_obj.id,
+        Rule.rule_id.in_(rule_ids),
+        Rule.oval_path.isnot(None)
+    ).all())
+
     oval_files = []
-    for rule_id in rule_ids:
-        oval_path = get_hashed_path(rule_id, ovals_dir, "oval_rule_filename_map.json")
-        if os.path.exists(oval_path):
+    for rule_id in dict.fromkeys(rule_ids):
+        oval_path = oval_paths.get(rule_id) or get_hashed_path(rule_id, ovals_dir, "oval_rule_filename_map.json")
+        if oval_path and os.path.exists(oval_path):
             oval_files.append(oval_path)
 
     if not oval_files:
         raise HTTPException(status_code=404, detail="No edited OVAL files found for the requested rules.")
 
     merged_root = build_merged_oval_from_files(oval_files)
-    output_bytes = ET.tostring(merged_root, pretty_print=True, encoding="UTF-8", xml_declaration=True)
 
     return StreamingResponse(
-        io.BytesIO(output_bytes),
+        iter_xml_chunks(open_tree(merged_root, depth=2)),
         media_type="application/xml",
         headers={
             "Content-Disposition": f"attachment; filename={benchmark}_merged_oval.xml"
@@ -313,13 +489,12 @@ async def generate_and_download_oval(benchmark: str, request: GenerateOvalsReque
     )
 
 @app.get("/api/benchmarks/{benchmark}/rules")
-async def list_rules(benchmark: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+def list_rules(benchmark: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rules = session.query(Rule).filter(
+    rules = db.query(Rule).filter(
         Rule.benchmark_id == benchmark_obj.id,
         Rule.excluded == 0
     ).all()
@@ -333,31 +508,151 @@ async def list_rules(benchmark: str):
         for r in rules
     ]
 
+# Keyset pagination for the rule browser. Sort keys are coalesced so NULLs
+# compare like the values the UI shows for them.
+RULE_PAGE_SIZE_MAX = 500
+RULE_SORT_KEYS = {
+    "rule_id": Rule.rule_id,
+    "definition_id": func.coalesce(Rule.definition_id, ""),
+    "object_type": func.coalesce(Rule.object_type, ""),
+    "supported": func.coalesce(Rule.supported, 0),
+    "sensor_file_generated": func.coalesce(Rule.sensor_file_generated, 0),
+}
+
+
+def encode_rule_cursor(sort_key, rule_pk):
+    return base64.urlsafe_b64encode(json.dumps([sort_key, rule_pk]).encode()).decode()
+
+
+def decode_rule_cursor(cursor):
+    try:
+        sort_key, rule_pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return sort_key, int(rule_pk)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@app.get("/api/benchmarks/{benchmark}/rules/query")
+def query_rules(
+    benchmark: str,
+    limit: int = Query(100, ge=1, le=RULE_PAGE_SIZE_MAX),
+    cursor: str = None,
+    sort: str = "rule_id",
+    order: str = "asc",
+    search: str = None,
+    supported: bool = None,
+    sensor_generated: bool = None,
+    object_type: str = None,
+    has_regex_issues: bool = None,
+    db: Session = Depends(get_db)
+):
+    """
+    One page of a benchmark's included rules. Pass next_cursor back as
+    cursor for the following page; total is only counted for the first.
+    """
+    if sort not in RULE_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(RULE_SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
+    if not benchmark_obj:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+
+    sort_key = RULE_SORT_KEYS[sort]
+    regex_issue_exists = db.query(UnsupportedRegex.id).filter(UnsupportedRegex.rule_id == Rule.id).exists()
+    query = db.query(
+        Rule.id,
+        Rule.rule_id,
+        Rule.definition_id,
+        Rule.object_type,
+        Rule.supported,
+        Rule.sensor_file_generated,
+        Rule.dirty,
+        regex_issue_exists.label("has_regex_issues"),
+        sort_key.label("sort_key")
+    ).filter(
+        Rule.benchmark_id == benchmark_obj.id,
+        Rule.excluded == 0
+    )
+
+    if search:
+        query = query.filter(Rule.rule_id.ilike(f"%{search}%"))
+    if supported is not None:
+        query = query.filter(func.coalesce(Rule.supported, 0) == int(supported))
+    if sensor_generated is not None:
+        query = query.filter(func.coalesce(Rule.sensor_file_generated, 0) == int(sensor_generated))
+    if object_type:
+        query = query.filter(rule_object_type_filter(db, benchmark_obj.id, object_type))
+    if has_regex_issues is not None:
+        query = query.filter(regex_issue_exists if has_regex_issues else ~regex_issue_exists)
+
+    total = query.count() if cursor is None else None
+
+    if cursor:
+        last_key, last_pk = decode_rule_cursor(cursor)
+        position = tuple_(sort_key, Rule.id)
+        after = tuple_(literal(last_key), literal(last_pk))
+        query = query.filter(position > after if order == "asc" else position < after)
+
+    if order == "asc":
+        query = query.order_by(sort_key.asc(), Rule.id.asc())
+    else:
+        query = query.order_by(sort_key.desc(), Rule.id.desc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_rule_cursor(rows[limit - 1].sort_key, rows[limit - 1].id) if len(rows) > limit else None
+
+    return {
+        "items": [
+            {
+                "rule_id": r.rule_id,
+                "definition_id": r.definition_id,
+                "object_type": r.object_type,
+                "supported": bool(r.supported),
+                "sensor_file_generated": bool(r.sensor_file_generated),
+                "dirty": bool(r.dirty),
+                "has_regex_issues": bool(r.has_regex_issues)
+            }
+            for r in rows[:limit]
+        ],
+        "next_cursor": next_cursor,
+        "total": total
+    }
+
+@app.get("/api/benchmarks/{benchmark}/object-types")
+def list_object_types(benchmark: str, db: Session = Depends(get_db)):
+    """Probe coverage: the object types the benchmark's rules use, with rule counts."""
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
+    if not benchmark_obj:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+
+    return object_type_coverage(db, benchmark_obj.id)
+
 @app.delete("/api/benchmarks/{benchmark}")
-async def delete_benchmark(benchmark: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+def delete_benchmark(benchmark: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
 
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    session.delete(benchmark_obj)
-    session.commit()
+    db.delete(benchmark_obj)
+    db.commit()
 
     folder_path = os.path.join("data", benchmark)
     if os.path.exists(folder_path):
         shutil.rmtree(folder_path)
+    document_cache.invalidate(folder_path)
 
     return {"message": f"Benchmark '{benchmark}' deleted successfully"}
 
 @app.get("/api/benchmarks/{benchmark}/rules/{rule_id}")
-async def get_rule_oval(benchmark: str, rule_id: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+def get_rule_oval(benchmark: str, rule_id: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
         return PlainTextResponse("Benchmark not found", status_code=404)
 
-    rule = session.query(Rule).filter_by(
+    rule = db.query(Rule).filter_by(
         benchmark_id=benchmark_obj.id,
         rule_id=rule_id
     ).first()
@@ -371,9 +666,8 @@ async def get_rule_oval(benchmark: str, rule_id: str):
     return JSONResponse({"rule_id": rule_id, "oval": content})
 
 @app.get("/api/benchmarks/{benchmark}/regex-issues")
-async def get_regex_issues(benchmark: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+def get_regex_issues(benchmark: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
         return PlainTextResponse("Benchmark not found", status_code=404)
 
@@ -388,19 +682,17 @@ async def get_regex_issues(benchmark: str):
     return PlainTextResponse(response_text, media_type="text/plain")
 
 @app.post("/api/benchmarks/{benchmark}/rules/{rule_id}")
-async def save_rule_oval(benchmark: str, rule_id: str, request: Request):
-    data = await request.json()
+def save_rule_oval(benchmark: str, rule_id: str, data: dict = Body(...), db: Session = Depends(get_db)):
     oval_content = data.get("oval")
 
     if oval_content is None:
         raise HTTPException(status_code=400, detail="Missing oval content")
 
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rule = session.query(Rule).filter_by(
+    rule = db.query(Rule).filter_by(
         benchmark_id=benchmark_obj.id,
         rule_id=rule_id
     ).first()
@@ -415,24 +707,26 @@ async def save_rule_oval(benchmark: str, rule_id: str, request: Request):
     with open(oval_path, "w", encoding="utf-8") as f:
         f.write(oval_content)
 
-    return JSONResponse({"message": "Oval saved successfully"})
+    dirty = mark_rule_edited(db, rule, oval_path=oval_path)
+    db.commit()
+    job_id = enqueue_dirty_rebuild(benchmark) if dirty else None
+
+    return JSONResponse({"message": "Oval saved successfully", "dirty": dirty, "job_id": job_id})
 
 
 
 @app.post("/api/benchmarks/{benchmark}/rules/{rule_id}/xccdf")
-async def save_rule_xccdf(benchmark: str, rule_id: str, request: Request):
-    data = await request.json()
+def save_rule_xccdf(benchmark: str, rule_id: str, data: dict = Body(...), db: Session = Depends(get_db)):
     xccdf_content = data.get("xccdf")
 
     if xccdf_content is None:
         raise HTTPException(status_code=400, detail="Missing xccdf content")
 
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rule = session.query(Rule).filter_by(
+    rule = db.query(Rule).filter_by(
         benchmark_id=benchmark_obj.id,
         rule_id=rule_id
     ).first()
@@ -441,17 +735,24 @@ async def save_rule_xccdf(benchmark: str, rule_id: str, request: Request):
         raise HTTPException(status_code=404, detail="Rule not found")
 
     # Path for saving XCCDF
-    rule_id = re.sub(r'_\d+$', '', rule_id)  # remove any suffix like _1, _2, etc.
     benchmark_dir = f"data/{benchmark}"
     xccdf_dir = os.path.join(benchmark_dir, "xccdf")
     os.makedirs(xccdf_dir, exist_ok=True)
 
-    xccdf_path = get_hashed_path(rule_id, os.path.join(benchmark_dir, "xccdf"), "xccdf_rule_filename_map.json")
+    xccdf_path = rule.xccdf_path or get_xccdf_map_path(rule_id, xccdf_dir)
+    rule_id = re.sub(r'_\d+$', '', rule_id)  # remove any suffix like _1, _2, etc.
+    if not xccdf_path:
+        xccdf_path = os.path.join(xccdf_dir, safe_rule_filename(rule_id))
+    rule.xccdf_path = xccdf_path
 
     with open(xccdf_path, "w", encoding="utf-8") as f:
         f.write(xccdf_content)
 
-    return JSONResponse({"message": "XCCDF saved successfully"})
+    dirty = mark_rule_edited(db, rule, xccdf_path=xccdf_path)
+    db.commit()
+    job_id = enqueue_dirty_rebuild(benchmark) if dirty else None
+
+    return JSONResponse({"message": "XCCDF saved successfully", "dirty": dirty, "job_id": job_id})
 
 
 
@@ -465,7 +766,7 @@ class RemoteHostRequest(BaseModel):
     os_type: str
 
 @app.post("/api/remote-hosts")
-async def add_remote_host(remote_host: RemoteHostRequest, db: Session = Depends(get_db)):
+def add_remote_host(remote_host: RemoteHostRequest, db: Session = Depends(get_db)):
     # Check if benchmark exists
     benchmark = db.query(Benchmark).filter(Benchmark.name == remote_host.benchmark_name).first()
     if not benchmark:
@@ -489,7 +790,7 @@ async def add_remote_host(remote_host: RemoteHostRequest, db: Session = Depends(
 
 
 @app.get("/api/benchmarks/{benchmark_name}/remote-hosts")
-async def list_remote_hosts(benchmark_name: str, db: Session = Depends(get_db)):
+def list_remote_hosts(benchmark_name: str, db: Session = Depends(get_db)):
     benchmark = db.query(Benchmark).filter(Benchmark.name == benchmark_name).first()
     if not benchmark:
         raise HTTPException(status_code=404, detail=f"Benchmark '{benchmark_name}' not found")
@@ -510,16 +811,13 @@ async def list_remote_hosts(benchmark_name: str, db: Session = Depends(get_db)):
 
 
 @app.get("/api/rules/{rule_id}/hoststate")
-async def get_hoststate(rule_id: str):
-    session = SessionLocal()
+def get_hoststate(rule_id: str, db: Session = Depends(get_db)):
 
-    rule = session.query(Rule).filter_by(rule_id=rule_id).first()
+    rule = db.query(Rule).filter_by(rule_id=rule_id).first()
     if not rule:
-        session.close()
         raise HTTPException(status_code=404, detail=f"Rule {rule_id} not found")
 
-    vci_result = session.query(VCIResult).filter_by(rule_id=rule.id).order_by(VCIResult.id.desc()).first()
-    session.close()
+    vci_result = db.query(VCIResult).filter_by(rule_id=rule.id).order_by(VCIResult.id.desc()).first()
 
     if not vci_result:
         raise HTTPException(status_code=404, detail=f"No hoststate JSON found for rule {rule_id}")
@@ -531,109 +829,56 @@ async def get_hoststate(rule_id: str):
 
 
 @app.post("/api/benchmarks/{benchmark}/run-vci-debug")
-async def run_vci_debug_for_benchmark(benchmark: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Rule.benchmark).filter_by(name=benchmark).first()
+def run_vci_debug_for_benchmark(benchmark: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
     if not benchmark_obj:
-        session.close()
         raise HTTPException(status_code=404, detail=f"Benchmark {benchmark} not found.")
 
-    remote_host = benchmark_obj.remote_hosts[0]
-    ip = remote_host.ip_address
-    username = remote_host.username
-    password = decrypt_password(remote_host.password_encrypted)
-    os_type = remote_host.os_type.lower()
-
-    rules = session.query(Rule).filter_by(
-        benchmark_id=benchmark_obj.id,
-        excluded=0,
-        sensor_file_generated=1
-    ).all()
-
-    benchmark_dir = os.path.join("data", benchmark)
-
-    rule_sensor_map = {}
-    for rule in rules:
-        sensorbin_path = os.path.join(benchmark_dir, "sensorbin", f"{rule.rule_id}.bin")
-        if os.path.exists(sensorbin_path):
-            rule_sensor_map[rule.rule_id] = sensorbin_path
-
-    session.close()
-
-    if os_type == "linux":
-        result_paths = run_vci_batch_on_linux(ip, username, password, rule_sensor_map, benchmark_dir)
-    elif os_type == "windows":
-        result_paths = run_vci_batch_on_windows(ip, username, password, rule_sensor_map, benchmark_dir)
-    else:
+    remote_host = benchmark_obj.remote_hosts[0] if benchmark_obj.remote_hosts else None
+    if not remote_host:
+        raise HTTPException(status_code=400, detail=f"No remote host configured for benchmark {benchmark}.")
+    if remote_host.os_type.lower() not in ("linux", "windows"):
         raise HTTPException(status_code=400, detail="Batch VCI not implemented for this OS.")
 
-    save_batch_results_to_db(benchmark, result_paths)
-
-    return {"message": f"VCI executed for {len(result_paths)} rules for benchmark {benchmark}."}
-
-
-
-
-def run_genai_conversion_for_benchmark(benchmark_name: str, model_name: str):
-    session = SessionLocal()
-
-    benchmark = session.query(Benchmark).filter_by(name=benchmark_name).first()
-    if not benchmark:
-        print(f"❌ Benchmark not found: {benchmark_name}")
-        session.close()
-        return
-
-    total_converted = 0
-
-    for rule in benchmark.rules:
-        for regex_obj in rule.unsupported_regex:
-            if regex_obj.processed_pattern:
-                continue
-
-            print(f"🔍 Processing regex: {regex_obj.pattern}")
-
-            try:
-                result = call_genai_api(model_name, regex_obj.pattern)
-
-                regex_obj.processed_pattern = result["converted_regex"]
-                regex_obj.tests_json = json.dumps(result.get("tests", []))
-
-                total_converted += 1
-
-            except Exception as e:
-                print(f"❌ Error processing regex {regex_obj.pattern}: {e}")
-
-    session.commit()
-    session.close()
+    # Remote runs are not retried automatically
+    job_id = enqueue_job(
+        "vci_debug",
+        {"benchmark": benchmark, "benchmark_dir": os.path.join("data", benchmark)},
+        benchmark=benchmark,
+        max_attempts=1,
+        dedupe=True
+    )
+    return {"message": f"VCI run queued for benchmark {benchmark}.", "job_id": job_id}
 
-    print(f"✅ Converted {total_converted} regexes for benchmark {benchmark_name}")
 
 @app.post("/api/benchmarks/{benchmark}/process-unsupported-regex-ai")
-async def process_regexes_ai(benchmark: str, background_tasks: BackgroundTasks):
+def process_regexes_ai(benchmark: str):
     model_name = "cloud35-sonnet-v2"    # or whichever you want as default
-    background_tasks.add_task(run_genai_conversion_for_benchmark, benchmark, model_name)
+    job_id = enqueue_job(
+        "genai_regex",
+        {"benchmark": benchmark, "model_name": model_name},
+        benchmark=benchmark,
+        dedupe=True
+    )
     return {
-        "message": f"Started GenAI regex conversion task for benchmark {benchmark}"
+        "message": f"Started GenAI regex conversion task for benchmark {benchmark}",
+        "job_id": job_id
     }
 
 @app.get("/api/benchmarks/{benchmark}/rules/test/{object_type}")
-async def get_rules_by_object(benchmark: str,object_type: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
-    print(benchmark_obj.name)
+def get_rules_by_object(benchmark: str,object_type: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
 
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
     # Filter rules where object_type contains the search string
-    rules = session.query(Rule).filter(
+    rules = db.query(Rule).filter(
         Rule.benchmark_id == benchmark_obj.id,
         Rule.excluded == 0,
-        Rule.object_type.isnot(None),
-        Rule.object_type.ilike(f"%{object_type}%")
+        rule_object_type_filter(db, benchmark_obj.id, object_type)
     ).all()
 
-    session.close()
 
     return [
         {
@@ -647,50 +892,55 @@ async def get_rules_by_object(benchmark: str,object_type: str):
     ]
 
 @app.get("/api/benchmarks/{benchmark}/rules/{rule_id}/xccdf")
-async def serve_existing_rule_xccdf(benchmark: str, rule_id: str):
-    session = SessionLocal()
+def serve_existing_rule_xccdf(benchmark: str, rule_id: str, db: Session = Depends(get_db)):
     # rule_id = re.sub(r'_\d+$', '', rule_id)  # remove any suffix like _1, _2, etc.
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
 
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rule = session.query(Rule).filter_by(
+    rule = db.query(Rule).filter_by(
         benchmark_id=benchmark_obj.id,
         rule_id=rule_id,
         excluded=0
     ).first()
+    requested_rule_id = rule_id
     rule_id = re.sub(r'_\d+$', '', rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found in DB")
 
     # Path to edited XCCDF file (rule-specific)
     benchmark_dir = f"data/{benchmark}"
-    xccdf_path = get_hashed_path(rule_id, os.path.join(benchmark_dir, "xccdf"), "xccdf_rule_filename_map.json")
+    xccdf_path = rule.xccdf_path or get_xccdf_map_path(requested_rule_id, os.path.join(benchmark_dir, "xccdf"))
     # xccdf_path = os.path.join(benchmark_dir, "xccdf", f"{rule_id}.xml")
 
-    if not os.path.exists(xccdf_path):
+    if not xccdf_path or not os.path.exists(xccdf_path):
         # fallback: extract on-the-fly from master XCCDF
         master_xccdf_path = os.path.join(benchmark_dir, "xccdf.xml")
         if not os.path.exists(master_xccdf_path):
             raise HTTPException(status_code=404, detail="Master XCCDF file not found")
 
-        from backend.xccdf_parser import XccdfDSA
-
-        with open(master_xccdf_path, "rb") as f:
-            xccdf_bytes = f.read()
-
-        dsa = XccdfDSA(xccdf_bytes)
+        dsa = get_xccdf_dsa(benchmark_dir)
+        # Same lookup order as import: the id as given, then without its suffix
+        if requested_rule_id in dsa.rules_by_id:
+            rule_id = requested_rule_id
         try:
-            rule_xml_bytes = dsa.extract_rule(rule_id)
+            rule_elem = dsa.extract_rule(rule_id)
         except Exception as e:
             raise HTTPException(status_code=404, detail=f"Rule {rule_id} not found in master XCCDF: {str(e)}")
+        rule_xml_bytes = ET.tostring(rule_elem, xml_declaration=True, encoding="utf-8", pretty_print=True)
 
         # save extracted rule for future access
         # os.makedirs(os.path.dirname(xccdf_path), exist_ok=True)
         # with open(xccdf_path, "wb") as f:
         #     f.write(rule_xml_bytes)
 
+        return StreamingResponse(
+            io.BytesIO(rule_xml_bytes),
+            media_type="application/xml",
+            headers={"Content-Disposition": f"attachment; filename={safe_rule_filename(rule_id)}"}
+        )
+
     return FileResponse(
         xccdf_path,
         media_type="application/xml",
@@ -712,7 +962,9 @@ class GenerateXccdfRequest(BaseModel):
 
 def merge_edited_xccdfs(master_path, edited_paths):
     parser = ET.XMLParser(remove_blank_text=True)
-    master_tree = ET.parse(master_path, parser)
+    # The cached master is shared between requests; merge into a copy
+    master_dsa = get_xccdf_dsa(os.path.dirname(master_path))
+    master_tree = copy.deepcopy(master_dsa.tree)
     master_root = master_tree.getroot()
 
     NAMESPACE_XCCDF = "http://checklists.nist.gov/xccdf/1.2"
@@ -758,19 +1010,33 @@ def merge_edited_xccdfs(master_path, edited_paths):
     return master_tree
 
 @app.post("/api/benchmarks/{benchmark}/generate-xccdf")
-async def generate_and_download_xccdf(benchmark: str, request: GenerateXccdfRequest):
+def generate_and_download_xccdf(benchmark: str, request: GenerateXccdfRequest, db: Session = Depends(get_db)):
     rule_ids = request.rule_ids
     if not rule_ids:
         raise HTTPException(status_code=400, detail="No rule IDs provided")
 
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
+    if not benchmark_obj:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+
     benchmark_dir = f"data/{benchmark}"
     xccdf_dir = os.path.join(benchmark_dir, "xccdf")
 
-    edited_files = []
-    for rule_id in rule_ids:
-        xccdf_path = os.path.join(xccdf_dir, f"{rule_id}.xml")
-        if os.path.exists(xccdf_path):
-            edited_files.append(xccdf_path)
+    xccdf_paths = dict(db.query(Rule.rule_id, Rule.xccdf_path).filter(
+        Rule.benchmark_id == benchmark_obj.id,
+        Rule.rule_id.in_(rule_ids),
+        Rule.xccdf_path.isnot(None)
+    ).all())
+
+    # Suffixed rule ids (_1, _2) share their base rule's XCCDF file
+    edited_files = list(dict.fromkeys(
+        xccdf_path
+        for xccdf_path in (
+            xccdf_paths.get(rule_id) or get_xccdf_map_path(rule_id, xccdf_dir)
+            for rule_id in rule_ids
+        )
+        if xccdf_path and os.path.exists(xccdf_path)
+    ))
 
     if not edited_files:
         raise HTTPException(status_code=404, detail="No edited XCCDF files found for the requested rules.")
@@ -781,15 +1047,9 @@ async def generate_and_download_xccdf(benchmark: str, request: GenerateXccdfRequ
 
     merged_tree = merge_edited_xccdfs(master_xccdf_path, edited_files)
 
-    output_bytes = ET.tostring(
-        merged_tree.getroot(),
-        pretty_print=True,
-        encoding="UTF-8",
-        xml_declaration=True
-    )
-
+    # Groups nest; open them far enough down that no single subtree is large
     return StreamingResponse(
-        io.BytesIO(output_bytes),
+        iter_xml_chunks(open_tree(merged_tree.getroot(), depth=8)),
         media_type="application/xml",
         headers={
             "Content-Disposition": f"attachment; filename={benchmark}_merged_xccdf.xml"
@@ -800,14 +1060,13 @@ async def generate_and_download_xccdf(benchmark: str, request: GenerateXccdfRequ
 from backend.oval_transformer import transform_userright_oval
 
 @app.get("/api/benchmarks/{benchmark}/rules/{rule_id}/transform-userright")
-async def transform_userright(benchmark: str, rule_id: str):
-    session = SessionLocal()
-    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+def transform_userright(benchmark: str, rule_id: str, db: Session = Depends(get_db)):
+    benchmark_obj = db.query(Benchmark).filter_by(name=benchmark).first()
 
     if not benchmark_obj:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    rule = session.query(Rule).filter_by(
+    rule = db.query(Rule).filter_by(
         benchmark_id=benchmark_obj.id,
         rule_id=rule_id,
         excluded=0
@@ -837,12 +1096,16 @@ async def transform_userright(benchmark: str, rule_id: str):
         headers={"Content-Disposition": f"attachment; filename={rule_id}_transformed.xml"}
     )
 
-from fastapi import BackgroundTasks
-from backend.userright_transformer import run_userright_transformation
-
 @app.post("/api/benchmarks/{benchmark}/transform-userright")
-async def transform_userright_all(benchmark: str, background_tasks: BackgroundTasks):
-    background_tasks.add_task(run_userright_transformation, benchmark)
+def transform_userright_all(benchmark: str):
+    job_id = enqueue_job(
+        "userright_transform",
+        {"benchmark": benchmark},
+        benchmark=benchmark,
+        max_attempts=1,
+        dedupe=True
+    )
     return {
-        "message": f"Started userright transformation task for benchmark {benchmark}."
+        "message": f"Started userright transformation task for benchmark {benchmark}.",
+        "job_id": job_id
     }
\ No newline at end of file
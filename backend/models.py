@@ -1,6 +1,6 @@
 # backend/models.py
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Index, text
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -18,6 +18,13 @@ class Benchmark(Base):
 
 class Rule(Base):
     __tablename__ = "rules"
+    # Most lookups filter on benchmark_id, or on benchmark_id and rule_id together
+    __table_args__ = (
+        Index("ix_rules_benchmark_id_rule_id", "benchmark_id", "rule_id"),
+        Index("ix_rules_rule_id", "rule_id"),
+        # Covers the per-benchmark coverage counts in /api/benchmarks
+        Index("ix_rules_benchmark_stats", "benchmark_id", "manual", "supported"),
+    )
 
     id = Column(Integer, primary_key=True)
     benchmark_id = Column(Integer, ForeignKey("benchmarks.id"), nullable=False)
@@ -32,17 +39,40 @@ class Rule(Base):
     excluded = Column(Integer, default=0)
     sensor_file_generated = Column(Integer, default=0)
     benchmark_type = Column(String)
+    # Hash of the rule's OVAL/XCCDF now, and when its sensor bin was built
+    content_hash = Column(String)
+    built_hash = Column(String)
+    dirty = Column(Integer, default=0)
+    dirty_at = Column(Float)
 
     benchmark = relationship("Benchmark", back_populates="rules")
     vci_results = relationship("VCIResult", back_populates="rule", cascade="all, delete-orphan")
     unsupported_regex = relationship("UnsupportedRegex", back_populates="rule", cascade="all, delete-orphan")
+    object_types = relationship("RuleObjectType", back_populates="rule", cascade="all, delete-orphan")
+
+
+class RuleObjectType(Base):
+    """One row per OVAL object type a rule uses; Rule.object_type is the comma-joined form."""
+    __tablename__ = "rule_object_types"
+    # Object type filters and probe coverage look up by benchmark and type
+    __table_args__ = (
+        Index("ix_rule_object_types_benchmark_object_type", "benchmark_id", "object_type"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    rule_id = Column(Integer, ForeignKey("rules.id"), nullable=False, index=True)
+    benchmark_id = Column(Integer, ForeignKey("benchmarks.id"), nullable=False)
+    object_type = Column(String, nullable=False)
+    supported = Column(Integer)    # 1 if the benchmark's platform has a probe for it
+
+    rule = relationship("Rule", back_populates="object_types")
 
 
 class RemoteHost(Base):
     __tablename__ = "remote_hosts"
 
     id = Column(Integer, primary_key=True)
-    benchmark_id = Column(Integer, ForeignKey("benchmarks.id"), nullable=False)
+    benchmark_id = Column(Integer, ForeignKey("benchmarks.id"), nullable=False, index=True)
     ip_address = Column(String)
     username = Column(String)
     password_encrypted = Column(String)
@@ -54,7 +84,7 @@ class VCIResult(Base):
     __tablename__ = "vci_results"
 
     id = Column(Integer, primary_key=True)
-    rule_id = Column(Integer, ForeignKey("rules.id"))
+    rule_id = Column(Integer, ForeignKey("rules.id"), index=True)
     json_output = Column(Text)
     rule = relationship("Rule", back_populates="vci_results")
 
@@ -63,7 +93,7 @@ class UnsupportedRegex(Base):
     __tablename__ = "unsupported_regex"
 
     id = Column(Integer, primary_key=True)
-    rule_id = Column(Integer, ForeignKey("rules.id"))
+    rule_id = Column(Integer, ForeignKey("rules.id"), index=True)
     definition_id = Column(String)
     object_id = Column(String)
     pattern = Column(Text)
@@ -72,3 +102,35 @@ class UnsupportedRegex(Base):
     tests_json = Column(Text)           # NEW
 
     rule = relationship("Rule", back_populates="unsupported_regex")
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    # Workers look for the oldest runnable job of a type
+    __table_args__ = (
+        Index("ix_jobs_type_status_run_after", "job_type", "status", "run_after"),
+        Index("ix_jobs_benchmark", "benchmark"),
+        # Event streams look for jobs changed since their last poll
+        Index("ix_jobs_updated_at", "updated_at"),
+        # At most one queued job per deduplicated type and payload
+        Index("ux_jobs_queued_dedupe", "job_type", "dedupe_key", unique=True, sqlite_where=text("status = 'queued'")),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_type = Column(String, nullable=False)
+    benchmark = Column(String)
+    payload = Column(Text)
+    dedupe_key = Column(String)    # payload digest for enqueue_job(dedupe=True) until claimed
+    status = Column(String, default="queued")   # queued, running, succeeded, failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    run_after = Column(Float)
+    lease_owner = Column(String)
+    lease_expires = Column(Float)
+    created_at = Column(Float)
+    started_at = Column(Float)
+    finished_at = Column(Float)
+    last_error = Column(Text)
+    result = Column(Text)
+    progress = Column(Text)    # JSON from backend/job_progress.py
+    updated_at = Column(Float)
@@ -30,10 +30,89 @@ REGEXES_TO_REMOVE = {
     "lookbehind_negative": re.compile(r"\(\?<!")
 }
 
+class OvalGraphIndex:
+    """
+    Owning definitions per node and object types per definition, computed
+    once for a DSA (or definition view) in topological order instead of one
+    graph walk per lookup. Nodes caught in reference cycles fall back to the
+    plain walks.
+    """
+    def __init__(self, dsa):
+        nodes = dsa.nodes
+        children = {}
+        node_types = {}
+        object_tags = {}
+        for node_id, node in nodes.items():
+            children[node_id] = [child for child in node.children if child in nodes]
+            node_types[node_id] = node.type
+            if node.type == "object":
+                object_tags[node_id] = node.element.tag.split("}")[-1]
+
+        parents = {node_id: [] for node_id in children}
+        for node_id, kids in children.items():
+            for child in kids:
+                parents[child].append(node_id)
+
+        # Kahn's algorithm: parents always come before their children
+        indegree = {node_id: len(parents[node_id]) for node_id in children}
+        order = [node_id for node_id, degree in indegree.items() if degree == 0]
+        for node_id in order:
+            for child in children[node_id]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+        self.cyclic = {node_id for node_id, degree in indegree.items() if degree > 0}
+
+        empty = frozenset()
+        self.owning_definitions = {}
+        for node_id in order:
+            node_parents = parents[node_id]
+            if len(node_parents) == 1 and node_types[node_parents[0]] != "definition":
+                # Single non-definition parent: share its set
+                self.owning_definitions[node_id] = self.owning_definitions[node_parents[0]]
+                continue
+            owners = set()
+            for parent in node_parents:
+                owners |= self.owning_definitions[parent]
+                if node_types[parent] == "definition":
+                    owners.add(parent)
+            self.owning_definitions[node_id] = frozenset(owners) if owners else empty
+
+        # None marks nodes that reach a cycle; their definitions use the walk
+        reachable_types = dict.fromkeys(self.cyclic)
+        self.definition_object_types = {}
+        for node_id in reversed(order):
+            kids = children[node_id]
+            tag = object_tags.get(node_id)
+            if tag is None and len(kids) == 1:
+                types = reachable_types[kids[0]]
+            elif any(reachable_types[child] is None for child in kids):
+                types = None
+            else:
+                types = set()
+                if tag is not None:
+                    types.add(tag)
+                for child in kids:
+                    types |= reachable_types[child]
+                types = frozenset(types)
+            reachable_types[node_id] = types
+            if node_types[node_id] == "definition" and types is not None:
+                self.definition_object_types[node_id] = types
+
+
 class OvalAnalyzer:
     def __init__(self, oval_dsa):
         self.dsa = oval_dsa
 
+    @property
+    def index(self):
+        # Built once and kept on the DSA so every analyzer over it shares it
+        index = getattr(self.dsa, "graph_index", None)
+        if index is None:
+            index = OvalGraphIndex(self.dsa)
+            self.dsa.graph_index = index
+        return index
+
     def analyze(self, benchmark_type=None):
         analysis_results = {}
 
@@ -59,6 +138,16 @@ class OvalAnalyzer:
         return analysis_results
     
     def get_definition_ids(self, node_id):
+        index = self.index
+        if node_id in index.owning_definitions:
+            return set(index.owning_definitions[node_id])
+
+        graph = getattr(self.dsa, "graph", None)
+        if graph is not None:
+            return graph.ancestor_definitions(node_id)
+        return self._walk_definition_ids(node_id)
+
+    def _walk_definition_ids(self, node_id):
         visited = set()
         definitions = set()
         stack = [node_id]
@@ -84,6 +173,12 @@ class OvalAnalyzer:
 
 
     def _extract_object_types(self, definition_id):
+        index = self.index
+        if definition_id in index.definition_object_types:
+            return set(index.definition_object_types[definition_id])
+        return self._walk_object_types(definition_id)
+
+    def _walk_object_types(self, definition_id):
         object_types = set()
         visited = set()
 
@@ -0,0 +1,263 @@
+# backend/oval_cache.py
+
+import hashlib
+import json
+import os
+import uuid
+import xml.parsers.expat
+from array import array
+from xml.sax.saxutils import quoteattr
+
+from backend.compact_graph import CompactGraph, NODE_TYPES
+from backend.oval_parser import OvalDSA
+
+CACHE_FILENAME = "oval_graph_cache.json"
+CACHE_VERSION = 3
+
+SECTIONS = ["definitions", "tests", "objects", "states", "variables"]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_item_spans(xml_bytes):
+    """
+    Byte spans of the root start tag, the generator and every top-level
+    section item (definition, test, object, ...) that carries an id.
+    Uses expat's byte positions, so the spans can be sliced straight out
+    of the file. Namespaces declared on a section element are not part of
+    its items' spans, so they are recorded per section to be re-declared.
+
+    Returns (root_start_span, generator_span, {id: (start, end)},
+    {section: {xmlns attribute: uri}}); the last is None when the same
+    section occurs twice with different declarations.
+    """
+    parser = xml.parsers.expat.ParserCreate()
+    parser.buffer_text = True
+
+    spans = {}
+    state = {
+        "depth": 0,
+        "section": None,
+        "start": None,
+        "item_id": None,
+        "events_inside": False,
+        "root_start": None,
+        "root_pending": False,
+        "generator": None,
+        "section_namespaces": {},
+        "namespace_conflict": False,
+    }
+
+    def mark_event():
+        if state["root_pending"]:
+            state["root_start"] = (state["root_start"][0], parser.CurrentByteIndex)
+            state["root_pending"] = False
+        state["events_inside"] = True
+
+    def end_offset(index):
+        # Self-closing tags report their end event right after "/>"
+        if not state["events_inside"] and xml_bytes[index - 2:index] == b"/>":
+            return index
+        return xml_bytes.index(b">", index) + 1
+
+    def start_element(name, attrs):
+        mark_event()
+        state["depth"] += 1
+        depth = state["depth"]
+        if depth == 1:
+            state["root_start"] = (parser.CurrentByteIndex, None)
+            state["root_pending"] = True
+        elif depth == 2:
+            state["section"] = name.split(":")[-1]
+            if state["section"] == "generator":
+                state["start"] = parser.CurrentByteIndex
+            elif state["section"] in SECTIONS:
+                declared = {key: value for key, value in attrs.items() if key == "xmlns" or key.startswith("xmlns:")}
+                if state["section_namespaces"].setdefault(state["section"], declared) != declared:
+                    state["namespace_conflict"] = True
+        elif depth == 3 and state["section"] in SECTIONS:
+            state["start"] = parser.CurrentByteIndex
+            state["item_id"] = attrs.get("id")
+        state["events_inside"] = False
+
+    def end_element(name):
+        depth = state["depth"]
+        index = parser.CurrentByteIndex
+        if depth == 2 and state["section"] == "generator":
+            state["generator"] = (state["start"], end_offset(index))
+        elif depth == 3 and state["item_id"]:
+            spans.setdefault(state["item_id"], (state["start"], end_offset(index)))
+            state["item_id"] = None
+        mark_event()
+        state["depth"] -= 1
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = lambda data: mark_event()
+    parser.CommentHandler = lambda data: mark_event()
+    parser.ProcessingInstructionHandler = lambda target, data: mark_event()
+    parser.Parse(xml_bytes, True)
+
+    section_namespaces = None if state["namespace_conflict"] else state["section_namespaces"]
+    return state["root_start"], state["generator"], spans, section_namespaces
+
+
+class OvalGraphCache:
+    """
+    On-disk snapshot of a benchmark's parsed oval.xml: the graph edges and
+    the byte span of every item. Stored next to the benchmark as
+    oval_graph_cache.json and keyed by the file's SHA-256.
+    """
+
+    def __init__(self, oval_path, data):
+        self.oval_path = oval_path
+        self.data = data
+        self.sha256 = data["sha256"]
+        self.spans = {
+            node_id: tuple(span)
+            for node_id, span in zip(data["ids"], data["spans"])
+            if span is not None
+        }
+        self.graph = CompactGraph.from_arrays(
+            data["ids"],
+            array("b", data["types"]),
+            array("l", data["fwd_offsets"]),
+            array("l", data["fwd_targets"]),
+            data["node_count"],
+        )
+
+    @staticmethod
+    def cache_path(benchmark_dir):
+        return os.path.join(benchmark_dir, CACHE_FILENAME)
+
+    @classmethod
+    def load(cls, benchmark_dir, rebuild=False):
+        """
+        Return the cache for benchmark_dir/oval.xml, rebuilding it when it
+        is missing, was written for different file contents, or rebuild=True.
+        """
+        oval_path = os.path.join(benchmark_dir, "oval.xml")
+        cache_path = cls.cache_path(benchmark_dir)
+        stat = os.stat(oval_path)
+
+        if not rebuild and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+
+            if data and data.get("version") == CACHE_VERSION:
+                # Same size and mtime: trust the stored hash, otherwise rehash
+                if (data["size"], data["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns) \
+                        or data["sha256"] == file_sha256(oval_path):
+                    return cls(oval_path, data)
+
+        return cls.build(benchmark_dir)
+
+    @classmethod
+    def build(cls, benchmark_dir):
+        oval_path = os.path.join(benchmark_dir, "oval.xml")
+        stat = os.stat(oval_path)
+        with open(oval_path, "rb") as f:
+            oval_bytes = f.read()
+
+        dsa = OvalDSA(oval_bytes, compact=True)
+        graph = dsa.graph
+
+        # Byte spans are only usable when the file is UTF-8 like our output
+        encoding = (dsa.tree.docinfo.encoding or "UTF-8").upper()
+        if encoding in ("UTF-8", "UTF8"):
+            root_start, generator, item_spans, section_namespaces = index_item_spans(oval_bytes)
+        else:
+            root_start, generator, item_spans, section_namespaces = None, None, {}, {}
+        if section_namespaces is None:
+            # Items of one section need different declarations; export from a parse instead
+            root_start, section_namespaces = None, {}
+
+        data = {
+            "version": CACHE_VERSION,
+            "sha256": hashlib.sha256(oval_bytes).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "root_start": root_start,
+            "generator": generator,
+            "section_namespaces": section_namespaces,
+            "ids": graph.ids,
+            "node_count": graph.node_count,
+            "types": graph.types.tolist(),
+            "spans": [
+                item_spans.get(node_id) if i < graph.node_count else None
+                for i, node_id in enumerate(graph.ids)
+            ],
+            "fwd_offsets": graph.fwd_offsets.tolist(),
+            "fwd_targets": graph.fwd_targets.tolist(),
+        }
+
+        cache_path = cls.cache_path(benchmark_dir)
+        tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+        print(f"✅ Saved: {cache_path}")
+
+        return cls(oval_path, data)
+
+    def definition_closure(self, definition_ids):
+        return self.graph.closure(definition_ids)
+
+    def iter_xml_chunks(self, definition_ids):
+        """
+        Yield an OVAL document holding the closure of definition_ids, built
+        from byte slices of oval.xml in section and document order.
+        Returns nothing if the file could not be span-indexed.
+        """
+        if self.data["root_start"] is None:
+            return
+
+        closure = self.definition_closure(definition_ids)
+        graph = self.graph
+        by_section = {section: [] for section in SECTIONS}
+        for node_id in closure:
+            span = self.spans.get(node_id)
+            if span is None:
+                continue
+            node_type = NODE_TYPES[graph.types[graph.index[node_id]]]
+            by_section[node_type + "s"].append(span)
+
+        root_start, root_end = self.data["root_start"]
+        with open(self.oval_path, "rb") as f:
+            def read_span(span):
+                f.seek(span[0])
+                return f.read(span[1] - span[0])
+
+            root_tag = read_span((root_start, root_end))
+            root_name = root_tag[1:].split(None, 1)[0].rstrip(b">")
+            prefix = root_name.rsplit(b":", 1)[0] + b":" if b":" in root_name else b""
+
+            yield b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield root_tag + b"\n"
+            if self.data["generator"]:
+                yield b"  " + read_span(self.data["generator"]) + b"\n"
+            for section in SECTIONS:
+                spans = sorted(by_section[section])
+                if not spans:
+                    continue
+                declarations = "".join(
+                    f" {name}={quoteattr(uri)}"
+                    for name, uri in self.data["section_namespaces"].get(section, {}).items()
+                )
+                yield b"  <" + prefix + section.encode() + declarations.encode() + b">\n"
+                for span in spans:
+                    yield b"    " + read_span(span) + b"\n"
+                yield b"  </" + prefix + section.encode() + b">\n"
+            yield b"</" + root_name + b">\n"
+
+    def to_xml_bytes(self, definition_ids):
+        return b"".join(self.iter_xml_chunks(definition_ids))
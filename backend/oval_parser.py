@@ -1,6 +1,22 @@
 from lxml import etree as ET
+import copy
 import io
+import os
 from collections import defaultdict
+from backend.compact_graph import CompactGraph, CompactNodes, CompactReverseRefs
+from backend.xml_stream import XmlContainer, iter_xml_chunks
+
+# Store parsed graphs in the integer-indexed CSR backend by default
+COMPACT_GRAPH = os.getenv("OVAL_COMPACT_GRAPH", "0") == "1"
+
+# Top-level OVAL sections and the graph node type of their items
+SECTION_NODE_TYPES = {
+    "definitions": "definition",
+    "tests": "test",
+    "objects": "object",
+    "states": "state",
+    "variables": "variable",
+}
 
 class GraphNode:
     def __init__(self, node_id, node_type, element):
@@ -9,9 +25,50 @@ class GraphNode:
         self.element = element
         self.children = set()
 
+def build_oval_root(source_root, generator, nodes):
+    """
+    Build a new oval_definitions root holding deep copies of the given
+    nodes' elements, grouped into their sections. The source tree is
+    never modified.
+    """
+    root_copy = ET.Element(source_root.tag, nsmap=source_root.nsmap)
+
+    # Generator
+    if generator is not None:
+        root_copy.append(copy.deepcopy(generator))
+
+    sections = defaultdict(list)
+    for node in nodes:
+        sections[node.type + "s"].append(node.element)
+
+    for section in ["definitions", "tests", "objects", "states", "variables"]:
+        if sections[section]:
+            section_elem = ET.SubElement(root_copy, f"{{{source_root.nsmap[None]}}}{section}")
+            for elem in sections[section]:
+                section_elem.append(copy.deepcopy(elem))
+
+    return root_copy
+
+def iter_oval_xml_chunks(source_root, generator, nodes):
+    """
+    Same document as build_oval_root, serialized straight from the source
+    elements in chunks without copying them.
+    """
+    sections = defaultdict(list)
+    for node in nodes:
+        sections[node.type + "s"].append(node.element)
+
+    children = [] if generator is None else [generator]
+    for section in ["definitions", "tests", "objects", "states", "variables"]:
+        if sections[section]:
+            children.append(XmlContainer(f"{{{source_root.nsmap[None]}}}{section}", sections[section]))
+
+    return iter_xml_chunks(XmlContainer(source_root.tag, children, nsmap=source_root.nsmap))
+
 class OvalDSA:
-    def __init__(self, xml_bytes):
+    def __init__(self, xml_bytes, compact=None):
         self.xml_bytes = xml_bytes
+        self.compact = COMPACT_GRAPH if compact is None else compact
         self.parser = ET.XMLParser(remove_blank_text=True)
         self.tree = ET.parse(io.BytesIO(xml_bytes), self.parser)
         self.root = self.tree.getroot()
@@ -19,133 +76,141 @@ class OvalDSA:
         self.nodes = {}
         self.reverse_refs = defaultdict(set)
         self.element_by_id = {}
-        self._index_elements()
+        self.graph = None
         self._build_graph()
+        if self.compact:
+            self._compact_graph()
 
-    def _index_elements(self):
-        for elem in self.root.iter():
-            elem_id = elem.attrib.get("id")
-            if elem_id:
-                self.element_by_id[elem_id] = elem
+    def _compact_graph(self):
+        """
+        Swap the GraphNode dict and reverse_refs sets for a CompactGraph.
+        nodes and reverse_refs keep their dict-like read API.
+        """
+        self.graph = CompactGraph(self.nodes, self.reverse_refs)
+        self.nodes = CompactNodes(self.graph)
+        self.reverse_refs = CompactReverseRefs(self.graph)
+        self.node_order = self.graph.index
 
     def _build_graph(self):
-        for def_elem in self.root.findall(".//definitions/definition",namespaces=self.nsmap):
-            self._process_definition(def_elem)
+        """
+        Build element_by_id, nodes and reverse_refs in one linear walk.
+        Every element is visited once; references are collected per
+        top-level item and then resolved for everything reachable from a
+        definition.
+        """
+        # item id -> (node type, element, [(ref kind, ref id, ref element)])
+        items = {}
+        self.graph_index = None
 
-    def _process_definition(self, def_elem):
-        def_id = def_elem.attrib["id"]
-        if def_id in self.nodes:
-            return
-        def_node = GraphNode(def_id, "definition", def_elem)
-        self.nodes[def_id] = def_node
-
-        for ext in def_elem.findall(".//extend_definition", namespaces=self.nsmap):
-            ref_id = ext.attrib.get("definition_ref")
-            if ref_id and ref_id in self.element_by_id:
-                def_node.children.add(ref_id)
-                self.reverse_refs[ref_id].add(def_id)
-                self._process_definition(self.element_by_id[ref_id])
-
-        for criterion in def_elem.findall(".//criterion", namespaces=self.nsmap):
-            test_ref = criterion.attrib.get("test_ref")
-            if not test_ref:
+        for section in self.root:
+            if not isinstance(section.tag, str):
                 continue
-            crit_id = f"criterion:{def_id}:{test_ref}"
-            crit_node = GraphNode(crit_id, "criterion", criterion)
-            self.nodes[crit_id] = crit_node
-            def_node.children.add(crit_id)
-            crit_node.children.add(test_ref)
-            self.reverse_refs[crit_id].add(def_id)
-            self.reverse_refs[test_ref].add(crit_id)
-
-            test_elem = self.element_by_id.get(test_ref)
-            if test_elem:
-                if test_ref not in self.nodes:
-                    self.nodes[test_ref] = GraphNode(test_ref, "test", test_elem)
-
-                object_refs = [e.attrib["object_ref"] for e in test_elem.xpath(".//*[local-name()='object']") if "object_ref" in e.attrib]
-                state_refs = [e.attrib["state_ref"] for e in test_elem.xpath(".//*[local-name()='state']") if "state_ref" in e.attrib]
-
-                for obj_id in object_refs:
-                    self.nodes[test_ref].children.add(obj_id)
-                    self.reverse_refs[obj_id].add(test_ref)
-                    self._process_object(obj_id)
-
-                for state_id in state_refs:
-                    self.nodes[test_ref].children.add(state_id)
-                    self.reverse_refs[state_id].add(test_ref)
-                    self._process_state(state_id)
-
-    def _process_object(self, obj_id):
-        obj_elem = self.element_by_id.get(obj_id)
-        if obj_elem is None:
-            return
-        if obj_id not in self.nodes:
-            self.nodes[obj_id] = GraphNode(obj_id, "object", obj_elem)
-
-        # Handle <set>
-        set_elem = obj_elem.find(".//set", namespaces=self.nsmap)
-        if set_elem is not None:
-            for obj_ref_elem in set_elem.findall("oval:object_reference", namespaces=self.nsmap):
-                child_obj_id = obj_ref_elem.text.strip()
-                self.nodes[obj_id].children.add(child_obj_id)
-                self.reverse_refs[child_obj_id].add(obj_id)
-                self._process_object(child_obj_id)
-            for filter_elem in set_elem.findall("oval:filter", namespaces=self.nsmap):
-                state_id = filter_elem.text.strip()
-                self.nodes[obj_id].children.add(state_id)
-                self.reverse_refs[state_id].add(obj_id)
-                self._process_state(state_id)
-
-        for var_elem in obj_elem.xpath(".//*[@var_ref]"):
-            var_id = var_elem.attrib.get("var_ref")
-            if var_id and var_id in self.element_by_id:
-                if var_id not in self.nodes:
-                    self.nodes[var_id] = GraphNode(var_id, "variable", self.element_by_id[var_id])
-                self.nodes[obj_id].children.add(var_id)
-                self.reverse_refs[var_id].add(obj_id)        
-
-        # Also handle <filter> directly on object
-        for filter_elem in obj_elem.xpath(".//*[local-name()='filter']"):
-            state_id = filter_elem.text.strip()
-            if state_id in self.element_by_id:
-                self.nodes[obj_id].children.add(state_id)
-                self.reverse_refs[state_id].add(obj_id)
-                self._process_state(state_id)
-
-    def _process_state(self, state_id):
-        state_elem = self.element_by_id.get(state_id)
-        if not state_elem:
-            return
-        if state_id not in self.nodes:
-            self.nodes[state_id] = GraphNode(state_id, "state", state_elem)
-        for var_elem in state_elem.xpath(".//*[@var_ref]"):
-            var_id = var_elem.attrib.get("var_ref")
-            if var_id and var_id in self.element_by_id:
-                if var_id not in self.nodes:
-                    self.nodes[var_id] = GraphNode(var_id, "variable", self.element_by_id[var_id])
-                self.nodes[state_id].children.add(var_id)
-                self.reverse_refs[var_id].add(state_id)
+            node_type = SECTION_NODE_TYPES.get(ET.QName(section).localname)
+            if node_type is None:
+                for elem in section.iter():
+                    self._index_element(elem)
+                continue
+            self._index_element(section)
 
-    def keep_only_definition(self, def_id):
-        if def_id not in self.nodes:
-            return
-        keep_set = set()
-        stack = [def_id]
+            for item in section:
+                if not isinstance(item.tag, str):
+                    continue
+                refs = []
+                for elem in item.iter():
+                    if not isinstance(elem.tag, str):
+                        continue
+                    self._index_element(elem)
+                    if elem is item:
+                        continue
+                    self._collect_refs(node_type, elem, refs)
+
+                item_id = item.get("id")
+                if item_id and item_id not in items:
+                    items[item_id] = (node_type, item, refs)
+
+        # Only definitions and whatever they reach become graph nodes
+        reachable = set()
+        stack = [item_id for item_id, (node_type, _, _) in items.items() if node_type == "definition"]
         while stack:
-            curr = stack.pop()
-            if curr in keep_set:
+            item_id = stack.pop()
+            if item_id in reachable or item_id not in items:
                 continue
-            keep_set.add(curr)
-            stack.extend(self.nodes[curr].children)
+            reachable.add(item_id)
+            stack.extend(ref_id for _, ref_id, _ in items[item_id][2])
 
-        for node_id in list(self.nodes):
-            if node_id not in keep_set:
-                del self.nodes[node_id]
+        for item_id, (node_type, item, refs) in items.items():
+            if item_id not in reachable:
+                continue
+            node = GraphNode(item_id, node_type, item)
+            self.nodes[item_id] = node
+
+            for kind, ref_id, ref_elem in refs:
+                if kind == "criterion":
+                    crit_id = f"criterion:{item_id}:{ref_id}"
+                    crit_node = GraphNode(crit_id, "criterion", ref_elem)
+                    crit_node.children.add(ref_id)
+                    self.nodes[crit_id] = crit_node
+                    node.children.add(crit_id)
+                    self.reverse_refs[crit_id].add(item_id)
+                    self.reverse_refs[ref_id].add(crit_id)
+                    continue
+                if kind == "known" and ref_id not in self.element_by_id:
+                    continue
+                node.children.add(ref_id)
+                self.reverse_refs[ref_id].add(item_id)
+
+        self.node_order = {node_id: i for i, node_id in enumerate(self.nodes)}
+
+    def _index_element(self, elem):
+        elem_id = elem.get("id") if isinstance(elem.tag, str) else None
+        if elem_id:
+            self.element_by_id[elem_id] = elem
+
+    @staticmethod
+    def _collect_refs(node_type, elem, refs):
+        """
+        Append the references held by elem, a descendant of a top-level
+        item of the given type. "known" refs only count when the target
+        id exists in the document.
+        """
+        local_name = ET.QName(elem).localname
+
+        if node_type == "definition":
+            if local_name == "extend_definition":
+                ref_id = elem.get("definition_ref")
+                if ref_id:
+                    refs.append(("known", ref_id, elem))
+            elif local_name == "criterion":
+                ref_id = elem.get("test_ref")
+                if ref_id:
+                    refs.append(("criterion", ref_id, elem))
+
+        elif node_type == "test":
+            if local_name == "object" and "object_ref" in elem.attrib:
+                refs.append(("ref", elem.get("object_ref"), elem))
+            elif local_name == "state" and "state_ref" in elem.attrib:
+                refs.append(("ref", elem.get("state_ref"), elem))
+
+        elif node_type in ("object", "state"):
+            var_id = elem.get("var_ref")
+            if var_id:
+                refs.append(("known", var_id, elem))
+            if node_type == "object" and elem.text:
+                if local_name == "object_reference":
+                    refs.append(("ref", elem.text.strip(), elem))
+                elif local_name == "filter":
+                    refs.append(("known", elem.text.strip(), elem))
+
+    def definition_closure(self, definition_ids):
+        """
+        Return the set of node ids reachable from the given definitions,
+        including extended definitions, tests, objects, states and variables.
+        """
+        if self.graph is not None:
+            return self.graph.closure(definition_ids)
 
-    def keep_only_definitions(self, definition_ids):
         keep_set = set()
-        stack = list(definition_ids)
+        stack = [d for d in definition_ids if d in self.nodes]
         while stack:
             current_id = stack.pop()
             if current_id in keep_set:
@@ -154,51 +219,52 @@ class OvalDSA:
             node = self.nodes.get(current_id)
             if node:
                 stack.extend(node.children)
-        for node_id in list(self.nodes.keys()):
-            if node_id not in keep_set:
-                del self.nodes[node_id]            
+        return keep_set
 
-    def to_xml_bytes(self):
-        root_copy = ET.Element(self.root.tag, nsmap=self.root.nsmap)
+    def definition_view(self, definition_ids):
+        """
+        Read-only view over the closure of one or many definitions.
+        Nothing in this DSA is modified, so a single parsed OVAL can serve
+        any number of extractions.
+        """
+        return OvalDefinitionView(self, self.definition_closure(definition_ids))
 
-        # Generator
-        gen = self.root.find("oval:generator", namespaces=self.nsmap)
-        if gen is not None:
-            root_copy.append(gen)
+    def extract_definition(self, def_id):
+        return self.definition_view([def_id])
 
-        sections = defaultdict(list)
-        for node in self.nodes.values():
-            sections[node.type + "s"].append(node.element)
+    def keep_only_definition(self, def_id):
+        if def_id not in self.nodes:
+            return
+        self.keep_only_definitions([def_id])
 
-        for section in ["definitions", "tests", "objects", "states", "variables"]:
-            if sections[section]:
-                section_elem = ET.SubElement(root_copy, f"{{{self.nsmap[None]}}}{section}")
-                for elem in sections[section]:
-                    section_elem.append(elem)
+    def keep_only_definitions(self, definition_ids):
+        keep_set = self.definition_closure(definition_ids)
+        for node_id in list(self.nodes.keys()):
+            if node_id not in keep_set:
+                del self.nodes[node_id]
+        self.graph_index = None
 
+    def to_xml_bytes(self):
+        root_copy = build_oval_root(
+            self.root,
+            self.root.find("oval:generator", namespaces=self.nsmap),
+            self.nodes.values()
+        )
         return ET.tostring(root_copy, pretty_print=True, encoding="utf-8", xml_declaration=True)
-    
-
-    def to_lxml_element(self):
-        root_copy = ET.Element(self.root.tag, nsmap=self.root.nsmap)
-
-        # Generator
-        gen = self.root.find("generator", namespaces=self.nsmap)
-        if gen is not None:
-            root_copy.append(gen)
 
-        sections = defaultdict(list)
-        for node in self.nodes.values():
-            sections[node.type + "s"].append(node.element)
+    def iter_xml_chunks(self):
+        return iter_oval_xml_chunks(
+            self.root,
+            self.root.find("oval:generator", namespaces=self.nsmap),
+            self.nodes.values()
+        )
 
-        for section in ["definitions", "tests", "objects", "states", "variables"]:
-            if sections[section]:
-                section_elem = ET.SubElement(root_copy, f"{{{self.nsmap[None]}}}{section}")
-                for elem in sections[section]:
-                    section_elem.append(elem)
-
-        return root_copy
-    
+    def to_lxml_element(self):
+        return build_oval_root(
+            self.root,
+            self.root.find("generator", namespaces=self.nsmap),
+            self.nodes.values()
+        )
 
     def merge_edited_ovals(self, oval_file_paths):
         """
@@ -246,8 +312,57 @@ class OvalDSA:
                     master_section.append(el)
 
         # Rebuild graph from updated XML
-        self.nodes.clear()
-        self.reverse_refs.clear()
+        self.nodes = {}
+        self.reverse_refs = defaultdict(set)
         self.element_by_id.clear()
-        self._index_elements()
-        self._build_graph()
\ No newline at end of file
+        self.graph = None
+        self._build_graph()
+        if self.compact:
+            self._compact_graph()
+
+
+class OvalDefinitionView:
+    """
+    Closure of one or many definitions inside a parsed OvalDSA.
+    Exposes the same nodes/reverse_refs/element_by_id attributes as OvalDSA
+    so OvalAnalyzer can run on it, while serialization works on deep copies.
+    """
+    def __init__(self, dsa, node_ids):
+        self.dsa = dsa
+        self.root = dsa.root
+        self.nsmap = dsa.nsmap
+        self.reverse_refs = dsa.reverse_refs
+        self.element_by_id = dsa.element_by_id
+        self.node_ids = frozenset(node_ids)
+        self.graph_index = None
+        # Keep master document order so output matches the old keep_only_* path.
+        # The closure may hold dangling refs, which have no node; anything
+        # node_order does not know goes last rather than raising.
+        order = dsa.node_order
+        self.nodes = {
+            node_id: dsa.nodes[node_id]
+            for node_id in sorted(
+                (n for n in self.node_ids if n in dsa.nodes),
+                key=lambda n: (order.get(n, len(order)), n)
+            )
+        }
+
+    def __contains__(self, node_id):
+        return node_id in self.node_ids
+
+    def to_lxml_element(self):
+        return build_oval_root(
+            self.root,
+            self.root.find("generator", namespaces=self.nsmap),
+            self.nodes.values()
+        )
+
+    def to_xml_bytes(self):
+        return ET.tostring(self.to_lxml_element(), pretty_print=True, encoding="utf-8", xml_declaration=True)
+
+    def iter_xml_chunks(self):
+        return iter_oval_xml_chunks(
+            self.root,
+            self.root.find("generator", namespaces=self.nsmap),
+            self.nodes.values()
+        )
@@ -0,0 +1,71 @@
+# backend/rule_object_types.py
+#
+# Rule -> OVAL object type associations (the rule_object_types table). Filters
+# by object type look the matching rules up through the
+# (benchmark_id, object_type) index instead of scanning Rule.object_type.
+
+import json
+from sqlalchemy import func, select
+
+from backend.models import Rule, RuleObjectType
+
+
+def object_type_rows(object_types, unsupported_probes=()):
+    """Association rows (without rule/benchmark ids) for a rule's object types."""
+    unsupported = set(unsupported_probes or ())
+    return [
+        {"object_type": object_type, "supported": 0 if object_type in unsupported else 1}
+        for object_type in sorted(set(object_types))
+    ]
+
+
+def object_type_rows_for_rule(object_type, unsupported_probes):
+    """Same, from the stored Rule.object_type and Rule.unsupported_probes columns."""
+    try:
+        unsupported = json.loads(unsupported_probes) if unsupported_probes else []
+    except ValueError:
+        unsupported = []
+    return object_type_rows(
+        [part.strip() for part in (object_type or "").split(",") if part.strip()],
+        unsupported
+    )
+
+
+def matching_object_types(session, benchmark_id, search):
+    """The benchmark's object types containing search, case-insensitively."""
+    object_types = session.scalars(
+        select(RuleObjectType.object_type)
+        .where(RuleObjectType.benchmark_id == benchmark_id)
+        .distinct()
+    ).all()
+    return [object_type for object_type in object_types if search.lower() in object_type.lower()]
+
+
+def rule_object_type_filter(session, benchmark_id, search):
+    """Filter clause for the benchmark's rules that use an object type containing search."""
+    object_types = matching_object_types(session, benchmark_id, search)
+    return Rule.id.in_(
+        select(RuleObjectType.rule_id).where(
+            RuleObjectType.benchmark_id == benchmark_id,
+            RuleObjectType.object_type.in_(object_types)
+        )
+    )
+
+
+def object_type_coverage(session, benchmark_id):
+    """Per object type: how many included rules use it and whether it has a probe."""
+    rows = session.execute(
+        select(
+            RuleObjectType.object_type,
+            func.count(RuleObjectType.id),
+            func.min(func.coalesce(RuleObjectType.supported, 0))
+        )
+        .join(Rule, Rule.id == RuleObjectType.rule_id)
+        .where(RuleObjectType.benchmark_id == benchmark_id, Rule.excluded == 0)
+        .group_by(RuleObjectType.object_type)
+        .order_by(RuleObjectType.object_type)
+    ).all()
+    return [
+        {"object_type": object_type, "rules": count, "supported": bool(supported)}
+        for object_type, count, supported in rows
+    ]
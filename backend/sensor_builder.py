@@ -0,0 +1,330 @@
+# backend/sensor_builder.py
+
+import json
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from lxml import etree as ET
+from sqlalchemy import bindparam, case, func, update
+
+from backend.bulk_ingest import chunked, DB_INSERT_CHUNK_SIZE
+from backend.database import SessionLocal
+from backend.document_cache import get_definition_map, full_oval_chunks
+from backend.job_progress import current_progress
+from backend.models import Benchmark, Rule
+from backend.sensorbin_generator import generate_instructions, generate_sensor_cf
+from backend.channel_file_worker import SENSOR_BUILD_MODE
+from backend.sensor_cache import SENSOR_CACHE_ENABLED, canonical_oval_bytes, toolchain_digest, sensor_cache_key, fetch_sensor_bin, store_sensor_bin
+
+PYTHON_PATH = os.getenv("PYTHON_PATH")
+BUILD_CHANNEL_FILE = os.getenv("BUILD_CHANNEL_FILE")
+GENERATE_INSTRUCTIONS = os.getenv("GENERATE_INSTRUCTIONS_LOCATION_PROJ")
+REQUEST_PARAM = os.getenv("REQUEST_PARAM_FILE_LOCATION")
+# Concurrent sensor builds. Each build waits on two external processes,
+# so a thread pool is enough to keep them all busy.
+SENSOR_BUILD_WORKERS = int(os.getenv("SENSOR_BUILD_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+
+def build_sensor_bin(rule_id, oval_path, sensorbin_dir, scratch_root, use_cache=SENSOR_CACHE_ENABLED):
+    """
+    Build the sensor bin for one rule in a private scratch directory, so
+    any number of builds can run side by side. A bin already built from
+    the same canonical OVAL and toolchain is reused from the sensor cache.
+    Returns a job report.
+    """
+    report = {
+        "rule_id": rule_id,
+        "sensor_bin_path": None,
+        "cache_hit": False,
+        "error": None,
+        "instructions_seconds": None,
+        "build_seconds": None,
+        "seconds": None
+    }
+    start = time.perf_counter()
+    cache_key = None
+    if use_cache:
+        try:
+            toolchain = toolchain_digest(GENERATE_INSTRUCTIONS, REQUEST_PARAM, PYTHON_PATH, BUILD_CHANNEL_FILE)
+            cache_key = sensor_cache_key(oval_path, toolchain)
+            sensor_bin_path = os.path.join(sensorbin_dir, f"{rule_id}.bin")
+            if fetch_sensor_bin(cache_key, sensor_bin_path):
+                report["sensor_bin_path"] = sensor_bin_path
+                report["cache_hit"] = True
+                report["seconds"] = round(time.perf_counter() - start, 3)
+                print(f"✅ Sensor reused from cache for rule: {rule_id}")
+                return report
+        except Exception as e:
+            # Fall through to a normal build; the build reports real errors
+            cache_key = None
+            print(f"⚠ Sensor cache lookup failed for rule {rule_id}: {e}")
+
+    work_dir = tempfile.mkdtemp(prefix="sensor_", dir=scratch_root)
+    try:
+        instructions_file = generate_instructions(
+            GENERATE_INSTRUCTIONS,
+            REQUEST_PARAM,
+            os.path.abspath(oval_path),
+            work_dir,
+            rule_id,
+            work_dir=work_dir
+        )
+        report["instructions_seconds"] = round(time.perf_counter() - start, 3)
+
+        report["sensor_bin_path"] = generate_sensor_cf(
+            PYTHON_PATH,
+            BUILD_CHANNEL_FILE,
+            instructions_file,
+            rule_id,
+            sensorbin_dir,
+            work_dir=work_dir,
+            warm=SENSOR_BUILD_MODE == "warm"
+        )
+        report["build_seconds"] = round(time.perf_counter() - start - report["instructions_seconds"], 3)
+        if cache_key:
+            store_sensor_bin(cache_key, report["sensor_bin_path"])
+        print(f"✅ Sensor generated for rule: {rule_id}")
+    except Exception as e:
+        report["error"] = str(e)
+        print(f"❌ Sensor generation failed for rule {rule_id}: {e}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def rule_content_hash(oval_path, xccdf_path=None):
+    """
+    Hash of what a rule's sensor is built from: its canonical OVAL, plus its
+    XCCDF so text edits count too. Unparsable OVAL is hashed as raw bytes.
+    """
+    digest = hashlib.sha256()
+    if oval_path and os.path.exists(oval_path):
+        try:
+            digest.update(canonical_oval_bytes(oval_path))
+        except ET.XMLSyntaxError:
+            with open(oval_path, "rb") as f:
+                digest.update(f.read())
+    digest.update(b"\0")
+    if xccdf_path and os.path.exists(xccdf_path):
+        with open(xccdf_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def mark_sensor_results(benchmark, reports):
+    """
+    Record the job reports in one transaction: sensor_file_generated, the
+    content hash each bin was built from, and whether the rule is still
+    dirty (edited again while its build ran).
+    """
+    session = SessionLocal()
+    try:
+        benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+        if not benchmark_obj:
+            return
+
+        rules = Rule.__table__
+        built = [
+            {"b_benchmark_id": benchmark_obj.id, "b_rule_id": report["rule_id"], "b_hash": report["content_hash"]}
+            for report in reports if not report["error"]
+        ]
+        if built:
+            current_hash = func.coalesce(rules.c.content_hash, bindparam("b_hash"))
+            session.execute(
+                update(rules)
+                .where(rules.c.benchmark_id == bindparam("b_benchmark_id"), rules.c.rule_id == bindparam("b_rule_id"))
+                .values(
+                    sensor_file_generated=1,
+                    built_hash=bindparam("b_hash"),
+                    content_hash=current_hash,
+                    dirty=case((current_hash == bindparam("b_hash"), 0), else_=1)
+                ),
+                built
+            )
+
+        failed = [report["rule_id"] for report in reports if report["error"]]
+        for batch in chunked(failed, DB_INSERT_CHUNK_SIZE):
+            session.query(Rule).filter(
+                Rule.benchmark_id == benchmark_obj.id,
+                Rule.rule_id.in_(batch)
+            ).update({Rule.sensor_file_generated: 0}, synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+
+
+def build_sensor_bins(benchmark, benchmark_dir, rules, workers=None):
+    """
+    Build sensor bins for rules (dicts with rule_id, oval_path and
+    optionally xccdf_path) on a bounded pool and record the outcome in the
+    database. Returns one report per rule, in input order.
+    """
+    sensorbin_dir = os.path.abspath(os.path.join(benchmark_dir, "sensorbin"))
+    scratch_root = os.path.abspath(os.path.join(benchmark_dir, "cf_output"))
+    os.makedirs(sensorbin_dir, exist_ok=True)
+    os.makedirs(scratch_root, exist_ok=True)
+
+    def build(rule):
+        # Hash before building, so an edit made meanwhile leaves the rule dirty
+        content_hash = rule_content_hash(rule["oval_path"], rule.get("xccdf_path"))
+        report = build_sensor_bin(rule["rule_id"], rule["oval_path"], sensorbin_dir, scratch_root)
+        report["content_hash"] = content_hash
+        return report
+
+    workers = max(1, workers or SENSOR_BUILD_WORKERS)
+    progress = current_progress()
+    progress.stage("sensors", total=len(rules))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build, rule) for rule in rules]
+        for future in as_completed(futures):
+            report = future.result()
+            progress.advance(error=report["error"] and f"{report['rule_id']}: {report['error']}")
+        reports = [future.result() for future in futures]
+
+    mark_sensor_results(benchmark, reports)
+
+    failed = sum(1 for report in reports if report["error"])
+    cache_hits = sum(1 for report in reports if report["cache_hit"])
+    elapsed = time.perf_counter() - start
+    print(f"✅ Built {len(reports) - failed}/{len(reports)} sensor bins for {benchmark} "
+          f"in {elapsed:.1f}s with {workers} workers ({cache_hits} from cache, {failed} failed)")
+    return reports
+
+
+def mark_rule_edited(session, rule, oval_path=None, xccdf_path=None):
+    """
+    Re-hash a rule after its OVAL or XCCDF was saved and flag it dirty when
+    the content no longer matches its sensor bin. Returns whether the rule
+    is dirty. The caller commits.
+    """
+    content_hash = rule_content_hash(oval_path or rule.oval_path, xccdf_path or rule.xccdf_path)
+    if content_hash == rule.content_hash:
+        return bool(rule.dirty)
+    rule.content_hash = content_hash
+    if content_hash != rule.built_hash:
+        rule.dirty = 1
+        rule.dirty_at = time.time()
+        rule.sensor_file_generated = 0
+    else:
+        # Edited back to what was built
+        rule.dirty = 0
+    return bool(rule.dirty)
+
+
+# Saves closer together than this are coalesced into one rebuild
+SENSOR_REBUILD_DEBOUNCE = float(os.getenv("SENSOR_REBUILD_DEBOUNCE", "5"))
+
+
+def rebuild_dirty_sensors(benchmark, benchmark_dir, debounce=None):
+    """
+    Rebuild sensor bins only for dirty rules. A rule edited less than
+    debounce seconds ago is left for a later pass, so a burst of saves to
+    one rule costs one build. The job queue runs one rebuild_dirty job per
+    benchmark at a time; edits made after it finds nothing left queue the next.
+    """
+    debounce = SENSOR_REBUILD_DEBOUNCE if debounce is None else debounce
+    reports = []
+    attempted = {}
+    while True:
+        session = SessionLocal()
+        try:
+            benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+            dirty_rules = session.query(Rule.rule_id, Rule.oval_path, Rule.xccdf_path, Rule.dirty_at).filter(
+                Rule.benchmark_id == benchmark_obj.id,
+                Rule.dirty == 1,
+                Rule.excluded == 0
+            ).all() if benchmark_obj else []
+        finally:
+            session.close()
+
+        now = time.time()
+        # A failed build stays dirty; retry it only after another edit
+        dirty_rules = [rule for rule in dirty_rules if attempted.get(rule.rule_id, -1) != rule.dirty_at]
+        ready = [rule for rule in dirty_rules if (rule.dirty_at or 0) <= now - debounce]
+        settling = [rule.dirty_at for rule in dirty_rules if (rule.dirty_at or 0) > now - debounce]
+
+        if ready:
+            attempted.update((rule.rule_id, rule.dirty_at) for rule in ready)
+            reports.extend(build_sensor_bins(benchmark, benchmark_dir, [
+                {"rule_id": rule.rule_id, "oval_path": rule.oval_path, "xccdf_path": rule.xccdf_path}
+                for rule in ready
+            ]))
+        elif settling:
+            time.sleep(max(0.0, min(settling) + debounce - time.time()))
+        else:
+            return reports
+
+
+BENCHMARK_SENSOR_DIR = "benchmark_sensor"
+BENCHMARK_SENSOR_NAME = "benchmark"
+BENCHMARK_SENSOR_MAP = "rule_definition_map.json"
+
+
+def build_benchmark_sensor_bin(benchmark, benchmark_dir):
+    """
+    Build one channel file for the whole benchmark from the merged OVAL of
+    its included rules (the generate-full-oval document), running the
+    toolchain once instead of once per rule.
+
+    Writes benchmark_sensor/{benchmark.bin, oval.xml, rule_definition_map.json}
+    under benchmark_dir. The map ties each rule to its definition, and each
+    definition back to its rules, so results from the combined bin can be
+    attributed. Returns the job report.
+    """
+    session = SessionLocal()
+    try:
+        benchmark_obj = session.query(Benchmark).filter_by(name=benchmark).first()
+        if not benchmark_obj:
+            raise Exception(f"Benchmark {benchmark} not found.")
+        rule_ids = [
+            rule_id for (rule_id,) in session.query(Rule.rule_id).filter(
+                Rule.benchmark_id == benchmark_obj.id,
+                Rule.excluded == 0
+            )
+        ]
+    finally:
+        session.close()
+
+    xccdf_to_oval_def = get_definition_map(benchmark_dir)
+    rule_definitions = {
+        rule_id: xccdf_to_oval_def[rule_id]
+        for rule_id in rule_ids
+        if xccdf_to_oval_def.get(rule_id)
+    }
+    definition_rules = {}
+    for rule_id, def_id in rule_definitions.items():
+        definition_rules.setdefault(def_id, []).append(rule_id)
+
+    output_dir = os.path.abspath(os.path.join(benchmark_dir, BENCHMARK_SENSOR_DIR))
+    scratch_root = os.path.abspath(os.path.join(benchmark_dir, "cf_output"))
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(scratch_root, exist_ok=True)
+
+    oval_path = os.path.join(output_dir, "oval.xml")
+    with open(oval_path, "wb") as f:
+        f.writelines(full_oval_chunks(benchmark_dir, list(definition_rules)))
+
+    progress = current_progress()
+    progress.stage("benchmark_sensor", total=1)
+    report = build_sensor_bin(BENCHMARK_SENSOR_NAME, oval_path, output_dir, scratch_root)
+    progress.advance(error=report["error"])
+    if report["error"]:
+        print(f"❌ Benchmark sensor build failed for {benchmark}: {report['error']}")
+        return report
+
+    with open(os.path.join(output_dir, BENCHMARK_SENSOR_MAP), "w", encoding="utf-8") as f:
+        json.dump({
+            "benchmark": benchmark,
+            "sensor_bin": os.path.basename(report["sensor_bin_path"]),
+            "rules": rule_definitions,
+            "definitions": definition_rules
+        }, f, indent=2)
+
+    print(f"✅ Benchmark sensor built for {benchmark}: {len(definition_rules)} definitions, "
+          f"{len(rule_definitions)} rules in {report['seconds']:.1f}s")
+    return report
@@ -3,40 +3,74 @@
 import subprocess
 import os
 import shutil
+from backend.channel_file_worker import run_build_channel_file
 
-def generate_instructions(generate_instructions_path, request_param_path, oval_file_path, output_path, timestamp):
+
+def _command_path(path):
+    """Absolute path for a command run in another CWD; bare names are still looked up on PATH."""
+    return os.path.abspath(path) if os.path.dirname(path) else path
+
+
+def generate_instructions(generate_instructions_path, request_param_path, oval_file_path, output_path, timestamp, work_dir=None):
+    """
+    Run the instruction generator. The instructions file is copied into
+    work_dir (the CWD when not given) and its path is returned.
+    """
+    # The generator runs inside work_dir, so paths relative to our CWD are resolved first
     subprocess.run([
-        generate_instructions_path,
-        request_param_path,
-        oval_file_path,
-        output_path,
+        _command_path(generate_instructions_path),
+        os.path.abspath(request_param_path),
+        os.path.abspath(oval_file_path),
+        os.path.abspath(output_path),
         timestamp
-    ], check=True)
+    ], check=True, cwd=work_dir)
 
     output_file = f"cf.{timestamp}.bin.txt"
+    if work_dir:
+        output_file = os.path.join(work_dir, output_file)
     shutil.copy(os.path.join(output_path, "cf.bin"), output_file)
     return output_file
 
 
-def generate_sensor_cf(python_path, build_channel_file_path, instructions_file, timestamp, output_dir):
-    cwd = os.getcwd()
+def generate_sensor_cf(python_path, build_channel_file_path, instructions_file, timestamp, output_dir, work_dir=None, warm=False):
+    """
+    Build the channel file from instructions_file inside work_dir (the CWD
+    when not given) and move it to output_dir/{timestamp}.bin. With warm=True
+    the script runs in a long-lived worker, and is run again in a subprocess
+    if that fails.
+    """
+    cwd = work_dir or os.getcwd()
     instructions_file_path = os.path.join(cwd, instructions_file)
+    channel_file = os.path.join(cwd, f"SensorCf.{timestamp}.bin")
 
     command = [
-        python_path,
-        build_channel_file_path,
+        _command_path(python_path),
+        os.path.abspath(build_channel_file_path),
         "--channel-id", "905",
         "--channel-format", "37",
         "--current-version", "1",
         "--current", instructions_file_path,
-        "--channel-file", f"SensorCf.{timestamp}.bin"
+        "--channel-file", channel_file
     ]
 
-    result = subprocess.run(command, capture_output=True, text=True)
+    result = None
+    if warm:
+        try:
+            result = run_build_channel_file(python_path, command[1:], cwd)
+        except Exception as e:
+            print(f"⚠ Warm BuildChannelFile worker unavailable, using a subprocess: {e}")
+        if result is not None and result[0] != 0:
+            print(f"⚠ Warm BuildChannelFile run failed, retrying in a subprocess: {result[2].strip()}")
+            result = None
+
+    if result is None:
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=cwd)
+        result = (completed.returncode, completed.stdout, completed.stderr)
 
-    if result.returncode != 0:
-        raise Exception(f"BuildChannelFile.py failed. Output: {result.stdout}, Error: {result.stderr}")
+    returncode, stdout, stderr = result
+    if returncode != 0:
+        raise Exception(f"BuildChannelFile.py failed. Output: {stdout}, Error: {stderr}")
 
     sensor_bin_path = os.path.join(output_dir, f"{timestamp}.bin")
-    shutil.move(f"SensorCf.{timestamp}.bin", sensor_bin_path)
-    return sensor_bin_path
\ No newline at end of file
+    shutil.move(channel_file, sensor_bin_path)
+    return sensor_bin_path
@@ -3,6 +3,7 @@
 import requests
 from lxml import etree as ET
 import os
+from sqlalchemy import select
 from backend.database import SessionLocal
 from backend.models import *
 from backend.oval_transformer import transform_userright_oval
@@ -146,8 +147,10 @@ def run_userright_transformation(benchmark_name: str):
     rules = session.query(Rule).filter(
         Rule.benchmark_id == benchmark.id,
         Rule.excluded == 0,
-        Rule.object_type.isnot(None),
-        Rule.object_type.ilike("%userright_object%")
+        Rule.id.in_(select(RuleObjectType.rule_id).where(
+            RuleObjectType.benchmark_id == benchmark.id,
+            RuleObjectType.object_type == "userright_object"
+        ))
     ).all()
 
     print(f"🔍 Found {len(rules)} userright_object rules in benchmark {benchmark_name}.")
@@ -3,6 +3,10 @@
 import hashlib
 import os
 import json
+import re
+import uuid
+
+from backend.document_cache import get_filename_map
 
 def safe_rule_filename(rule_id):
     return hashlib.sha256(rule_id.encode("utf-8")).hexdigest() + ".xml"
@@ -17,12 +21,31 @@ def load_filename_map(dir_path, map_filename):
 def save_filename_map(dir_path, map_filename, mapping):
     os.makedirs(dir_path, exist_ok=True)
     path = os.path.join(dir_path, map_filename)
-    with open(path, "w", encoding="utf-8") as f:
+    # Readers may hold the cached map; swap the file in whole
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(mapping, f, indent=2)
+    os.replace(tmp_path, path)
 
 def get_hashed_path(rule_id, dir_path, map_filename):
-    mapping = load_filename_map(dir_path, map_filename)
+    """
+    Path of a rule's extracted file from a filename map, or None. The parsed
+    map is cached until the file changes. Prefer Rule.oval_path and
+    Rule.xccdf_path; this is the fallback for rules without them.
+    """
+    try:
+        mapping = get_filename_map(os.path.join(dir_path, map_filename))
+    except FileNotFoundError:
+        return None
     safe_filename = mapping.get(rule_id)
     if safe_filename:
         return os.path.join(dir_path, safe_filename)
     return None
+
+def get_xccdf_map_path(rule_id, xccdf_dir):
+    """
+    get_hashed_path for a rule's XCCDF file. Suffixed rule ids (_1, _2)
+    share their base rule's file, so the base id is tried after the exact one.
+    """
+    return get_hashed_path(rule_id, xccdf_dir, "xccdf_rule_filename_map.json") \
+        or get_hashed_path(re.sub(r'_\d+$', '', rule_id), xccdf_dir, "xccdf_rule_filename_map.json")
@@ -4,7 +4,9 @@ import os
 import paramiko
 import base64
 from backend.database import SessionLocal
-from backend.models import Rule, VCIResult
+from backend.models import Benchmark, Rule, VCIResult
+from backend.bulk_ingest import BulkIngest
+from backend.job_progress import current_progress
 from cryptography.fernet import Fernet
 import winrm
 
@@ -61,6 +63,8 @@ def run_vci_batch_on_linux(ip, user, password, rule_sensor_map, benchmark_dir):
     os.makedirs(vci_output_dir, exist_ok=True)
 
     result_paths = {}
+    progress = current_progress()
+    progress.stage("vci", total=len(rule_sensor_map))
 
     for rule_id, sensorbin_path in rule_sensor_map.items():
         remote_sensor_path = os.path.join(remote_vci_dir, "sensor.bin")
@@ -78,6 +82,7 @@ def run_vci_batch_on_linux(ip, user, password, rule_sensor_map, benchmark_dir):
         if exit_status != 0:
             error_output = stderr.read().decode()
             print(f"❌ VCIDEBUGCLI failed for rule {rule_id}:\n{error_output}")
+            progress.advance(error=f"{rule_id}: {error_output.strip()}")
             continue
 
         local_output_path = os.path.join(vci_output_dir, f"{rule_id}.json")
@@ -85,6 +90,7 @@ def run_vci_batch_on_linux(ip, user, password, rule_sensor_map, benchmark_dir):
         print(f"✅ Downloaded VCI output for rule {rule_id} to {local_output_path}")
 
         result_paths[rule_id] = local_output_path
+        progress.advance()
 
     sftp.close()
     ssh.close()
@@ -141,6 +147,8 @@ def run_vci_batch_on_windows(ip, user, password, rule_sensor_map, benchmark_dir)
     os.makedirs(vci_output_dir, exist_ok=True)
 
     result_paths = {}
+    progress = current_progress()
+    progress.stage("vci", total=len(rule_sensor_map))
 
     for rule_id, sensorbin_path in rule_sensor_map.items():
         session = winrm.Session(target=ip,
@@ -169,6 +177,7 @@ def run_vci_batch_on_windows(ip, user, password, rule_sensor_map, benchmark_dir)
 
         if result.status_code != 0:
             print(f"❌ VCIDEBUGCLI failed for rule {rule_id}:\n{result.std_err.decode()}")
+            progress.advance(error=f"{rule_id}: {result.std_err.decode().strip()}")
             session.close()
             continue
 
@@ -179,6 +188,7 @@ def run_vci_batch_on_windows(ip, user, password, rule_sensor_map, benchmark_dir)
 
         if result_json.status_code != 0:
             print(f"❌ Failed reading JSON for rule {rule_id}:\n{result_json.std_err.decode()}")
+            progress.advance(error=f"{rule_id}: {result_json.std_err.decode().strip()}")
             session.close()
             continue
 
@@ -191,6 +201,7 @@ def run_vci_batch_on_windows(ip, user, password, rule_sensor_map, benchmark_dir)
         print(f"✅ Downloaded Windows JSON output for rule {rule_id} to {local_output_path}")
 
         result_paths[rule_id] = local_output_path
+        progress.advance()
 
         session.close()
 
@@ -204,30 +215,82 @@ def save_batch_results_to_db(benchmark_name, result_paths):
 
     session = SessionLocal()
 
-    benchmark_obj = session.query(Rule.benchmark).filter_by(name=benchmark_name).first()
+    benchmark_obj = session.query(Benchmark).filter_by(name=benchmark_name).first()
     if not benchmark_obj:
         session.close()
         raise Exception(f"Benchmark {benchmark_name} not found.")
 
-    for rule_id, json_path in result_paths.items():
-        rule_obj = session.query(Rule).filter_by(
-            benchmark_id=benchmark_obj.id,
-            rule_id=rule_id
-        ).first()
+    # One lookup for all rules instead of a query per result
+    rule_pks = dict(
+        session.query(Rule.rule_id, Rule.id)
+        .filter(Rule.benchmark_id == benchmark_obj.id, Rule.rule_id.in_(list(result_paths)))
+        .all()
+    ) if result_paths else {}
 
-        if not rule_obj:
+    ingest = BulkIngest(session)
+    for rule_id, json_path in result_paths.items():
+        if rule_id not in rule_pks:
             print(f"⚠️ Rule {rule_id} not found in DB. Skipping.")
             continue
 
         with open(json_path, "r", encoding="utf-8") as f:
             json_text = f.read()
 
-        vci_result = VCIResult(
-            rule_id=rule_obj.id,
-            json_output=json_text
-        )
-        session.add(vci_result)
-        session.commit()
-        print(f"✅ Saved VCI result to DB for rule {rule_id}")
+        ingest.add_vci_result(rule_id, {
+            "rule_id": rule_pks[rule_id],
+            "json_output": json_text
+        })
+
+    try:
+        inserted, failed = ingest.finish()
+        for rule_id, error in failed.items():
+            print(f"⚠️ Failed to save VCI result for rule {rule_id}: {error}")
+        print(f"✅ Saved {len(inserted)} VCI results to DB for benchmark {benchmark_name}")
+    finally:
+        session.close()
+
 
-    session.close()
+def run_vci_debug(benchmark_name, benchmark_dir):
+    """
+    Run VCIDEBUGCLI for every generated, included rule of a benchmark on its
+    first remote host and save the results. Returns the number of rules run.
+    """
+    session = SessionLocal()
+    try:
+        benchmark_obj = session.query(Benchmark).filter_by(name=benchmark_name).first()
+        if not benchmark_obj:
+            raise Exception(f"Benchmark {benchmark_name} not found.")
+        if not benchmark_obj.remote_hosts:
+            raise Exception(f"No remote host configured for benchmark {benchmark_name}.")
+
+        remote_host = benchmark_obj.remote_hosts[0]
+        ip = remote_host.ip_address
+        username = remote_host.username
+        password = decrypt_password(remote_host.password_encrypted)
+        os_type = remote_host.os_type.lower()
+
+        rules = session.query(Rule.rule_id).filter_by(
+            benchmark_id=benchmark_obj.id,
+            excluded=0,
+            sensor_file_generated=1
+        ).all()
+    finally:
+        session.close()
+
+    rule_sensor_map = {}
+    for rule in rules:
+        sensorbin_path = os.path.join(benchmark_dir, "sensorbin", f"{rule.rule_id}.bin")
+        if os.path.exists(sensorbin_path):
+            rule_sensor_map[rule.rule_id] = sensorbin_path
+
+    if os_type == "linux":
+        result_paths = run_vci_batch_on_linux(ip, username, password, rule_sensor_map, benchmark_dir)
+    elif os_type == "windows":
+        result_paths = run_vci_batch_on_windows(ip, username, password, rule_sensor_map, benchmark_dir)
+    else:
+        raise Exception("Batch VCI not implemented for this OS.")
+
+    current_progress().stage("save", total=len(result_paths))
+    save_batch_results_to_db(benchmark_name, result_paths)
+    current_progress().advance(len(result_paths))
+    return len(result_paths)
@@ -1,6 +1,7 @@
 # backend/xccdf_parser.py
 
 from lxml import etree as ET
+import copy
 import io
 
 class XccdfDSA:
@@ -62,12 +63,12 @@ class XccdfDSA:
             new_group = ET.Element(group.tag, attrib=group.attrib)
             for child in group:
                 if child.tag.endswith(("title", "description")):
-                    new_group.append(child)
+                    new_group.append(copy.deepcopy(child))
             last_parent.append(new_group)
             last_parent = new_group
 
         # Add the Rule
-        last_parent.append(rule_elem)
+        last_parent.append(copy.deepcopy(rule_elem))
 
         # Find variables used in the rule
         used_var_ids = self._find_variables_in_rule(rule_elem)
@@ -75,7 +76,7 @@ class XccdfDSA:
         for var_id in used_var_ids:
             var_elem = self.variables_by_id.get(var_id)
             if var_elem is not None:
-                new_benchmark.append(var_elem)
+                new_benchmark.append(copy.deepcopy(var_elem))
 
         return new_benchmark
 
@@ -0,0 +1,131 @@
+# backend/xml_stream.py
+#
+# Incremental XML serialization for the export endpoints. A document is
+# written one element at a time with lxml and handed out in chunks of about
+# XML_STREAM_CHUNK_BYTES, so the serialized output never sits in memory
+# whole and clients get the first bytes right away.
+
+import os
+import re
+from lxml import etree as ET
+
+XML_STREAM_CHUNK_BYTES = int(os.getenv("XML_STREAM_CHUNK_BYTES", str(64 * 1024)))
+
+_NS_DECLARATION = re.compile(rb'\s+xmlns(?::([\w.-]+))?="([^"]*)"')
+
+
+class XmlContainer:
+    """An element opened in the output whose children are written one at a time."""
+
+    def __init__(self, tag, children, attrib=None, nsmap=None):
+        self.tag = tag
+        self.children = children
+        self.attrib = dict(attrib or {})
+        self.nsmap = nsmap
+
+
+def open_tree(element, depth=1):
+    """
+    Stream an existing tree: element and its descendants down to depth levels
+    become containers, anything deeper is serialized as a whole subtree.
+    Elements with mixed content are always written whole.
+    """
+    if depth <= 0 or not isinstance(element.tag, str) or not len(element) or _has_text(element):
+        return element
+    parent = element.getparent()
+    inherited = parent.nsmap if parent is not None else {}
+    return XmlContainer(
+        element.tag,
+        (open_tree(child, depth - 1) for child in element),
+        element.attrib,
+        {prefix: uri for prefix, uri in element.nsmap.items() if inherited.get(prefix) != uri}
+    )
+
+
+def _has_text(element):
+    return bool((element.text or "").strip()) or any((child.tail or "").strip() for child in element)
+
+
+class _ChunkBuffer:
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def write(self, data):
+        self.parts.append(data)
+        self.size += len(data)
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        self.size = 0
+        return data
+
+
+def _strip_inherited_namespaces(data, nsmap):
+    """
+    Drop the namespace declarations lxml repeats on a serialized subtree's
+    start tag when the open ancestors already declare them. Anything not
+    recognized is kept, which is redundant at worst.
+    """
+    declared = {(prefix.encode() if prefix else None, uri.encode()) for prefix, uri in nsmap.items()}
+    name_end = re.match(rb"<[^\s/>]+", data).end()
+    kept = []
+    pos = name_end
+    while True:
+        match = _NS_DECLARATION.match(data, pos)
+        if match is None:
+            break
+        if (match.group(1), match.group(2)) not in declared:
+            kept.append(match.group(0))
+        pos = match.end()
+    return data[:name_end] + b"".join(kept) + data[pos:]
+
+
+def _container_tags(item, nsmap, scope):
+    """
+    Start and end tag for a container. lxml serializes an empty copy of the
+    element, so attributes are escaped and xml:* attributes keep the
+    reserved xml prefix instead of getting a declared one.
+    """
+    shell = ET.tostring(ET.Element(item.tag, item.attrib, nsmap=scope), encoding="UTF-8")
+    shell = _strip_inherited_namespaces(shell, nsmap)
+    name = re.match(rb"<([^\s/>]+)", shell).group(1)
+    return shell[:-2] + b">\n", b"</" + name + b">\n"
+
+
+def iter_xml_chunks(root, chunk_size=XML_STREAM_CHUNK_BYTES):
+    """Yield root (an XmlContainer) as a UTF-8 XML document in chunks."""
+    buffer = _ChunkBuffer()
+
+    def write(item, nsmap):
+        if isinstance(item, XmlContainer):
+            scope = {**nsmap, **(item.nsmap or {})}
+            start_tag, end_tag = _container_tags(item, nsmap, scope)
+            buffer.write(start_tag)
+            for child in item.children:
+                yield from write(child, scope)
+            buffer.write(end_tag)
+        else:
+            data = ET.tostring(item, encoding="UTF-8", pretty_print=True, with_tail=False)
+            if isinstance(item.tag, str):
+                data = _strip_inherited_namespaces(data, nsmap)
+            buffer.write(data)
+        if buffer.size >= chunk_size:
+            yield buffer.take()
+
+    buffer.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+    yield from write(root, {})
+    if buffer.size:
+        yield buffer.take()
+
+
+def coalesce_chunks(chunks, chunk_size=XML_STREAM_CHUNK_BYTES):
+    """Regroup many small byte chunks into ones of about chunk_size."""
+    buffer = _ChunkBuffer()
+    for chunk in chunks:
+        buffer.write(chunk)
+        if buffer.size >= chunk_size:
+            yield buffer.take()
+    if buffer.size:
+        yield buffer.take()
@@ -0,0 +1,141 @@
+# benchmarks/api_concurrency.py
+#
+# Check that the API stays responsive while heavy exports run: a probe
+# thread times a cheap endpoint (/api/jobs?limit=1) first on an idle server,
+# then while export threads rebuild the OVAL graph cache and download the
+# full-benchmark OVAL in a loop.
+#
+#   python -m benchmarks.api_concurrency [--elements 200000] [--exports 2]
+#       [--duration 10] [--probe-interval 0.05]
+#
+# Runs against a throwaway data directory and a real uvicorn server.
+
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.export_streaming import make_synthetic_xccdf
+from benchmarks.oval_graph_build import make_synthetic_oval, ELEMENTS_PER_DEFINITION
+
+
+def request(method, url):
+    req = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(req, timeout=300) as res:
+        return res.read()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def probe(base_url, stop, interval, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        request("GET", f"{base_url}/api/jobs?limit=1")
+        latencies.append(time.perf_counter() - start)
+        stop.wait(interval)
+
+
+def export_loop(base_url, benchmark, stop, durations):
+    while not stop.is_set():
+        start = time.perf_counter()
+        request("POST", f"{base_url}/api/benchmarks/{benchmark}/oval-cache/rebuild")
+        request("GET", f"{base_url}/api/benchmarks/{benchmark}/generate-full-oval")
+        durations.append(time.perf_counter() - start)
+
+
+def summarize(label, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:>14}: {len(ordered)} probes, p50 {statistics.median(ordered) * 1000:.1f} ms, "
+          f"p95 {p95 * 1000:.1f} ms, max {ordered[-1] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, default=200000)
+    parser.add_argument("--exports", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="api_concurrency_")
+    os.chdir(workdir)
+    os.makedirs("data", exist_ok=True)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if not os.getenv("MASTER_KEY"):
+        from cryptography.fernet import Fernet
+        os.environ["MASTER_KEY"] = Fernet.generate_key().decode()
+
+    import uvicorn
+    from backend.main import app
+    from backend.database import SessionLocal
+    from backend.disa_stig import parse_cis_stig
+    from backend.models import Benchmark
+
+    benchmark = "bench"
+    benchmark_dir = os.path.join("data", benchmark)
+    os.makedirs(benchmark_dir, exist_ok=True)
+    oval_path = os.path.join(benchmark_dir, "oval.xml")
+    xccdf_path = os.path.join(benchmark_dir, "xccdf.xml")
+    with open(oval_path, "wb") as f:
+        f.write(make_synthetic_oval(args.elements))
+    with open(xccdf_path, "wb") as f:
+        f.write(make_synthetic_xccdf(max(1, args.elements // ELEMENTS_PER_DEFINITION)))
+
+    session = SessionLocal()
+    session.add(Benchmark(name=benchmark, benchmark_type="CIS"))
+    session.commit()
+    session.close()
+    print(f"Importing {args.elements} element benchmark into {workdir}")
+    parse_cis_stig(xccdf_path, oval_path, benchmark_dir, benchmark, "CIS")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    idle, busy, durations = [], [], []
+
+    stop = threading.Event()
+    prober = threading.Thread(target=probe, args=(base_url, stop, args.probe_interval, idle))
+    prober.start()
+    time.sleep(min(2.0, args.duration))
+    stop.set()
+    prober.join()
+
+    stop = threading.Event()
+    exporters = [
+        threading.Thread(target=export_loop, args=(base_url, benchmark, stop, durations))
+        for _ in range(args.exports)
+    ]
+    for exporter in exporters:
+        exporter.start()
+    prober = threading.Thread(target=probe, args=(base_url, stop, args.probe_interval, busy))
+    prober.start()
+    time.sleep(args.duration)
+    stop.set()
+    prober.join()
+    for exporter in exporters:
+        exporter.join()
+
+    server.should_exit = True
+
+    summarize("idle", idle)
+    summarize("during exports", busy)
+    print(f"{'exports':>14}: {len(durations)} rebuild+export rounds, "
+          f"mean {statistics.mean(durations):.2f} s, max {max(durations):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/document_cache_sizes.py
+#
+# Resident memory one document cache entry adds, relative to the size of its
+# source file, for each kind of entry. These ratios are what
+# PARSED_SIZE_FACTORS in backend/document_cache.py charges per entry.
+#
+#   python -m benchmarks.document_cache_sizes [--elements 200000] [--rules 5000]
+#
+# Each kind is loaded in a fresh interpreter so earlier loads do not leave
+# freed memory behind to be reused.
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from backend.document_cache import PARSED_SIZE_FACTOR, PARSED_SIZE_FACTORS, _read_bytes, _read_json
+from backend.oval_cache import OvalGraphCache
+from backend.oval_parser import OvalDSA
+from backend.xccdf_parser import XccdfDSA
+from benchmarks.export_streaming import make_synthetic_xccdf
+from benchmarks.oval_graph_build import make_synthetic_oval
+
+KINDS = {
+    "oval": ("oval.xml", lambda path: OvalDSA(_read_bytes(path), compact=True)),
+    "xccdf": ("xccdf.xml", lambda path: XccdfDSA(_read_bytes(path))),
+    "oval_graph": ("oval.xml", lambda path: OvalGraphCache.load(os.path.dirname(path))),
+    "definition_map": ("xccdf_to_oval_definition_map.json", _read_json),
+}
+
+
+def resident_bytes():
+    gc.collect()
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def write_documents(benchmark_dir, elements, rules):
+    with open(os.path.join(benchmark_dir, "oval.xml"), "wb") as f:
+        f.write(make_synthetic_oval(elements))
+    with open(os.path.join(benchmark_dir, "xccdf.xml"), "wb") as f:
+        f.write(make_synthetic_xccdf(rules))
+    definition_map = {
+        f"xccdf_bench_rule_{i}": [f"oval:bench:def:{i}"] for i in range(elements // 20)
+    }
+    with open(os.path.join(benchmark_dir, "xccdf_to_oval_definition_map.json"), "w", encoding="utf-8") as f:
+        json.dump(definition_map, f)
+    OvalGraphCache.build(benchmark_dir)
+
+
+def measure(kind, benchmark_dir):
+    filename, loader = KINDS[kind]
+    path = os.path.join(benchmark_dir, filename)
+    before = resident_bytes()
+    value = loader(path)
+    ratio = (resident_bytes() - before) / os.path.getsize(path)
+    del value
+    return ratio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, default=200000)
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--kind", choices=KINDS, help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.kind:
+        print(measure(args.kind, args.dir))
+        return
+
+    benchmark_dir = tempfile.mkdtemp(prefix="cache_sizes_")
+    try:
+        write_documents(benchmark_dir, args.elements, args.rules)
+        print(f"{'kind':<16} {'measured':>9} {'charged':>8}")
+        for kind in KINDS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.document_cache_sizes", "--kind", kind, "--dir", benchmark_dir],
+                capture_output=True, text=True, check=True
+            ).stdout
+            ratio = float(output.strip().splitlines()[-1])
+            print(f"{kind:<16} {ratio:>8.1f}x {PARSED_SIZE_FACTORS.get(kind, PARSED_SIZE_FACTOR):>7}x")
+    finally:
+        shutil.rmtree(benchmark_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
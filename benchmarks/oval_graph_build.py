@@ -0,0 +1,287 @@
+# benchmarks/oval_graph_build.py
+#
+# Compare OvalDSA's single-pass graph builder with the previous recursive
+# findall/xpath builder on a synthetic OVAL document.
+#
+#   python -m benchmarks.oval_graph_build [--elements 20000] [--repeat 3] [--edge-cases]
+#
+# --edge-cases adds a <set> object and a state without child elements. The
+# previous builder dropped both kinds of reference, so the graphs then differ
+# and the differing nodes are listed.
+
+import argparse
+import io
+import time
+from collections import defaultdict
+
+from lxml import etree as ET
+
+from backend.oval_parser import OvalDSA, GraphNode
+
+NS_OVAL = "http://oval.mitre.org/XMLSchema/oval-definitions-5"
+NS_COMMON = "http://oval.mitre.org/XMLSchema/oval-common-5"
+NS_WIN = "http://oval.mitre.org/XMLSchema/oval-definitions-5#windows"
+
+# Roughly how many elements make_synthetic_oval emits per definition
+ELEMENTS_PER_DEFINITION = 20
+
+
+def make_synthetic_oval(element_count):
+    """
+    Build an OVAL document with about element_count elements. Tests are
+    shared between definitions and every tenth definition extends the
+    previous one, so the builders have to deal with repeated references.
+    """
+    count = max(1, element_count // ELEMENTS_PER_DEFINITION)
+    definitions, tests, objects, states, variables = [], [], [], [], []
+
+    for i in range(count):
+        criteria = f'<criterion test_ref="oval:bench:tst:{i}"/>'
+        criteria += f'<criterion test_ref="oval:bench:tst:{i // 2}"/>'
+        if i % 10 == 9:
+            criteria += f'<extend_definition definition_ref="oval:bench:def:{i - 1}"/>'
+        definitions.append(
+            f'<definition id="oval:bench:def:{i}" class="compliance" version="1">'
+            f'<metadata><title>Definition {i}</title>'
+            f'<affected family="windows"><platform>Microsoft Windows 10</platform></affected>'
+            f'<description>Synthetic definition {i}</description></metadata>'
+            f'<criteria operator="AND">{criteria}</criteria></definition>'
+        )
+        tests.append(
+            f'<win:registry_test id="oval:bench:tst:{i}" check="all" version="1" comment="t{i}">'
+            f'<win:object object_ref="oval:bench:obj:{i}"/><win:state state_ref="oval:bench:ste:{i}"/>'
+            f'</win:registry_test>'
+        )
+        objects.append(
+            f'<win:registry_object id="oval:bench:obj:{i}" version="1">'
+            f'<win:hive>HKEY_LOCAL_MACHINE</win:hive>'
+            f'<win:key operation="pattern match">^SOFTWARE\\\\Bench\\b{i}</win:key>'
+            f'<win:name var_ref="oval:bench:var:{i}"/></win:registry_object>'
+        )
+        states.append(
+            f'<win:registry_state id="oval:bench:ste:{i}" version="1">'
+            f'<win:type>reg_dword</win:type><win:value datatype="int">{i}</win:value>'
+            f'</win:registry_state>'
+        )
+        variables.append(
+            f'<constant_variable id="oval:bench:var:{i}" datatype="string" version="1" comment="v{i}">'
+            f'<value>Value{i}</value></constant_variable>'
+        )
+
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<oval_definitions xmlns="{NS_OVAL}" xmlns:oval="{NS_COMMON}" xmlns:win="{NS_WIN}">'
+        f'<generator><oval:product_name>bench</oval:product_name>'
+        f'<oval:schema_version>5.11</oval:schema_version>'
+        f'<oval:timestamp>2024-01-01T00:00:00</oval:timestamp></generator>'
+        f'<definitions>{"".join(definitions)}</definitions>'
+        f'<tests>{"".join(tests)}</tests>'
+        f'<objects>{"".join(objects)}</objects>'
+        f'<states>{"".join(states)}</states>'
+        f'<variables>{"".join(variables)}</variables>'
+        f'</oval_definitions>'
+    ).encode("utf-8")
+
+
+class RecursiveOvalDSA(OvalDSA):
+    """
+    The graph builder OvalDSA used before the single-pass indexer, copied
+    verbatim from the baseline backend/oval_parser.py.
+    """
+
+    def __init__(self, xml_bytes):
+        self.xml_bytes = xml_bytes
+        self.parser = ET.XMLParser(remove_blank_text=True)
+        self.tree = ET.parse(io.BytesIO(xml_bytes), self.parser)
+        self.root = self.tree.getroot()
+        self.nsmap = self.root.nsmap
+        self.nodes = {}
+        self.reverse_refs = defaultdict(set)
+        self.element_by_id = {}
+        self._index_elements()
+        self._build_graph()
+
+    def _index_elements(self):
+        for elem in self.root.iter():
+            elem_id = elem.attrib.get("id")
+            if elem_id:
+                self.element_by_id[elem_id] = elem
+
+    def _build_graph(self):
+        for def_elem in self.root.findall(".//definitions/definition",namespaces=self.nsmap):
+            self._process_definition(def_elem)
+        self.node_order = {node_id: i for i, node_id in enumerate(self.nodes)}
+
+    def _process_definition(self, def_elem):
+        def_id = def_elem.attrib["id"]
+        if def_id in self.nodes:
+            return
+        def_node = GraphNode(def_id, "definition", def_elem)
+        self.nodes[def_id] = def_node
+
+        for ext in def_elem.findall(".//extend_definition", namespaces=self.nsmap):
+            ref_id = ext.attrib.get("definition_ref")
+            if ref_id and ref_id in self.element_by_id:
+                def_node.children.add(ref_id)
+                self.reverse_refs[ref_id].add(def_id)
+                self._process_definition(self.element_by_id[ref_id])
+
+        for criterion in def_elem.findall(".//criterion", namespaces=self.nsmap):
+            test_ref = criterion.attrib.get("test_ref")
+            if not test_ref:
+                continue
+            crit_id = f"criterion:{def_id}:{test_ref}"
+            crit_node = GraphNode(crit_id, "criterion", criterion)
+            self.nodes[crit_id] = crit_node
+            def_node.children.add(crit_id)
+            crit_node.children.add(test_ref)
+            self.reverse_refs[crit_id].add(def_id)
+            self.reverse_refs[test_ref].add(crit_id)
+
+            test_elem = self.element_by_id.get(test_ref)
+            if test_elem:
+                if test_ref not in self.nodes:
+                    self.nodes[test_ref] = GraphNode(test_ref, "test", test_elem)
+
+                object_refs = [e.attrib["object_ref"] for e in test_elem.xpath(".//*[local-name()='object']") if "object_ref" in e.attrib]
+                state_refs = [e.attrib["state_ref"] for e in test_elem.xpath(".//*[local-name()='state']") if "state_ref" in e.attrib]
+
+                for obj_id in object_refs:
+                    self.nodes[test_ref].children.add(obj_id)
+                    self.reverse_refs[obj_id].add(test_ref)
+                    self._process_object(obj_id)
+
+                for state_id in state_refs:
+                    self.nodes[test_ref].children.add(state_id)
+                    self.reverse_refs[state_id].add(test_ref)
+                    self._process_state(state_id)
+
+    def _process_object(self, obj_id):
+        obj_elem = self.element_by_id.get(obj_id)
+        if obj_elem is None:
+            return
+        if obj_id not in self.nodes:
+            self.nodes[obj_id] = GraphNode(obj_id, "object", obj_elem)
+
+        # Handle <set>
+        set_elem = obj_elem.find(".//set", namespaces=self.nsmap)
+        if set_elem is not None:
+            for obj_ref_elem in set_elem.findall("oval:object_reference", namespaces=self.nsmap):
+                child_obj_id = obj_ref_elem.text.strip()
+                self.nodes[obj_id].children.add(child_obj_id)
+                self.reverse_refs[child_obj_id].add(obj_id)
+                self._process_object(child_obj_id)
+            for filter_elem in set_elem.findall("oval:filter", namespaces=self.nsmap):
+                state_id = filter_elem.text.strip()
+                self.nodes[obj_id].children.add(state_id)
+                self.reverse_refs[state_id].add(obj_id)
+                self._process_state(state_id)
+
+        for var_elem in obj_elem.xpath(".//*[@var_ref]"):
+            var_id = var_elem.attrib.get("var_ref")
+            if var_id and var_id in self.element_by_id:
+                if var_id not in self.nodes:
+                    self.nodes[var_id] = GraphNode(var_id, "variable", self.element_by_id[var_id])
+                self.nodes[obj_id].children.add(var_id)
+                self.reverse_refs[var_id].add(obj_id)
+
+        # Also handle <filter> directly on object
+        for filter_elem in obj_elem.xpath(".//*[local-name()='filter']"):
+            state_id = filter_elem.text.strip()
+            if state_id in self.element_by_id:
+                self.nodes[obj_id].children.add(state_id)
+                self.reverse_refs[state_id].add(obj_id)
+                self._process_state(state_id)
+
+    def _process_state(self, state_id):
+        state_elem = self.element_by_id.get(state_id)
+        if not state_elem:
+            return
+        if state_id not in self.nodes:
+            self.nodes[state_id] = GraphNode(state_id, "state", state_elem)
+        for var_elem in state_elem.xpath(".//*[@var_ref]"):
+            var_id = var_elem.attrib.get("var_ref")
+            if var_id and var_id in self.element_by_id:
+                if var_id not in self.nodes:
+                    self.nodes[var_id] = GraphNode(var_id, "variable", self.element_by_id[var_id])
+                self.nodes[state_id].children.add(var_id)
+                self.reverse_refs[var_id].add(state_id)
+
+
+def add_edge_cases(xml_bytes):
+    """Add a <set> object referencing two objects and a state, and empty the first state."""
+    set_object = (
+        '<win:registry_object id="oval:bench:obj:set" version="1"><set>'
+        '<object_reference>oval:bench:obj:1</object_reference>'
+        '<object_reference>oval:bench:obj:2</object_reference>'
+        '<filter>oval:bench:ste:3</filter></set></win:registry_object>'
+    )
+    set_test = (
+        '<win:registry_test id="oval:bench:tst:set" check="all" version="1">'
+        '<win:object object_ref="oval:bench:obj:set"/></win:registry_test>'
+    )
+    empty_state = '<win:registry_state id="oval:bench:ste:0" version="1"/>'
+    xml = xml_bytes.decode("utf-8")
+    xml = xml.replace("</objects>", set_object + "</objects>", 1)
+    xml = xml.replace("</tests>", set_test + "</tests>", 1)
+    xml = xml.replace(
+        '<criterion test_ref="oval:bench:tst:0"/>',
+        '<criterion test_ref="oval:bench:tst:0"/><criterion test_ref="oval:bench:tst:set"/>',
+        1
+    )
+    start = xml.index('<win:registry_state id="oval:bench:ste:0"')
+    end = xml.index("</win:registry_state>", start) + len("</win:registry_state>")
+    return (xml[:start] + empty_state + xml[end:]).encode("utf-8")
+
+
+def graph_signature(dsa):
+    nodes = {node_id: (node.type, frozenset(node.children)) for node_id, node in dsa.nodes.items()}
+    reverse_refs = {node_id: frozenset(parents) for node_id, parents in dsa.reverse_refs.items() if parents}
+    return nodes, reverse_refs
+
+
+def time_builder(dsa_class, xml_bytes, repeat):
+    best = None
+    dsa = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        dsa = dsa_class(xml_bytes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, dsa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--edge-cases", action="store_true")
+    args = parser.parse_args()
+
+    xml_bytes = make_synthetic_oval(args.elements)
+    if args.edge_cases:
+        xml_bytes = add_edge_cases(xml_bytes)
+    recursive_time, recursive_dsa = time_builder(RecursiveOvalDSA, xml_bytes, args.repeat)
+    single_pass_time, single_pass_dsa = time_builder(OvalDSA, xml_bytes, args.repeat)
+
+    element_count = sum(1 for _ in single_pass_dsa.root.iter())
+    recursive_nodes, recursive_parents = graph_signature(recursive_dsa)
+    single_pass_nodes, single_pass_parents = graph_signature(single_pass_dsa)
+    differing = sorted(
+        node_id for node_id in recursive_nodes.keys() | single_pass_nodes.keys()
+        if recursive_nodes.get(node_id) != single_pass_nodes.get(node_id)
+    )
+    same_graph = not differing and recursive_parents == single_pass_parents
+
+    print(f"elements:          {element_count}")
+    print(f"graph nodes:       {len(single_pass_dsa.nodes)}")
+    print(f"recursive builder: {recursive_time * 1000:.1f} ms (parse included)")
+    print(f"single-pass:       {single_pass_time * 1000:.1f} ms (parse included)")
+    print(f"speedup:           {recursive_time / single_pass_time:.2f}x")
+    print(f"identical graphs:  {same_graph}")
+    for node_id in differing:
+        print(f"  {node_id}: recursive {recursive_nodes.get(node_id)}, single-pass {single_pass_nodes.get(node_id)}")
+
+
+if __name__ == "__main__":
+    main()
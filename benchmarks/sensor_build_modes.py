@@ -0,0 +1,93 @@
+# benchmarks/sensor_build_modes.py
+#
+# Per-rule cost of building channel files with a fresh interpreter per rule
+# (subprocess mode) versus warm BuildChannelFile workers (warm mode).
+#
+#   python -m benchmarks.sensor_build_modes [--rules 40] [--workers 4]
+#       [--build-channel-file path/to/BuildChannelFile.py] [--instructions cf.bin]
+#
+# Without --build-channel-file a stand-in script is generated that imports
+# a few heavy standard modules and copies the instructions file.
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.channel_file_worker import shutdown_workers
+from backend.sensorbin_generator import generate_sensor_cf
+
+STAND_IN_SCRIPT = '''
+import argparse, decimal, email.parser, json, shutil, xml.dom.minidom, zipfile
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channel-id")
+    parser.add_argument("--channel-format")
+    parser.add_argument("--current-version")
+    parser.add_argument("--current")
+    parser.add_argument("--channel-file")
+    args = parser.parse_args()
+    shutil.copy(args.current, args.channel_file)
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def time_mode(script_path, instructions, rules, workers, warm, scratch_root):
+    output_dir = tempfile.mkdtemp(dir=scratch_root)
+
+    def build(i):
+        work_dir = tempfile.mkdtemp(dir=scratch_root)
+        instructions_file = os.path.join(work_dir, f"cf.rule{i}.bin.txt")
+        shutil.copy(instructions, instructions_file)
+        generate_sensor_cf(sys.executable, script_path, instructions_file, f"rule{i}", output_dir,
+                           work_dir=work_dir, warm=warm)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(build, range(rules)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--build-channel-file")
+    parser.add_argument("--instructions")
+    args = parser.parse_args()
+
+    scratch_root = tempfile.mkdtemp(prefix="sensor_bench_")
+    try:
+        script_path = args.build_channel_file
+        if not script_path:
+            script_path = os.path.join(scratch_root, "BuildChannelFile.py")
+            with open(script_path, "w", encoding="utf-8") as f:
+                f.write(STAND_IN_SCRIPT)
+        instructions = args.instructions
+        if not instructions:
+            instructions = os.path.join(scratch_root, "cf.bin")
+            with open(instructions, "wb") as f:
+                f.write(os.urandom(64 * 1024))
+
+        subprocess_time = time_mode(script_path, instructions, args.rules, args.workers, False, scratch_root)
+        # Start the warm workers before timing so only steady-state cost is measured
+        time_mode(script_path, instructions, args.workers, args.workers, True, scratch_root)
+        warm_time = time_mode(script_path, instructions, args.rules, args.workers, True, scratch_root)
+        shutdown_workers()
+
+        print(f"rules:            {args.rules} on {args.workers} workers")
+        print(f"subprocess mode:  {subprocess_time * 1000 / args.rules:.1f} ms/rule")
+        print(f"warm mode:        {warm_time * 1000 / args.rules:.1f} ms/rule")
+        print(f"speedup:          {subprocess_time / warm_time:.2f}x")
+    finally:
+        shutil.rmtree(scratch_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
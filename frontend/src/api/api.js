@@ -18,6 +18,32 @@ export async function getRules(benchmark) {
   return res.json();
 }
 
+// One page of rules, filtered and sorted server-side. Pass the returned
+// next_cursor back as params.cursor to get the following page.
+export async function queryRules(benchmark, params = {}) {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== "") {
+      query.set(key, value);
+    }
+  });
+  const res = await fetch(
+    `${BASE_URL}/benchmarks/${benchmark}/rules/query?${query}`
+  );
+  if (!res.ok) {
+    throw new Error(await res.text());
+  }
+  return res.json();
+}
+
+export async function getObjectTypes(benchmark) {
+  const res = await fetch(`${BASE_URL}/benchmarks/${benchmark}/object-types`);
+  if (!res.ok) {
+    throw new Error(await res.text());
+  }
+  return res.json();
+}
+
 export async function getOval(benchmark, ruleId) {
   const res = await fetch(`${BASE_URL}/benchmarks/${benchmark}/rules/${ruleId}`);
   return res.json();
@@ -192,4 +218,42 @@ export async function saveXccdf(benchmark, ruleId, xccdfContent) {
     throw new Error(await res.text());
   }
   return res.json();
-}
\ No newline at end of file
+}
+
+// Live job status and progress over Server-Sent Events. Pass { jobId } or
+// { benchmark }, or nothing for every job. Returns a function that closes
+// the stream; a single-job stream closes itself once the job finishes.
+export function subscribeJobEvents({ jobId, benchmark } = {}, onJob) {
+  const url = jobId
+    ? `/api/jobs/${jobId}/events`
+    : benchmark
+    ? `/api/benchmarks/${benchmark}/events`
+    : "/api/events";
+  const source = new EventSource(url);
+  source.addEventListener("job", (event) => {
+    const job = JSON.parse(event.data);
+    onJob(job);
+    if (jobId && (job.status === "succeeded" || job.status === "failed")) {
+      source.close();
+    }
+  });
+  return () => source.close();
+}
+
+export function formatJobProgress(job) {
+  if (job.status === "queued") return "Queued";
+  if (job.status === "failed") return `Failed: ${(job.last_error || "").split("\n")[0]}`;
+  const progress = job.progress;
+  if (!progress || !progress.stage) return job.status === "succeeded" ? "Done" : "Starting...";
+
+  const parts = [progress.stage];
+  if (progress.total != null) parts.push(`${progress.done}/${progress.total}`);
+  if (job.status === "running") {
+    if (progress.rate) parts.push(`${progress.rate.toFixed(1)}/s`);
+    if (progress.eta_seconds != null) parts.push(`ETA ${Math.ceil(progress.eta_seconds)}s`);
+  } else {
+    parts.push("done");
+  }
+  if (progress.errors) parts.push(`${progress.errors} error${progress.errors === 1 ? "" : "s"}`);
+  return parts.join(" · ");
+}
@@ -1,9 +1,17 @@
 import React, { useEffect, useState } from "react";
-import { getBenchmarks, deleteBenchmark, downloadFullBenchmarkOval } from "../api/api";
+import {
+  getBenchmarks,
+  deleteBenchmark,
+  downloadFullBenchmarkOval,
+  subscribeJobEvents,
+  formatJobProgress,
+} from "../api/api";
 import { useNavigate } from "react-router-dom";
 
 export default function BenchmarkListPage() {
   const [benchmarks, setBenchmarks] = useState([]);
+  // Latest running or failed job per benchmark, from the job event stream
+  const [jobs, setJobs] = useState({});
   const navigate = useNavigate();
 
   // Modal state
@@ -26,6 +34,25 @@ export default function BenchmarkListPage() {
     fetchBenchmarks();
   }, []);
 
+  useEffect(() => {
+    return subscribeJobEvents({}, (job) => {
+      if (!job.benchmark) return;
+      setJobs((current) => {
+        const next = { ...current };
+        if (job.status === "succeeded") {
+          if (next[job.benchmark]?.id === job.id) delete next[job.benchmark];
+        } else {
+          next[job.benchmark] = job;
+        }
+        return next;
+      });
+      // Counts only change when a job ends
+      if (job.status === "succeeded" || job.status === "failed") {
+        fetchBenchmarks();
+      }
+    });
+  }, []);
+
   const handleGenerateFullOval = async (benchmark) => {
     try {
       await downloadFullBenchmarkOval(benchmark);
@@ -121,6 +148,15 @@ export default function BenchmarkListPage() {
               <tr key={b.benchmark} className="hover:bg-gray-50">
                 <td className="px-4 py-3 text-sm font-medium text-gray-800">
                   {b.benchmark}
+                  {jobs[b.benchmark] && (
+                    <div
+                      className={`mt-1 text-xs font-normal ${
+                        jobs[b.benchmark].status === "failed" ? "text-red-600" : "text-gray-500"
+                      }`}
+                    >
+                      {jobs[b.benchmark].job_type}: {formatJobProgress(jobs[b.benchmark])}
+                    </div>
+                  )}
                 </td>
                 <td className="px-4 py-3 text-sm">{b.type}</td>
                 <td className="px-4 py-3 text-sm">{b.total_rules}</td>
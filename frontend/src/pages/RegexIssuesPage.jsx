@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { useParams } from "react-router-dom";
-import { getRegexIssues, processRegex } from "../api/api";
+import { getRegexIssues, processRegex, subscribeJobEvents, formatJobProgress } from "../api/api";
 
 export default function RegexIssuesPage() {
   const { benchmark } = useParams();
@@ -34,10 +34,20 @@ export default function RegexIssuesPage() {
     setProcessMessage("");
     try {
       const res = await processRegex(benchmark);
-      setProcessMessage(`✅ ${res.message || "Regex processing complete."}`);
+      setProcessMessage(`✅ ${res.message || "Regex processing started."}`);
+      subscribeJobEvents({ jobId: res.job_id }, (job) => {
+        if (job.status === "succeeded") {
+          setProcessMessage("✅ Regex processing complete.");
+          setProcessing(false);
+        } else if (job.status === "failed") {
+          setProcessMessage(`❌ ${formatJobProgress(job)}`);
+          setProcessing(false);
+        } else {
+          setProcessMessage(`⏳ ${formatJobProgress(job)}`);
+        }
+      });
     } catch (err) {
       setProcessMessage(`❌ Failed: ${err.message}`);
-    } finally {
       setProcessing(false);
     }
   };
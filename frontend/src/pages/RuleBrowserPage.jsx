@@ -1,7 +1,8 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import {
-  getRules,
+  queryRules,
+  getObjectTypes,
   deleteRules,
   downloadMergedOval,
   getOval,
@@ -12,8 +13,9 @@ import {
   evaluateRules,
   getXccdf,
   saveXccdf,
-  getRulesByObject,
   transformUserRight,
+  subscribeJobEvents,
+  formatJobProgress,
 } from "../api/api";
 
 import CodeMirror from "@uiw/react-codemirror";
@@ -57,11 +59,37 @@ function Modal({ open, onClose, title, children, onSave }) {
   );
 }
 
+const PAGE_SIZE = 100;
+
+function BoolFilter({ label, value, onChange }) {
+  return (
+    <select
+      value={value}
+      onChange={(e) => onChange(e.target.value)}
+      className="border border-gray-300 rounded-md px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-blue-500"
+    >
+      <option value="">{label}: any</option>
+      <option value="true">{label}: yes</option>
+      <option value="false">{label}: no</option>
+    </select>
+  );
+}
+
 function RuleBrowserPage() {
   const { benchmark } = useParams();
   const [rules, setRules] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(null);
+  const [loading, setLoading] = useState(false);
   const [search, setSearch] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [objectSearch, setObjectSearch] = useState("");
+  const [objectFilter, setObjectFilter] = useState("");
+  const [objectTypes, setObjectTypes] = useState([]);
+  const [supportedFilter, setSupportedFilter] = useState("");
+  const [sensorFilter, setSensorFilter] = useState("");
+  const [regexFilter, setRegexFilter] = useState("");
+  const [sortKey, setSortKey] = useState("supported");
   const [selectedRule, setSelectedRule] = useState("");
   const [oval, setOval] = useState("");
   const [xccdf, setXccdf] = useState("");
@@ -78,14 +106,45 @@ function RuleBrowserPage() {
   const [xccdfSaveStatus, setXccdfSaveStatus] = useState("");
 
   const [remoteHostExists, setRemoteHostExists] = useState(false);
+  const [evaluationStatus, setEvaluationStatus] = useState("");
 
   const [transformModalOpen, setTransformModalOpen] = useState(false);
   const [transformedXml, setTransformedXml] = useState("");
 
   const navigate = useNavigate();
 
-  const fetchRules = () => {
-    getRules(benchmark).then(setRules);
+  // Responses to superseded queries are dropped
+  const requestSeq = useRef(0);
+
+  const fetchRules = async (cursor = null) => {
+    const seq = ++requestSeq.current;
+    setLoading(true);
+    try {
+      const page = await queryRules(benchmark, {
+        limit: PAGE_SIZE,
+        cursor,
+        sort: sortKey,
+        order: sortAsc ? "asc" : "desc",
+        search: debouncedSearch.trim(),
+        object_type: objectFilter,
+        supported: supportedFilter,
+        sensor_generated: sensorFilter,
+        has_regex_issues: regexFilter,
+      });
+      if (seq !== requestSeq.current) return;
+      setRules((prev) => (cursor ? [...prev, ...page.items] : page.items));
+      setNextCursor(page.next_cursor);
+      if (!cursor) {
+        setTotal(page.total);
+        setLastSelectedIndex(null);
+      }
+    } catch (err) {
+      if (seq === requestSeq.current) {
+        alert("Failed to fetch rules: " + err.message);
+      }
+    } finally {
+      if (seq === requestSeq.current) setLoading(false);
+    }
   };
 
   const fetchRemoteHostStatus = async () => {
@@ -99,23 +158,45 @@ function RuleBrowserPage() {
   };
 
   useEffect(() => {
-    fetchRules();
     fetchRemoteHostStatus();
+    getObjectTypes(benchmark)
+      .then(setObjectTypes)
+      .catch((err) => console.error("Failed to fetch object types:", err.message));
   }, [benchmark]);
 
-  const handleFilterByObject = async () => {
-    if (!objectSearch.trim()) {
-      fetchRules();
-      return;
-    }
-    try {
-      const result = await getRulesByObject(benchmark, objectSearch.trim());
-      setRules(result);
-    } catch (err) {
-      alert("Failed to fetch rules by object: " + err.message);
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(search), 300);
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  useEffect(() => {
+    fetchRules();
+  }, [
+    benchmark,
+    debouncedSearch,
+    objectFilter,
+    supportedFilter,
+    sensorFilter,
+    regexFilter,
+    sortKey,
+    sortAsc,
+  ]);
+
+  const handleFilterByObject = () => {
+    setObjectFilter(objectSearch.trim());
+  };
+
+  const handleSort = (key) => {
+    if (key === sortKey) {
+      setSortAsc(!sortAsc);
+    } else {
+      setSortKey(key);
+      setSortAsc(true);
     }
   };
 
+  const sortIndicator = (key) => (sortKey === key ? (sortAsc ? " ▲" : " ▼") : "");
+
   const handleOpenRule = async (ruleId) => {
     const res = await getOval(benchmark, ruleId);
     const formatted = beautify.html(res.oval, {
@@ -208,9 +289,17 @@ function RuleBrowserPage() {
 
   const handleEvaluateRules = async () => {
     try {
-      await evaluateRules(benchmark);
-      alert("✅ Rules evaluated successfully!");
-      fetchRules();
+      const { job_id } = await evaluateRules(benchmark);
+      subscribeJobEvents({ jobId: job_id }, (job) => {
+        setEvaluationStatus(formatJobProgress(job));
+        if (job.status === "succeeded") {
+          setEvaluationStatus("");
+          alert("✅ Rules evaluated successfully!");
+          fetchRules();
+        } else if (job.status === "failed") {
+          alert("❌ Failed to evaluate rules: " + (job.last_error || "").split("\n")[0]);
+        }
+      });
     } catch (err) {
       alert("❌ Failed to evaluate rules: " + err.message);
     }
@@ -220,7 +309,7 @@ function RuleBrowserPage() {
     if (event.shiftKey && lastSelectedIndex !== null) {
       const start = Math.min(lastSelectedIndex, index);
       const end = Math.max(lastSelectedIndex, index);
-      const idsToSelect = sortedRules
+      const idsToSelect = rules
         .slice(start, end + 1)
         .map((rule) => rule.rule_id);
       const merged = Array.from(new Set([...selected, ...idsToSelect]));
@@ -242,16 +331,6 @@ function RuleBrowserPage() {
     }
   };
 
-  const filteredRules = rules.filter((rule) =>
-    rule.rule_id.toLowerCase().includes(search.trim().toLowerCase())
-  );
-
-  const sortedRules = [...filteredRules].sort((a, b) => {
-    if (sortAsc)
-      return a.supported === b.supported ? 0 : a.supported ? 1 : -1;
-    else return a.supported === b.supported ? 0 : a.supported ? -1 : 1;
-  });
-
   const handleDeleteSelected = async () => {
     if (!selected.length) return;
     if (
@@ -292,6 +371,11 @@ function RuleBrowserPage() {
           >
             Evaluate Rules
           </button>
+          {evaluationStatus && (
+            <span className="inline-flex items-center text-sm text-gray-600">
+              {evaluationStatus}
+            </span>
+          )}
           {remoteHostExists && (
             <span className="inline-flex items-center px-3 py-1 rounded-full text-xs font-medium bg-green-100 text-green-800 border border-green-300">
               Remote Host Added
@@ -316,8 +400,16 @@ function RuleBrowserPage() {
               placeholder="Filter by Object name"
               value={objectSearch}
               onChange={(e) => setObjectSearch(e.target.value)}
+              list="object-types"
               className="border border-gray-300 rounded-md px-4 py-2 w-full md:w-80 focus:outline-none focus:ring-2 focus:ring-blue-500"
             />
+            <datalist id="object-types">
+              {objectTypes.map((t) => (
+                <option key={t.object_type} value={t.object_type}>
+                  {t.rules} rules{t.supported ? "" : ", no probe"}
+                </option>
+              ))}
+            </datalist>
             <button
               onClick={handleFilterByObject}
               className="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-md font-semibold"
@@ -325,6 +417,11 @@ function RuleBrowserPage() {
               Filter
             </button>
           </div>
+          <div className="flex gap-2">
+            <BoolFilter label="Supported" value={supportedFilter} onChange={setSupportedFilter} />
+            <BoolFilter label="Sensor" value={sensorFilter} onChange={setSensorFilter} />
+            <BoolFilter label="Regex issues" value={regexFilter} onChange={setRegexFilter} />
+          </div>
         </div>
 
         <div className="flex flex-wrap gap-3">
@@ -356,20 +453,23 @@ function RuleBrowserPage() {
           <thead className="bg-gray-50">
             <tr>
               <th></th>
-              <th className="px-40 py-3 text-left text-xs font-semibold text-gray-700 uppercase tracking-wider">
-                Rule ID
+              <th
+                className="px-40 py-3 text-left text-xs font-semibold text-gray-700 uppercase tracking-wider cursor-pointer"
+                onClick={() => handleSort("rule_id")}
+              >
+                Rule ID{sortIndicator("rule_id")}
               </th>
               <th
                 className="px-4 py-3 text-left text-xs font-semibold text-gray-700 uppercase tracking-wider cursor-pointer"
-                onClick={() => setSortAsc(!sortAsc)}
+                onClick={() => handleSort("supported")}
               >
-                Supported {sortAsc ? "▲" : "▼"}
+                Supported{sortIndicator("supported")}
               </th>
               <th
                 className="px-4 py-3 text-left text-xs font-semibold text-gray-700 uppercase tracking-wider cursor-pointer"
-                onClick={() => setSortAsc(!sortAsc)}
+                onClick={() => handleSort("sensor_file_generated")}
               >
-                Sensor File Status {sortAsc ? "▲" : "▼"}
+                Sensor File Status{sortIndicator("sensor_file_generated")}
               </th>
               <th className="px-4 py-3 text-left text-xs font-semibold text-gray-700 uppercase tracking-wider">
                 Rule Evaluation
@@ -380,7 +480,7 @@ function RuleBrowserPage() {
             </tr>
           </thead>
           <tbody className="divide-y divide-gray-100">
-            {sortedRules.map((rule, index) => (
+            {rules.map((rule, index) => (
               <tr key={rule.rule_id} className="hover:bg-gray-50">
                 <td className="px-4 py-3 whitespace-nowrap">
                   <input
@@ -462,6 +562,22 @@ function RuleBrowserPage() {
         </table>
       </div>
 
+      <div className="flex items-center justify-between mt-4 text-sm text-gray-600">
+        <span>
+          Showing {rules.length}
+          {total !== null ? ` of ${total}` : ""} rules
+        </span>
+        {nextCursor && (
+          <button
+            className="bg-gray-600 hover:bg-gray-700 text-white px-4 py-2 rounded-md font-semibold disabled:opacity-50"
+            disabled={loading}
+            onClick={() => fetchRules(nextCursor)}
+          >
+            {loading ? "Loading..." : "Load more"}
+          </button>
+        )}
+      </div>
+
       <Modal
         open={!!selectedRule && !xccdfModalOpen}
         onClose={() => setSelectedRule("")}
@@ -1,4 +1,5 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
+import { subscribeJobEvents, formatJobProgress } from "../api/api";
 
 export default function UploadPage() {
   const [benchmarkName, setBenchmarkName] = useState("");
@@ -8,6 +9,16 @@ export default function UploadPage() {
   const [cisOvalFile, setCisOvalFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [message, setMessage] = useState("");
+  // Import and sensor build jobs of the uploaded benchmark, by id
+  const [trackedBenchmark, setTrackedBenchmark] = useState(null);
+  const [jobs, setJobs] = useState({});
+
+  useEffect(() => {
+    if (!trackedBenchmark) return;
+    return subscribeJobEvents({ benchmark: trackedBenchmark }, (job) =>
+      setJobs((current) => ({ ...current, [job.id]: job }))
+    );
+  }, [trackedBenchmark]);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -41,6 +52,8 @@ export default function UploadPage() {
       if (!res.ok) throw new Error(await res.text());
       const data = await res.json();
       setMessage(data.message);
+      setJobs({});
+      setTrackedBenchmark(benchmarkName);
     } catch (err) {
       alert("Upload failed: " + err.message);
     } finally {
@@ -135,6 +148,15 @@ export default function UploadPage() {
       {message && (
         <p className="mt-4 text-green-600 font-medium">{message}</p>
       )}
+
+      {Object.values(jobs).map((job) => (
+        <p
+          key={job.id}
+          className={`mt-2 text-sm ${job.status === "failed" ? "text-red-600" : "text-gray-600"}`}
+        >
+          {job.job_type}: {formatJobProgress(job)}
+        </p>
+      ))}
     </div>
   );
 }